@@ -11,7 +11,9 @@ from pathlib import Path
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
-from gnome_tmux.main import main
-
 if __name__ == "__main__":
+    # Importar solo al ejecutar: los workers de multiprocessing (spawn)
+    # re-ejecutan este módulo y no deben cargar GTK ni configurar los logs
+    from gnome_tmux.main import main
+
     sys.exit(main())
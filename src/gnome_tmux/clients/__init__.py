@@ -5,24 +5,42 @@ Autor: Homero Thompson del Lago del Terror
 """
 
 from .local import TmuxClient
-from .models import Session, Window, get_ssh_control_path, is_flatpak
+from .models import RemoteEntry, SearchHit, Session, Window, get_ssh_control_path, is_flatpak
 from .parsers import (
+    FIND_LISTING_FORMAT,
+    FIND_SEARCH_FORMAT,
     SESSION_FORMAT,
+    SESSION_WINDOWS_FORMAT,
     WINDOW_FORMAT,
+    parse_find_listing,
+    parse_find_search,
+    parse_ls_listing,
+    parse_session_windows_output,
     parse_sessions_output,
     parse_windows_output,
 )
+from .prefetch import RemotePrefetcher
 from .remote import RemoteTmuxClient
 
 __all__ = [
     "TmuxClient",
     "RemoteTmuxClient",
+    "RemotePrefetcher",
     "Session",
     "Window",
+    "RemoteEntry",
+    "SearchHit",
     "is_flatpak",
     "get_ssh_control_path",
     "SESSION_FORMAT",
     "WINDOW_FORMAT",
+    "SESSION_WINDOWS_FORMAT",
+    "FIND_LISTING_FORMAT",
+    "FIND_SEARCH_FORMAT",
     "parse_sessions_output",
+    "parse_session_windows_output",
     "parse_windows_output",
+    "parse_find_listing",
+    "parse_find_search",
+    "parse_ls_listing",
 ]
@@ -0,0 +1,74 @@
+"""
+async_calls.py - Ejecución de métodos de un cliente fuera del thread de la UI
+
+Autor: Homero Thompson del Lago del Terror
+"""
+
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+
+try:
+    from loguru import logger
+except ImportError:
+    import logging
+
+    logger = logging.getLogger(__name__)  # type: ignore
+
+
+class AsyncCallsMixin:
+    """
+    Agrega call_async a un cliente: un worker propio que ejecuta los métodos
+    en el orden en que se piden y entrega el resultado por un dispatcher.
+    """
+
+    def _init_async_calls(self, dispatcher: Callable | None):
+        """
+        Args:
+            dispatcher: Función que ejecuta los callbacks en el thread de la
+                UI, con la firma de GLib.idle_add(func, *args). Si es None,
+                los callbacks corren en el thread worker
+        """
+        self._dispatcher = dispatcher
+        # Un solo worker: los comandos se ejecutan en el orden en que se piden
+        self._executor: ThreadPoolExecutor | None = None
+
+    def call_async(self, func: Callable, *args, callback: Callable | None = None) -> Future:
+        """
+        Ejecuta un método del cliente fuera del thread de la UI.
+
+        Ejemplo: call_async(client.rename_session, "a", "b", callback=on_done)
+
+        Args:
+            func: Función a ejecutar (normalmente un método de este cliente)
+            *args: Argumentos para func
+            callback: Recibe el resultado (None si func lanzó una excepción);
+                se entrega a través del dispatcher
+
+        Returns:
+            Future de la ejecución
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tmux-io")
+        future = self._executor.submit(func, *args)
+        if callback is not None:
+            future.add_done_callback(lambda f: self._deliver_result(callback, f))
+        return future
+
+    def _deliver_result(self, callback: Callable, future: Future):
+        """Entrega el resultado de una operación async a su callback."""
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            logger.warning(f"Error en operación tmux async: {error}")
+        result = None if error is not None else future.result()
+        if self._dispatcher is None:
+            callback(result)
+        else:
+            self._dispatcher(callback, result)
+
+    def _shutdown_async_calls(self):
+        """Descarta las operaciones pendientes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
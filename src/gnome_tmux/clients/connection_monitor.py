@@ -0,0 +1,130 @@
+"""
+connection_monitor.py - Estado cacheado de conexiones SSH ControlMaster
+
+Evita lanzar `ssh -O check` en cada operación remota: el resultado del
+check se cachea por unos segundos y un thread en background vigila el socket
+de cada host (stat, sin procesos). Cuando el socket aparece, desaparece o se
+reemplaza, el estado cacheado se actualiza o invalida al instante.
+
+Autor: Homero Thompson del Lago del Terror
+"""
+
+import os
+import threading
+import time
+import weakref
+from collections.abc import Callable
+
+# Segundos que un `ssh -O check` exitoso se considera válido
+STATUS_VALIDITY_SECONDS = 5.0
+# Intervalo del watcher de sockets
+SOCKET_POLL_INTERVAL_SECONDS = 1.0
+
+
+def _socket_identity(path: str) -> tuple[int, int, int] | None:
+    """Identidad del socket (inode, device, mtime) o None si no existe."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_ino, st.st_dev, st.st_mtime_ns)
+
+
+class ConnectionMonitor:
+    """Estado de la conexión ControlMaster de un host."""
+
+    def __init__(
+        self,
+        control_path: str,
+        socket_exists: Callable[[], bool],
+        check: Callable[[], bool],
+        validity: float = STATUS_VALIDITY_SECONDS,
+    ):
+        """
+        Args:
+            control_path: Path del socket ControlMaster
+            socket_exists: Retorna True si el socket existe (chequeo barato)
+            check: Verificación real de la conexión (ej: ssh -O check)
+            validity: Segundos que el resultado de check se reutiliza
+        """
+        self._control_path = control_path
+        self._socket_exists = socket_exists
+        self._check = check
+        self._validity = validity
+        self._lock = threading.Lock()
+        self._status: bool | None = None
+        self._checked_at = 0.0
+        self._identity = _socket_identity(control_path)
+
+    def is_connected(self) -> bool:
+        """
+        Retorna el estado de la conexión.
+
+        Sin socket retorna False sin lanzar procesos. Con socket reutiliza el
+        último check mientras esté dentro de la ventana de validez.
+        """
+        if not self._socket_exists():
+            with self._lock:
+                self._status = False
+            return False
+
+        _socket_watcher.register(self)
+        with self._lock:
+            fresh = time.monotonic() - self._checked_at < self._validity
+            if self._status is not None and fresh:
+                return self._status
+
+        status = self._check()
+        with self._lock:
+            self._status = status
+            self._checked_at = time.monotonic()
+        return status
+
+    def invalidate(self):
+        """Fuerza un check real en la próxima consulta (ej: tras un error SSH)."""
+        with self._lock:
+            self._status = None
+
+    def _poll_socket(self):
+        """Llamado por el watcher: detecta cambios en el socket."""
+        identity = _socket_identity(self._control_path)
+        if identity == self._identity:
+            return
+        self._identity = identity
+        # Socket nuevo o reemplazado: re-chequear; sin socket: desconectado
+        with self._lock:
+            self._status = None if identity is not None else False
+
+
+class _SocketWatcher:
+    """Thread único que vigila los sockets de todos los monitores activos."""
+
+    def __init__(self):
+        self._monitors: weakref.WeakSet[ConnectionMonitor] = weakref.WeakSet()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def register(self, monitor: ConnectionMonitor):
+        """Agrega un monitor e inicia el thread si no está corriendo."""
+        with self._lock:
+            self._monitors.add(monitor)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="ssh-socket-watcher", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self):
+        """Revisa los sockets periódicamente; termina cuando no hay monitores."""
+        while True:
+            time.sleep(SOCKET_POLL_INTERVAL_SECONDS)
+            with self._lock:
+                monitors = list(self._monitors)
+                if not monitors:
+                    self._thread = None
+                    return
+            for monitor in monitors:
+                monitor._poll_socket()
+
+
+_socket_watcher = _SocketWatcher()
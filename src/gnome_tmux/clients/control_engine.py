@@ -0,0 +1,136 @@
+"""
+control_engine.py - Ciclo de vida de la conexión tmux en control mode
+
+Crea el cliente de control bajo demanda, reintenta con backoff cuando tmux
+no lo permite (sin servidor, tmux < 3.2) y reparte las notificaciones a los
+handlers registrados, que se conservan entre reconexiones.
+
+Autor: Homero Thompson del Lago del Terror
+"""
+
+import subprocess
+import threading
+import time
+
+from .control_mode import ControlModeClient
+from .control_notifications import NotificationHandler
+
+
+def adapt_result(
+    result: subprocess.CompletedProcess, run_kwargs: dict
+) -> subprocess.CompletedProcess:
+    """
+    Adapta un resultado de control mode (siempre texto) a lo que retornaría
+    subprocess.run(**run_kwargs): bytes sin text=True, None en los streams
+    no capturados y CalledProcessError con check=True.
+    """
+    text_mode = any(
+        run_kwargs.get(key) for key in ("text", "universal_newlines", "encoding", "errors")
+    )
+    encoding = run_kwargs.get("encoding") or "utf-8"
+
+    def convert(value: str, stream: str) -> str | bytes | None:
+        if not run_kwargs.get("capture_output") and run_kwargs.get(stream) != subprocess.PIPE:
+            return None
+        return value if text_mode else value.encode(encoding)
+
+    adapted = subprocess.CompletedProcess(
+        result.args,
+        result.returncode,
+        convert(result.stdout, "stdout"),
+        convert(result.stderr, "stderr"),
+    )
+    if run_kwargs.get("check"):
+        adapted.check_returncode()
+    return adapted
+
+
+class ControlModeEngine:
+    """Administra el ciclo de vida del cliente de control con reintentos."""
+
+    # Segundos entre intentos de reconexión cuando control mode no está disponible
+    RETRY_INTERVAL_SECONDS = 5.0
+
+    def __init__(self, tmux_command: list[str]):
+        self._tmux_command = tmux_command
+        self._client: ControlModeClient | None = None
+        self._lock = threading.Lock()
+        self._next_attempt = 0.0
+        self._handlers: list[NotificationHandler] = []
+
+    @property
+    def is_connected(self) -> bool:
+        """True mientras el cliente de control está adjunto (hay notificaciones)."""
+        client = self._client
+        return client is not None and client.is_alive
+
+    @property
+    def session_id(self) -> str | None:
+        """Sesión donde está adjunto el cliente de control (si está conectado)."""
+        client = self._client
+        if client is not None and client.is_alive:
+            return client.session_id
+        return None
+
+    def get_client(self) -> ControlModeClient | None:
+        """Retorna un cliente conectado, intentando conectar si corresponde."""
+        client = self._client
+        if client is not None and client.is_alive:
+            return client
+
+        with self._lock:
+            client = self._client
+            if client is not None and client.is_alive:
+                return client
+            if time.monotonic() < self._next_attempt:
+                return None
+
+            client = ControlModeClient(self._tmux_command, self._dispatch_notification)
+            if client.start():
+                self._client = client
+                return client
+
+            self._client = None
+            self._next_attempt = time.monotonic() + self.RETRY_INTERVAL_SECONDS
+            return None
+
+    def run(self, args: list[str], run_kwargs: dict) -> subprocess.CompletedProcess | None:
+        """
+        Ejecuta un comando por control mode con el resultado de subprocess.run.
+
+        Returns:
+            Resultado adaptado a run_kwargs, o None si el comando no se
+            envió (sin conexión): solo entonces se puede usar subprocess
+        """
+        client = self.get_client()
+        if client is None:
+            return None
+        result = client.run(args)
+        if result is None:
+            return None
+        return adapt_result(result, run_kwargs)
+
+    def add_notification_handler(self, handler: NotificationHandler):
+        """
+        Registra un callback para las notificaciones de tmux.
+
+        Los handlers se conservan entre reconexiones y se invocan desde el
+        thread lector (usar GLib.idle_add para tocar widgets).
+        """
+        self._handlers.append(handler)
+
+    def _dispatch_notification(self, name: str, args: list[str]):
+        """Reenvía una notificación a todos los handlers registrados."""
+        for handler in list(self._handlers):
+            handler(name, args)
+
+    def reset_backoff(self):
+        """Permite reintentar la conexión inmediatamente (ej: tras crear una sesión)."""
+        self._next_attempt = 0.0
+
+    def close(self):
+        """Cierra el cliente de control si existe."""
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
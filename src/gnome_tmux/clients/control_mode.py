@@ -0,0 +1,273 @@
+"""
+control_mode.py - Conexión persistente a tmux en control mode (tmux -C)
+
+Mantiene un único cliente `tmux -C` abierto y le envía comandos por stdin.
+Las respuestas llegan en bloques %begin/%end (o %error) en el mismo orden
+en que se enviaron los comandos, así que se pueden encolar varios comandos
+sin esperar (pipelining) y emparejarlos con una cola FIFO.
+
+Autor: Homero Thompson del Lago del Terror
+"""
+
+import subprocess
+import threading
+from collections import deque
+
+from .control_notifications import NotificationHandler, parse_notification
+
+try:
+    from loguru import logger
+except ImportError:
+    import logging
+
+    logger = logging.getLogger(__name__)  # type: ignore
+
+# Tiempo máximo de espera para que tmux confirme el attach inicial
+STARTUP_TIMEOUT_SECONDS = 2.0
+# Tiempo máximo de espera por la respuesta de un comando
+COMMAND_TIMEOUT_SECONDS = 3.0
+
+# Bit de flags en %begin que indica que el comando lo envió este cliente
+_FLAG_CLIENT_COMMAND = 1
+
+
+def quote_argument(arg: str) -> str:
+    """
+    Escapa un argumento para el parser de comandos de tmux.
+
+    Siempre usa comillas simples para evitar expansión de ~, $VAR, ';' o '#'.
+
+    Raises:
+        ValueError: Si el argumento contiene saltos de línea (no representables
+            en una línea de control mode)
+    """
+    if "\n" in arg or "\r" in arg:
+        raise ValueError("control mode no admite saltos de línea en argumentos")
+    return "'" + arg.replace("'", "'\\''") + "'"
+
+
+class _PendingCommand:
+    """Comando enviado que espera su bloque de respuesta."""
+
+    __slots__ = ("args", "event", "lines", "returncode")
+
+    def __init__(self, args: list[str]):
+        self.args = args
+        self.event = threading.Event()
+        self.lines: list[str] = []
+        self.returncode: int | None = None
+
+
+class ControlModeClient:
+    """Cliente tmux de larga duración en control mode."""
+
+    def __init__(
+        self, tmux_command: list[str], notification_handler: NotificationHandler | None = None
+    ):
+        """
+        Args:
+            tmux_command: Comando base para invocar tmux
+                (ej: ["tmux"] o ["flatpak-spawn", "--host", "tmux"])
+            notification_handler: Callback para notificaciones de tmux. Se
+                llama desde el thread lector, no desde el main loop de GTK
+        """
+        self._tmux_command = tmux_command
+        self._notification_handler = notification_handler
+        self._proc: subprocess.Popen | None = None
+        self._pending: deque[_PendingCommand] = deque()
+        self._write_lock = threading.Lock()
+        self._ready = threading.Event()
+        self._alive = False
+        self._attached = False
+        self._closed = False
+        # Sesión a la que está adjunto el cliente de control (ej: "$1")
+        self.session_id: str | None = None
+
+    @property
+    def is_alive(self) -> bool:
+        """Retorna True si el cliente de control sigue conectado."""
+        return self._alive
+
+    def start(self) -> bool:
+        """
+        Inicia el cliente de control.
+
+        Se adjunta sin recibir output de paneles (no-output) y sin afectar el
+        tamaño de las ventanas (ignore-size). Falla si no hay servidor o
+        sesiones, o si tmux es anterior a 3.2.
+
+        Returns:
+            True si el cliente quedó conectado
+        """
+        cmd = self._tmux_command + ["-C", "attach-session", "-f", "no-output,ignore-size"]
+        try:
+            self._proc = subprocess.Popen(
+                cmd,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                errors="replace",
+                bufsize=1,
+            )
+        except OSError as e:
+            logger.debug(f"No se pudo iniciar tmux control mode: {e}")
+            return False
+
+        self._alive = True
+        reader = threading.Thread(target=self._read_loop, name="tmux-control", daemon=True)
+        reader.start()
+
+        if not self._ready.wait(STARTUP_TIMEOUT_SECONDS) or not self._alive:
+            self.close()
+            return False
+
+        if self.session_id is None:
+            result = self.run(["display-message", "-p", "#{session_id}"])
+            if result is not None and result.returncode == 0 and self.session_id is None:
+                self.session_id = result.stdout.strip() or None
+
+        logger.debug("Conexión tmux control mode establecida")
+        return True
+
+    def run(
+        self, args: list[str], timeout: float = COMMAND_TIMEOUT_SECONDS
+    ) -> subprocess.CompletedProcess | None:
+        """
+        Ejecuta un comando tmux a través de la conexión de control.
+
+        Returns:
+            CompletedProcess con stdout/stderr en texto, o None si el comando
+            no se llegó a enviar (el llamador puede usar subprocess como
+            fallback). Si se envió pero la conexión se cortó o no respondió
+            a tiempo, retorna un resultado fallido: el comando pudo haberse
+            ejecutado y repetirlo no es seguro (new-window, kill-session...)
+        """
+        try:
+            line = " ".join(quote_argument(arg) for arg in args)
+        except ValueError:
+            return None
+
+        pending = _PendingCommand(args)
+        with self._write_lock:
+            if not self._alive or self._proc is None or self._proc.stdin is None:
+                return None
+            self._pending.append(pending)
+            try:
+                self._proc.stdin.write(line + "\n")
+                self._proc.stdin.flush()
+            except (OSError, ValueError):
+                self._mark_dead()
+                return None
+
+        if not pending.event.wait(timeout):
+            # Sin respuesta: la cola FIFO queda desincronizada, cerrar
+            logger.warning(f"Timeout en tmux control mode: {args[0] if args else ''}")
+            self.close()
+            return subprocess.CompletedProcess(args, 1, "", "tmux control mode: timeout\n")
+
+        if pending.returncode is None:
+            # Conexión caída con el comando ya enviado
+            return subprocess.CompletedProcess(args, 1, "", "tmux control mode: connection lost\n")
+
+        output = "\n".join(pending.lines) + "\n" if pending.lines else ""
+        if pending.returncode == 0:
+            return subprocess.CompletedProcess(args, 0, output, "")
+        return subprocess.CompletedProcess(args, 1, "", output)
+
+    def close(self):
+        """Cierra el cliente de control (detach, sin afectar sesiones)."""
+        self._closed = True
+        proc = self._proc
+        self._mark_dead()
+        if proc is None:
+            return
+        try:
+            if proc.stdin:
+                proc.stdin.close()
+            proc.wait(timeout=1)
+        except (OSError, ValueError, subprocess.TimeoutExpired):
+            proc.kill()
+
+    def _read_loop(self):
+        """Lee stdout de tmux y empareja bloques de respuesta con comandos."""
+        proc = self._proc
+        if proc is None or proc.stdout is None:
+            return
+
+        block: list[str] | None = None
+        block_guard: list[str] = []
+        block_flags = 0
+
+        try:
+            for raw_line in proc.stdout:
+                line = raw_line.rstrip("\n")
+
+                if block is not None:
+                    parts = line.split(" ")
+                    # El guard (time number) evita confundir output con el cierre
+                    if parts[0] in ("%end", "%error") and parts[1:3] == block_guard:
+                        self._finish_block(block, parts[0] == "%end", block_flags)
+                        block = None
+                    else:
+                        block.append(line)
+                    continue
+
+                if line.startswith("%begin "):
+                    parts = line.split(" ")
+                    block = []
+                    block_guard = parts[1:3]
+                    block_flags = int(parts[3]) if len(parts) > 3 and parts[3].isdigit() else 0
+                elif line.startswith("%exit"):
+                    break
+                elif line.startswith("%"):
+                    self._handle_notification(line)
+        except (OSError, ValueError):
+            pass
+        finally:
+            self._mark_dead()
+            # Avisar de la desconexión para que el llamador resincronice
+            if self._attached and not self._closed:
+                self._notify("%exit", [])
+
+    def _finish_block(self, lines: list[str], success: bool, flags: int):
+        """Entrega un bloque de respuesta al comando pendiente más antiguo."""
+        if not flags & _FLAG_CLIENT_COMMAND:
+            # Bloque del attach inicial: la conexión está lista (o falló)
+            if success:
+                self._attached = True
+            else:
+                self._mark_dead()
+            self._ready.set()
+            return
+
+        try:
+            pending = self._pending.popleft()
+        except IndexError:
+            return
+        pending.lines = lines
+        pending.returncode = 0 if success else 1
+        pending.event.set()
+
+    def _handle_notification(self, line: str):
+        """Procesa una notificación asíncrona de tmux (%session-changed, etc)."""
+        name, args = parse_notification(line)
+        if name == "%session-changed" and args:
+            self.session_id = args[0]
+        self._notify(name, args)
+
+    def _notify(self, name: str, args: list[str]):
+        """Entrega una notificación al handler sin dejar caer el thread lector."""
+        if self._notification_handler is None:
+            return
+        try:
+            self._notification_handler(name, args)
+        except Exception as e:
+            logger.warning(f"Error en handler de notificación {name}: {e}")
+
+    def _mark_dead(self):
+        """Marca la conexión como caída y libera a todos los comandos en espera."""
+        self._alive = False
+        self._ready.set()
+        while self._pending:
+            self._pending.popleft().event.set()
@@ -0,0 +1,38 @@
+"""
+control_notifications.py - Notificaciones de tmux en control mode
+
+Parseo de las líneas %... que tmux envía sin que se las pidan
+(%window-add, %session-renamed, etc).
+
+Autor: Homero Thompson del Lago del Terror
+"""
+
+from collections.abc import Callable
+
+# Callback de notificaciones: (nombre, argumentos), ej: ("%window-add", ["@3"])
+NotificationHandler = Callable[[str, list[str]], None]
+
+# Cantidad de argumentos antes del texto libre (nombres con espacios)
+_NOTIFICATION_ARGC = {
+    "%window-renamed": 1,
+    "%unlinked-window-renamed": 1,
+    "%session-renamed": 1,
+    "%session-changed": 1,
+    "%client-session-changed": 2,
+}
+
+
+def parse_notification(line: str) -> tuple[str, list[str]]:
+    """
+    Separa una notificación de control mode en nombre y argumentos.
+
+    El último argumento de las notificaciones con nombre (ej: %window-renamed
+    @1 mi ventana) se conserva completo aunque tenga espacios.
+    """
+    name, _, rest = line.partition(" ")
+    if not rest:
+        return name, []
+    argc = _NOTIFICATION_ARGC.get(name)
+    if argc is None:
+        return name, rest.split(" ")
+    return name, rest.split(" ", argc)
@@ -0,0 +1,130 @@
+"""
+dir_cache.py - Caché de listados de directorios remotos
+
+Caché LRU con TTL por path para los listados de RemoteTmuxClient. Evita
+volver a listar por SSH los directorios expandidos en cada expandir/colapsar
+del árbol. El uso de memoria se limita por cantidad de directorios y por
+cantidad total de entradas cacheadas.
+
+Cada invalidación incrementa una generación global. Quien lista un
+directorio toma la generación antes del comando SSH y la pasa a put(): si
+hubo una invalidación mientras tanto (ej: un rename), el listado puede ser
+anterior al cambio y no se guarda.
+
+Autor: Homero Thompson del Lago del Terror
+"""
+
+import posixpath
+import threading
+import time
+from collections import OrderedDict
+
+from .models import RemoteEntry
+
+# Segundos que un listado se considera fresco
+DEFAULT_TTL_SECONDS = 10.0
+# Máximo de directorios cacheados
+DEFAULT_MAX_DIRS = 256
+# Máximo de entradas (archivos) sumando todos los directorios
+DEFAULT_MAX_ENTRIES = 20_000
+
+
+def normalize_dir(path: str) -> str:
+    """Normaliza un path remoto para usarlo como clave (sin '/' final)."""
+    return posixpath.normpath(path) if path else path
+
+
+class DirectoryCache:
+    """Caché LRU con TTL de listados de directorios (thread-safe)."""
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_TTL_SECONDS,
+        max_dirs: int = DEFAULT_MAX_DIRS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        self._ttl = ttl
+        self._max_dirs = max_dirs
+        self._max_entries = max_entries
+        # path -> (timestamp, entries); el orden es el de uso (LRU al inicio)
+        self._data: OrderedDict[str, tuple[float, list[RemoteEntry]]] = OrderedDict()
+        self._total_entries = 0
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, path: str) -> list[RemoteEntry] | None:
+        """Retorna el listado si está cacheado y fresco, o None."""
+        key = normalize_dir(path)
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            timestamp, entries = item
+            if time.monotonic() - timestamp > self._ttl:
+                self._pop(key)
+                return None
+            self._data.move_to_end(key)
+            return entries
+
+    @property
+    def generation(self) -> int:
+        """Generación actual; tomarla antes de listar y pasarla a put()."""
+        return self._generation
+
+    def put(self, path: str, entries: list[RemoteEntry], generation: int | None = None):
+        """
+        Guarda un listado (no se cachean errores).
+
+        Args:
+            path: Directorio listado
+            entries: Entradas del directorio
+            generation: Generación tomada antes de listar; si hubo una
+                invalidación desde entonces el listado se descarta
+        """
+        key = normalize_dir(path)
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._pop(key)
+            if len(entries) > self._max_entries:
+                return
+            self._data[key] = (time.monotonic(), entries)
+            self._total_entries += len(entries)
+            while len(self._data) > self._max_dirs or self._total_entries > self._max_entries:
+                oldest = next(iter(self._data))
+                self._pop(oldest)
+
+    def invalidate(self, path: str):
+        """Descarta el listado de un directorio."""
+        with self._lock:
+            self._generation += 1
+            self._pop(normalize_dir(path))
+
+    def invalidate_tree(self, path: str):
+        """Descarta un directorio y todos sus subdirectorios cacheados."""
+        key = normalize_dir(path)
+        prefix = key.rstrip("/") + "/"
+        with self._lock:
+            self._generation += 1
+            for cached in [p for p in self._data if p == key or p.startswith(prefix)]:
+                self._pop(cached)
+
+    def invalidate_parent(self, path: str):
+        """Descarta el listado del directorio que contiene a path."""
+        self.invalidate(posixpath.dirname(normalize_dir(path)))
+
+    def clear(self):
+        """Vacía el caché."""
+        with self._lock:
+            self._generation += 1
+            self._data.clear()
+            self._total_entries = 0
+
+    def _pop(self, key: str):
+        """Elimina una clave actualizando el contador (con el lock tomado)."""
+        item = self._data.pop(key, None)
+        if item is not None:
+            self._total_entries -= len(item[1])
@@ -6,34 +6,97 @@ Autor: Homero Thompson del Lago del Terror
 
 import shutil
 import subprocess
+from collections.abc import Callable
 
-from .models import Session, Window, is_flatpak
-from .parsers import (
-    SESSION_FORMAT,
-    WINDOW_FORMAT,
-    parse_sessions_output,
-    parse_windows_output,
-)
+from .async_calls import AsyncCallsMixin
+from .control_engine import ControlModeEngine
+from .control_notifications import NotificationHandler
+from .models import Session, is_flatpak
+from .parsers import SESSION_WINDOWS_FORMAT, parse_session_windows_output
 
 
-class TmuxClient:
+class TmuxClient(AsyncCallsMixin):
     """Cliente para interactuar con tmux local via subprocess."""
 
-    def __init__(self):
+    def __init__(self, control_mode: bool = False, dispatcher: Callable | None = None):
+        """
+        Args:
+            control_mode: Si es True, usa una conexión persistente `tmux -C`
+                para los comandos (con fallback a subprocess)
+            dispatcher: Función que ejecuta los callbacks de call_async en el
+                thread de la UI, con la firma de GLib.idle_add(func, *args).
+                Si es None, los callbacks corren en el thread worker
+        """
         self._is_flatpak = is_flatpak()
         if self._is_flatpak:
             self._tmux_path: str | None = "tmux"
         else:
             self._tmux_path = shutil.which("tmux")
 
-    def _run_tmux(self, args: list[str], **kwargs) -> subprocess.CompletedProcess:
-        """Ejecuta un comando tmux, usando flatpak-spawn si está en Flatpak."""
+        self._control: ControlModeEngine | None = None
+        if control_mode and self.is_available:
+            self._control = ControlModeEngine(self._tmux_command())
+
+        self._init_async_calls(dispatcher)
+
+    def _tmux_command(self) -> list[str]:
+        """Retorna el comando base de tmux, usando flatpak-spawn si está en Flatpak."""
         if self._is_flatpak:
-            cmd = ["flatpak-spawn", "--host", "tmux"] + args
-        else:
-            cmd = ["tmux"] + args
+            return ["flatpak-spawn", "--host", "tmux"]
+        return ["tmux"]
+
+    def _run_tmux(
+        self, args: list[str], use_control: bool = True, **kwargs
+    ) -> subprocess.CompletedProcess:
+        """
+        Ejecuta un comando tmux.
+
+        Usa la conexión de control mode si está activa (sin fork+exec por
+        comando); si no está disponible, lanza un subprocess. Un comando que
+        ya se envió por control mode nunca se repite por subprocess.
+
+        Args:
+            args: Argumentos del comando tmux
+            use_control: False para forzar subprocess (comandos que dependen
+                del "cliente actual" implícito de tmux)
+        """
+        if use_control and self._control is not None:
+            result = self._control.run(args, kwargs)
+            if result is not None:
+                return result
+
+        cmd = self._tmux_command() + args
         return subprocess.run(cmd, **kwargs)
 
+    @property
+    def control_session_id(self) -> str | None:
+        """Sesión donde está adjunto el cliente de control mode (si hay)."""
+        if self._control is None:
+            return None
+        return self._control.session_id
+
+    @property
+    def notifications_active(self) -> bool:
+        """True si la conexión de control mode está activa en este momento."""
+        return self._control is not None and self._control.is_connected
+
+    def add_notification_handler(self, handler: NotificationHandler):
+        """
+        Suscribe un callback a las notificaciones de tmux (%window-add, etc).
+
+        El callback se invoca desde un thread secundario. Solo hay
+        notificaciones mientras la conexión de control mode está activa
+        (ver notifications_active).
+        """
+        if self._control is not None:
+            self._control.add_notification_handler(handler)
+
+    def close(self):
+        """Cierra la conexión de control mode (las sesiones no se afectan)."""
+        self._shutdown_async_calls()
+        if self._control is not None:
+            self._control.close()
+
     @property
     def is_available(self) -> bool:
         """Verifica si tmux está instalado."""
@@ -49,36 +112,26 @@ class TmuxClient:
         return result.returncode == 0
 
     def list_sessions(self) -> list[Session]:
-        """Lista todas las sesiones de tmux con sus ventanas."""
-        if not self.has_server():
-            return []
+        """Lista todas las sesiones de tmux con sus ventanas.
 
-        result = self._run_tmux(
-            ["list-sessions", "-F", SESSION_FORMAT],
-            capture_output=True,
-            text=True,
-        )
-
-        if result.returncode != 0:
+        Usa una sola query (list-windows -a) para construir el árbol completo,
+        así el costo del refresh no crece con la cantidad de sesiones.
+        """
+        if not self.is_available:
             return []
 
-        sessions = parse_sessions_output(result.stdout)
-        for session in sessions:
-            session.windows = self._list_windows(session.name)
-        return sessions
-
-    def _list_windows(self, session_name: str) -> list[Window]:
-        """Lista las ventanas de una sesión."""
         result = self._run_tmux(
-            ["list-windows", "-t", session_name, "-F", WINDOW_FORMAT],
+            ["list-windows", "-a", "-F", SESSION_WINDOWS_FORMAT],
             capture_output=True,
             text=True,
         )
 
+        # Sin servidor corriendo list-windows falla: no hay sesiones
         if result.returncode != 0:
             return []
 
-        return parse_windows_output(result.stdout)
+        # El cliente de control cuenta como attached en su sesión: descontarlo
+        return parse_session_windows_output(result.stdout, self.control_session_id)
 
     def create_session(self, name: str) -> bool:
         """Crea una nueva sesión de tmux."""
@@ -92,7 +145,13 @@ class TmuxClient:
             ["new-session", "-d", "-s", name],
             capture_output=True,
         )
-        return result.returncode == 0
+        if result.returncode != 0:
+            return False
+
+        # Puede ser la primera sesión: control mode ya puede conectarse
+        if self._control is not None:
+            self._control.reset_backoff()
+        return True
 
     def kill_session(self, name: str) -> bool:
         """Elimina una sesión de tmux."""
@@ -170,26 +229,24 @@ class TmuxClient:
 
     def split_horizontal(self, target: str | None = None) -> bool:
         """Divide el panel horizontalmente (paneles lado a lado)."""
-        if not self.is_available:
-            return False
-
-        cmd = ["split-window", "-h"]
-        if target:
-            cmd.extend(["-t", target])
-
-        result = self._run_tmux(cmd, capture_output=True)
-        return result.returncode == 0
+        return self._split_window("-h", target)
 
     def split_vertical(self, target: str | None = None) -> bool:
         """Divide el panel verticalmente (paneles apilados)."""
+        return self._split_window("-v", target)
+
+    def _split_window(self, flag: str, target: str | None) -> bool:
+        """Divide el panel con split-window (flag: -h o -v)."""
         if not self.is_available:
             return False
 
-        cmd = ["split-window", "-v"]
+        cmd = ["split-window", flag]
         if target:
             cmd.extend(["-t", target])
 
-        result = self._run_tmux(cmd, capture_output=True)
+        # Sin target, tmux resuelve el "cliente actual": en control mode sería
+        # nuestro propio cliente de control, así que usar subprocess
+        result = self._run_tmux(cmd, use_control=target is not None, capture_output=True)
         return result.returncode == 0
 
     def swap_windows(self, session_name: str, src_index: int, dst_index: int) -> bool:
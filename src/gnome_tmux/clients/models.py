@@ -5,8 +5,10 @@ Autor: Homero Thompson del Lago del Terror
 """
 
 import os
+from collections.abc import Callable
 from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Protocol
 
 
 def is_flatpak() -> bool:
@@ -28,6 +30,7 @@ class Window:
     index: int
     name: str
     active: bool
+    window_id: str = ""
 
 
 @dataclass
@@ -38,3 +41,45 @@ class Session:
     window_count: int
     attached: bool
     windows: list[Window] = field(default_factory=list)
+    session_id: str = ""
+
+
+@dataclass(slots=True)
+class RemoteEntry:
+    """Entrada de un directorio remoto (archivo, directorio o symlink)."""
+
+    name: str
+    is_dir: bool
+    is_link: bool = False
+    size: int = 0
+    mtime: float = 0.0
+    mode: int = 0
+    link_target: str = ""
+
+    @property
+    def is_hidden(self) -> bool:
+        """True si es un archivo oculto (empieza con '.')."""
+        return self.name.startswith(".")
+
+
+@dataclass(slots=True)
+class SearchHit:
+    """Resultado de una búsqueda (path absoluto y tipo).
+
+    La búsqueda por contenido local agrega la línea de la primera
+    coincidencia y un fragmento de esa línea.
+    """
+
+    path: str
+    is_dir: bool = False
+    line: int = 0
+    preview: str = ""
+
+
+class Cancellable(Protocol):
+    """Token de cancelación de una búsqueda (ej: CancelToken del árbol)."""
+
+    @property
+    def cancelled(self) -> bool: ...
+
+    def on_cancel(self, callback: Callable[[], None]): ...
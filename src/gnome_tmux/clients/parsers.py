@@ -1,10 +1,10 @@
 """
-parsers.py - Funciones de parsing para output de tmux
+parsers.py - Funciones de parsing para output de tmux y listados remotos
 
 Autor: Homero Thompson del Lago del Terror
 """
 
-from .models import Session, Window
+from .models import RemoteEntry, SearchHit, Session, Window
 
 
 def parse_session_line(line: str) -> Session | None:
@@ -52,6 +52,53 @@ def parse_window_line(line: str) -> Window | None:
         return None
 
 
+def parse_session_windows_output(
+    output: str, control_session_id: str | None = None
+) -> list[Session]:
+    """
+    Parsea el output de list-windows -a con SESSION_WINDOWS_FORMAT.
+
+    Construye el árbol completo de sesiones y ventanas a partir de una sola
+    query. El nombre de ventana va al final porque puede contener ':'
+    (tmux no permite ':' en nombres de sesión).
+
+    Args:
+        output: Output de tmux
+        control_session_id: Sesión donde hay un cliente de control mode propio,
+            que no debe contar como attached
+    """
+    sessions: dict[str, Session] = {}
+    for line in output.strip().split("\n"):
+        parts = line.split(":", 7)
+        if len(parts) < 8:
+            continue
+
+        session_id, window_id, window_count, attached, index, active, s_name, w_name = parts
+        try:
+            window = Window(
+                index=int(index),
+                name=w_name,
+                active=active == "1",
+                window_id=window_id,
+            )
+            session = sessions.get(session_id)
+            if session is None:
+                clients = int(attached)
+                if session_id == control_session_id:
+                    clients -= 1
+                session = Session(
+                    name=s_name,
+                    window_count=int(window_count),
+                    attached=clients > 0,
+                    session_id=session_id,
+                )
+                sessions[session_id] = session
+        except ValueError:
+            continue
+        session.windows.append(window)
+    return list(sessions.values())
+
+
 def parse_sessions_output(output: str) -> list[Session]:
     """Parsea el output completo de list-sessions."""
     sessions = []
@@ -75,3 +122,168 @@ def parse_windows_output(output: str) -> list[Window]:
 # Formatos de tmux para queries
 SESSION_FORMAT = "#{session_name}:#{session_windows}:#{session_attached}"
 WINDOW_FORMAT = "#{window_index}:#{window_name}:#{window_active}"
+SESSION_WINDOWS_FORMAT = (
+    "#{session_id}:#{window_id}:#{session_windows}:#{session_attached}:"
+    "#{window_index}:#{window_active}:#{session_name}:#{window_name}"
+)
+
+
+# Formato de find -printf para listar directorios remotos: tipo, tipo del
+# destino (sigue symlinks), tamaño, mtime, permisos, destino del symlink y
+# nombre. Cada campo termina en NUL, el único byte que no puede aparecer en
+# un nombre de archivo
+FIND_LISTING_FORMAT = "%y\\0%Y\\0%s\\0%T@\\0%m\\0%l\\0%f\\0"
+FIND_LISTING_FIELDS = 7
+# Marca el inicio de cada directorio en un listado de varios directorios
+FIND_SECTION_MARKER = "@@"
+# Formato de find -printf para búsquedas: tipo (sigue symlinks) y path
+FIND_SEARCH_FORMAT = "%Y\\0%p\\0"
+FIND_SEARCH_FIELDS = 2
+
+
+def sort_remote_entries(entries: list[RemoteEntry]) -> list[RemoteEntry]:
+    """Ordena entradas: directorios primero, luego por nombre."""
+    entries.sort(key=lambda e: (not e.is_dir, e.name.lower()))
+    return entries
+
+
+def _parse_find_record(fields: list[str]) -> RemoteEntry | None:
+    """Convierte los campos de un registro de FIND_LISTING_FORMAT en una entrada."""
+    kind, target_kind, size, mtime, mode, link_target, name = fields
+    try:
+        return RemoteEntry(
+            name=name,
+            is_dir=target_kind == "d",
+            is_link=kind == "l",
+            size=int(size),
+            mtime=float(mtime),
+            mode=int(mode, 8),
+            link_target=link_target,
+        )
+    except ValueError:
+        return None
+
+
+def parse_find_listing(output: str) -> list[RemoteEntry]:
+    """
+    Parsea el output de find -printf con FIND_LISTING_FORMAT.
+
+    Los symlinks a directorios cuentan como directorios (se pueden expandir).
+    """
+    fields = output.split("\0")
+    entries = []
+    for i in range(0, len(fields) - FIND_LISTING_FIELDS + 1, FIND_LISTING_FIELDS):
+        entry = _parse_find_record(fields[i : i + FIND_LISTING_FIELDS])
+        if entry is not None:
+            entries.append(entry)
+    return sort_remote_entries(entries)
+
+
+def parse_find_sections(output: str, count: int) -> list[list[RemoteEntry] | None]:
+    """
+    Parsea el listado de varios directorios generado en un solo comando.
+
+    Cada directorio empieza con un campo FIND_SECTION_MARKER + índice y sus
+    registros de FIND_LISTING_FORMAT; FIND_SECTION_MARKER + "ERR" indica que
+    ese directorio falló. Los marcadores solo se buscan al inicio de un
+    registro, donde el primer campo de una entrada es siempre una letra (%y).
+
+    Args:
+        output: Output del comando remoto
+        count: Cantidad de directorios pedidos
+
+    Returns:
+        Una lista de entradas (o None si falló) por directorio, en orden
+    """
+    results: list[list[RemoteEntry] | None] = [None] * count
+    fields = output.split("\0")
+    current: int | None = None
+    i = 0
+    while i < len(fields):
+        field = fields[i]
+        if field.startswith(FIND_SECTION_MARKER):
+            tag = field[len(FIND_SECTION_MARKER) :]
+            if tag == "ERR":
+                if current is not None:
+                    results[current] = None
+                current = None
+            elif tag.isdigit() and int(tag) < count:
+                current = int(tag)
+                results[current] = []
+            i += 1
+            continue
+
+        record = fields[i : i + FIND_LISTING_FIELDS]
+        if len(record) < FIND_LISTING_FIELDS:
+            break
+        section = results[current] if current is not None else None
+        if section is not None:
+            entry = _parse_find_record(record)
+            if entry is not None:
+                section.append(entry)
+        i += FIND_LISTING_FIELDS
+
+    for section in results:
+        if section is not None:
+            sort_remote_entries(section)
+    return results
+
+
+def parse_find_search(output: str) -> list[SearchHit]:
+    """
+    Parsea el output de find -printf con FIND_SEARCH_FORMAT.
+
+    El tipo viene en el mismo output, así mostrar los resultados no requiere
+    otro round trip por cada uno para saber si es un directorio.
+    """
+    fields = output.split("\0")
+    hits = []
+    for i in range(0, len(fields) - FIND_SEARCH_FIELDS + 1, FIND_SEARCH_FIELDS):
+        kind, path = fields[i : i + FIND_SEARCH_FIELDS]
+        if path:
+            hits.append(SearchHit(path, is_dir=kind == "d"))
+    return hits
+
+
+def parse_search_lines(output: str) -> list[SearchHit]:
+    """
+    Parsea el output de la búsqueda POSIX (sin find -printf ni head -z).
+
+    Un path por línea; los directorios terminan en '/' (grep solo lista
+    archivos, así que en búsquedas por contenido nunca aparece).
+    """
+    hits = []
+    for line in output.split("\n"):
+        path = line.rstrip("/")
+        if path:
+            hits.append(SearchHit(path, is_dir=line.endswith("/")))
+    return hits
+
+
+def parse_ls_listing(output: str) -> list[RemoteEntry]:
+    """
+    Parsea el output de ls -Al (fallback sin find -printf, ej: BusyBox).
+
+    Solo obtiene nombre y tipo; tamaño y fecha quedan en 0.
+    """
+    entries = []
+    for line in output.strip().split("\n"):
+        if not line or line.startswith("total"):
+            continue
+
+        parts = line.split()
+        if len(parts) < 9:
+            if len(parts) >= 8:
+                perms = parts[0]
+                name = " ".join(parts[7:])
+            else:
+                continue
+        else:
+            perms = parts[0]
+            name = " ".join(parts[8:])
+
+        if name in (".", ".."):
+            continue
+
+        entries.append(RemoteEntry(name=name, is_dir=perms.startswith("d")))
+    return sort_remote_entries(entries)
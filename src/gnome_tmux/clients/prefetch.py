@@ -0,0 +1,155 @@
+"""
+prefetch.py - Precarga de listados de directorios remotos
+
+Lista en background los directorios que probablemente se expandan (el que
+está bajo el puntero, los subdirectorios de una carpeta recién expandida)
+para que el listado ya esté en el DirectoryCache del cliente cuando se pida.
+
+La precarga nunca compite con las operaciones del usuario: por host hay un
+máximo de comandos SSH simultáneos, los directorios se piden en lotes (un
+solo comando por lote) y un presupuesto de entradas por segundo (token
+bucket) limita el ancho de banda usado.
+
+Autor: Homero Thompson del Lago del Terror
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+
+from .dir_cache import normalize_dir
+
+try:
+    from loguru import logger
+except ImportError:
+    import logging
+
+    logger = logging.getLogger(__name__)
+
+# Comandos SSH de precarga simultáneos por host
+DEFAULT_MAX_IN_FLIGHT = 1
+# Directorios pedidos en un mismo comando
+DEFAULT_BATCH_DIRS = 8
+# Directorios en espera (se descartan los pedidos más viejos)
+DEFAULT_MAX_QUEUED = 32
+# Presupuesto: entradas por segundo y ráfaga máxima
+DEFAULT_ENTRIES_PER_SECOND = 2000.0
+DEFAULT_BURST_ENTRIES = 10_000.0
+
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="remote-prefetch")
+
+
+class RemotePrefetcher:
+    """Precarga listados de un RemoteTmuxClient en su dir_cache (thread-safe)."""
+
+    def __init__(
+        self,
+        client,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        batch_dirs: int = DEFAULT_BATCH_DIRS,
+        max_queued: int = DEFAULT_MAX_QUEUED,
+        entries_per_second: float = DEFAULT_ENTRIES_PER_SECOND,
+        burst_entries: float = DEFAULT_BURST_ENTRIES,
+        submit: Callable = _executor.submit,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            client: Cliente con list_dirs() y dir_cache
+            max_in_flight: Comandos de precarga simultáneos
+            batch_dirs: Directorios por comando
+            max_queued: Directorios en espera como máximo
+            entries_per_second: Entradas recuperadas por segundo (promedio)
+            burst_entries: Entradas que se pueden recuperar de golpe
+            submit: Ejecuta una función en background
+            clock: Reloj monotónico (segundos)
+        """
+        self._client = client
+        self._max_in_flight = max_in_flight
+        self._batch_dirs = batch_dirs
+        self._max_queued = max_queued
+        self._rate = entries_per_second
+        self._burst = burst_entries
+        self._submit = submit
+        self._clock = clock
+        self._lock = threading.Lock()
+        # Pedidos en espera; los más recientes al final (se atienden primero)
+        self._queue: OrderedDict[str, None] = OrderedDict()
+        self._in_flight: set[str] = set()
+        self._running = 0
+        self._tokens = burst_entries
+        self._refilled_at = clock()
+        self._closed = False
+
+    def prefetch(self, paths: Iterable[str]):
+        """Agrega directorios a precargar (ignora los cacheados o en curso)."""
+        with self._lock:
+            if self._closed:
+                return
+            for path in paths:
+                key = normalize_dir(path)
+                if key in self._in_flight or self._client.dir_cache.get(key) is not None:
+                    continue
+                self._queue.pop(key, None)
+                self._queue[key] = None
+            while len(self._queue) > self._max_queued:
+                self._queue.popitem(last=False)
+        self._schedule()
+
+    def close(self):
+        """Descarta los pedidos en espera y no acepta nuevos."""
+        with self._lock:
+            self._closed = True
+            self._queue.clear()
+
+    def _schedule(self):
+        """
+        Lanza lotes mientras haya lugar y presupuesto.
+
+        Sin presupuesto los pedidos quedan en espera hasta el próximo
+        prefetch() o el fin de un lote.
+        """
+        batches = []
+        with self._lock:
+            while (
+                not self._closed
+                and self._queue
+                and self._running < self._max_in_flight
+                and self._has_budget()
+            ):
+                count = min(self._batch_dirs, len(self._queue))
+                batch = [self._queue.popitem()[0] for _ in range(count)]
+                self._in_flight.update(batch)
+                self._running += 1
+                batches.append(batch)
+        for batch in batches:
+            self._submit(self._fetch, batch)
+
+    def _has_budget(self) -> bool:
+        """Recarga el token bucket y retorna True si queda presupuesto."""
+        now = self._clock()
+        self._tokens = min(self._burst, self._tokens + (now - self._refilled_at) * self._rate)
+        self._refilled_at = now
+        return self._tokens > 0
+
+    def _fetch(self, batch: list[str]):
+        """
+        Worker: lista un lote en un solo comando (list_dirs llena el caché).
+
+        list_dirs toma la generación del caché antes del SSH: si el usuario
+        modifica un directorio mientras el lote corre, no se guarda nada viejo.
+        """
+        try:
+            listings = self._client.list_dirs(batch)
+        except Exception as e:
+            logger.debug(f"Prefetch failed for {batch}: {e}")
+            listings = {}
+        fetched = sum(len(entries) for entries in listings.values() if entries)
+        with self._lock:
+            # El costo se descuenta después: el bucket puede quedar negativo
+            self._tokens -= fetched
+            self._in_flight.difference_update(batch)
+            self._running -= 1
+        self._schedule()
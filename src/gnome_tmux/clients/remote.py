@@ -4,6 +4,7 @@ remote.py - Cliente tmux remoto via SSH
 Autor: Homero Thompson del Lago del Terror
 """
 
+import posixpath
 import shlex
 import subprocess
 from pathlib import Path
@@ -15,14 +16,54 @@ except ImportError:
 
     logger = logging.getLogger(__name__)  # type: ignore
 
-from .models import Session, Window, get_ssh_control_path
+from .connection_monitor import ConnectionMonitor
+from .dir_cache import DirectoryCache
+from .models import Cancellable, RemoteEntry, SearchHit, Session, get_ssh_control_path
 from .parsers import (
-    SESSION_FORMAT,
-    WINDOW_FORMAT,
-    parse_sessions_output,
-    parse_windows_output,
+    FIND_LISTING_FORMAT,
+    FIND_SEARCH_FIELDS,
+    FIND_SEARCH_FORMAT,
+    FIND_SECTION_MARKER,
+    SESSION_WINDOWS_FORMAT,
+    parse_find_listing,
+    parse_find_search,
+    parse_find_sections,
+    parse_ls_listing,
+    parse_search_lines,
+    parse_session_windows_output,
 )
 
+# Código de salida del shell remoto cuando el comando no existe
+COMMAND_NOT_FOUND_EXIT_CODE = 127
+# Código de salida de ssh cuando falla la conexión (no el comando remoto)
+SSH_CONNECTION_ERROR_EXIT_CODE = 255
+# Máximo de resultados de una búsqueda remota
+MAX_SEARCH_RESULTS = 100
+# Marca de list_dirs cuando el find remoto no soporta -printf
+NO_PRINTF_MARKER = FIND_SECTION_MARKER + "NOPRINTF"
+# Sonda de búsqueda: head -z, grep --null y find -printf (GNU). Sin ellos
+# (BSD, BusyBox) se usa la variante POSIX separada por saltos de línea
+GNU_SEARCH_PROBE = (
+    "printf '' | head -z -n 1 >/dev/null 2>&1"
+    " && printf 'x\\n' | grep -q --null x 2>/dev/null"
+    " && find / -maxdepth 0 -printf '' >/dev/null 2>&1"
+)
+# Acción de find POSIX: los directorios se imprimen con '/' final
+POSIX_FIND_MARK_DIRS = r"""\( -type d -exec sh -c 'printf "%s/\n" "$@"' sh {} + -o -print \)"""
+
+
+def split_copy_name(name: str) -> tuple[str, str]:
+    """
+    Separa un nombre en (base, extensión) para generar nombres de copia.
+
+    Los archivos ocultos y los nombres sin punto no tienen extensión:
+    "a.tar.gz" -> ("a.tar", ".gz"), ".env" -> (".env", "").
+    """
+    if "." in name and not name.startswith("."):
+        stem, ext = name.rsplit(".", 1)
+        return stem, f".{ext}"
+    return name, ""
+
 
 class RemoteTmuxClient:
     """Cliente para interactuar con tmux en un servidor remoto via SSH."""
@@ -36,6 +77,16 @@ class RemoteTmuxClient:
         self._sessions_cache: list[Session] | None = None
         self._cache_time: float = 0.0
         self._cache_ttl: float = 5.0  # segundos
+        # True si el último list_sessions detectó que tmux no está instalado
+        self.tmux_missing = False
+        # Caché de listados de directorios (se invalida en cada modificación)
+        self.dir_cache = DirectoryCache()
+        # Estado de la conexión cacheado (evita un `ssh -O check` por operación)
+        self._monitor = ConnectionMonitor(
+            self._control_path,
+            socket_exists=lambda: Path(self._control_path).exists(),
+            check=self._check_master,
+        )
         logger.debug(f"RemoteTmuxClient creado para {user}@{host}:{port}")
 
     def _get_ssh_base(self) -> list[str]:
@@ -66,27 +117,85 @@ class RemoteTmuxClient:
         remote_cmd = "tmux " + " ".join(escaped_args)
         cmd = self._get_ssh_base() + [remote_cmd]
         try:
-            return subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
         except subprocess.TimeoutExpired:
-            return subprocess.CompletedProcess(cmd, 1, "", "timeout")
+            result = subprocess.CompletedProcess(cmd, 1, "", "timeout")
+            self._monitor.invalidate()
+        self._track_ssh_result(result)
+        return result
 
-    def _run_ssh_command(self, command: str, timeout: float = 5.0) -> subprocess.CompletedProcess:
-        """Ejecuta un comando SSH genérico (no tmux)."""
+    def _run_ssh_command(
+        self, command: str, timeout: float = 5.0, token: Cancellable | None = None
+    ) -> subprocess.CompletedProcess:
+        """
+        Ejecuta un comando SSH genérico (no tmux).
+
+        Args:
+            command: Comando remoto
+            timeout: Segundos máximos de espera
+            token: Cancela el comando (mata ssh, lo que corta el remoto)
+        """
         if not Path(self._control_path).exists():
             return subprocess.CompletedProcess([], 1, "", "no connection")
 
         cmd = self._get_ssh_base() + [command]
+        if token is not None:
+            return self._run_cancellable(cmd, timeout, token)
+        try:
+            # surrogateescape: nombres no UTF-8 se conservan para reusarlos en paths
+            result = subprocess.run(
+                cmd, capture_output=True, text=True, errors="surrogateescape", timeout=timeout
+            )
+        except subprocess.TimeoutExpired:
+            result = subprocess.CompletedProcess(cmd, 1, "", "timeout")
+            self._monitor.invalidate()
+        self._track_ssh_result(result)
+        return result
+
+    def _run_cancellable(
+        self, cmd: list[str], timeout: float, token: Cancellable
+    ) -> subprocess.CompletedProcess:
+        """Ejecuta ssh con Popen para poder matarlo al cancelar el token."""
+        if token.cancelled:
+            return subprocess.CompletedProcess(cmd, 1, "", "cancelled")
+        proc = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            errors="surrogateescape",
+        )
+        token.on_cancel(proc.kill)
         try:
-            return subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+            stdout, stderr = proc.communicate(timeout=timeout)
         except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.communicate()
+            self._monitor.invalidate()
             return subprocess.CompletedProcess(cmd, 1, "", "timeout")
+        if token.cancelled:
+            # Cancelado: no es un fallo de la conexión
+            return subprocess.CompletedProcess(cmd, 1, "", "cancelled")
+        result = subprocess.CompletedProcess(cmd, proc.returncode, stdout, stderr)
+        self._track_ssh_result(result)
+        return result
+
+    def _track_ssh_result(self, result: subprocess.CompletedProcess):
+        """Si ssh falló por la conexión, re-verificarla en la próxima consulta."""
+        if result.returncode == SSH_CONNECTION_ERROR_EXIT_CODE:
+            self._monitor.invalidate()
 
     def is_connected(self) -> bool:
-        """Verifica si hay una conexión SSH activa (ControlMaster)."""
-        socket_path = Path(self._control_path)
-        if not socket_path.exists():
-            return False
+        """
+        Verifica si hay una conexión SSH activa (ControlMaster).
+
+        Usa el estado cacheado del monitor: sin socket no lanza procesos, y
+        el `ssh -O check` se reutiliza durante unos segundos.
+        """
+        return self._monitor.is_connected()
 
+    def _check_master(self) -> bool:
+        """Pregunta al ControlMaster si la conexión sigue viva (ssh -O check)."""
         cmd = [
             "ssh",
             "-O",
@@ -125,7 +234,12 @@ class RemoteTmuxClient:
         return result.returncode == 0
 
     def list_sessions(self) -> list[Session]:
-        """Lista sesiones con caché TTL de 5 segundos."""
+        """Lista sesiones con caché TTL de 5 segundos.
+
+        Sesiones y ventanas llegan en una sola invocación SSH (list-windows
+        -a), así la latencia es un RTT sin importar la cantidad de sesiones.
+        Actualiza tmux_missing según el código de salida remoto.
+        """
         import time
 
         now = time.time()
@@ -135,14 +249,16 @@ class RemoteTmuxClient:
             return self._sessions_cache
 
         # Fetch fresh
-        result = self._run_remote(["list-sessions", "-F", SESSION_FORMAT])
+        result = self._run_remote(["list-windows", "-a", "-F", SESSION_WINDOWS_FORMAT])
+        self.tmux_missing = result.returncode == COMMAND_NOT_FOUND_EXIT_CODE
+        if self.tmux_missing:
+            logger.warning(f"tmux no está instalado en {self.host}")
 
+        # Sin servidor tmux remoto list-windows falla: no hay sesiones
         if result.returncode != 0:
             return []
 
-        sessions = parse_sessions_output(result.stdout)
-        for session in sessions:
-            session.windows = self._list_windows(session.name)
+        sessions = parse_session_windows_output(result.stdout)
 
         # Actualizar caché
         self._sessions_cache = sessions
@@ -153,15 +269,6 @@ class RemoteTmuxClient:
         """Invalida el caché de sesiones (llamar después de modificaciones)."""
         self._sessions_cache = None
 
-    def _list_windows(self, session_name: str) -> list[Window]:
-        """Lista las ventanas de una sesión remota."""
-        result = self._run_remote(["list-windows", "-t", session_name, "-F", WINDOW_FORMAT])
-
-        if result.returncode != 0:
-            return []
-
-        return parse_windows_output(result.stdout)
-
     def get_attach_command(self, session_name: str, window_index: int | None = None) -> list[str]:
         """Retorna el comando para adjuntar a una sesión/ventana remota."""
         target = f"{session_name}:{window_index}" if window_index is not None else session_name
@@ -256,6 +363,8 @@ class RemoteTmuxClient:
             except Exception as e:
                 logger.debug(f"Error removing socket: {e}")
 
+        self._monitor.invalidate()
+
     # --- File Operations (delegados a RemoteFileOperations) ---
     # Estos métodos se mantienen por compatibilidad pero delegan internamente
 
@@ -268,49 +377,92 @@ class RemoteTmuxClient:
             return str(result.stdout).strip()
         return None
 
-    def list_dir(self, path: str) -> list[dict] | None:
-        """Lista el contenido de un directorio remoto."""
+    def list_dir(self, path: str) -> list[RemoteEntry] | None:
+        """
+        Lista el contenido de un directorio remoto con metadatos.
+
+        Usa find -printf con campos separados por NUL (nombres con espacios o
+        saltos de línea llegan intactos) y cae a ls -Al en el mismo comando
+        si find no soporta -printf.
+
+        Returns:
+            Entradas ordenadas (directorios primero), o None si falla
+        """
+        cached = self.dir_cache.get(path)
+        if cached is not None:
+            return cached
+
         if not self.is_connected():
             return None
 
-        cmd = f"ls -Al {path!r} 2>&1"
+        generation = self.dir_cache.generation
+        quoted = shlex.quote(path)
+        cmd = (
+            f"find {quoted} -mindepth 1 -maxdepth 1 -printf {shlex.quote(FIND_LISTING_FORMAT)}"
+            f" 2>/dev/null || ls -Al {quoted}"
+        )
         result = self._run_ssh_command(cmd)
 
         if result.returncode != 0:
             return None
 
-        entries = []
-        for line in result.stdout.strip().split("\n"):
-            if not line or line.startswith("total"):
-                continue
-
-            parts = line.split()
-            if len(parts) < 9:
-                if len(parts) >= 8:
-                    perms = parts[0]
-                    name = " ".join(parts[7:])
-                else:
-                    continue
-            else:
-                perms = parts[0]
-                name = " ".join(parts[8:])
-
-            if name in (".", ".."):
-                continue
-
-            entries.append(
-                {
-                    "name": name,
-                    "is_dir": perms.startswith("d"),
-                    "size": 0,
-                    "mtime": 0,
-                    "is_hidden": name.startswith("."),
-                }
-            )
-
-        entries.sort(key=lambda x: (not x["is_dir"], x["name"].lower()))
+        # El formato de find siempre contiene NUL; ls nunca
+        if not result.stdout or "\0" in result.stdout:
+            entries = parse_find_listing(result.stdout)
+        else:
+            entries = parse_ls_listing(result.stdout)
+        self.dir_cache.put(path, entries, generation)
         return entries
 
+    def list_dirs(self, paths: list[str]) -> dict[str, list[RemoteEntry] | None]:
+        """
+        Lista varios directorios remotos en una sola invocación SSH.
+
+        Pensado para reconstruir el árbol con todos los directorios
+        expandidos en un RTT. Los directorios frescos en caché no se piden.
+        Solo si find no soporta -printf se reintenta cada uno con list_dir
+        (fallback a ls); si falla el SSH (timeout, conexión caída) todo el
+        lote queda en None, sin repetir un comando por directorio.
+
+        Returns:
+            Entradas por path (None si ese directorio falló)
+        """
+        listings: dict[str, list[RemoteEntry] | None] = {}
+        for path in paths:
+            cached = self.dir_cache.get(path)
+            if cached is not None:
+                listings[path] = cached
+        paths = [path for path in paths if path not in listings]
+        if not paths:
+            return listings
+        if not self.is_connected():
+            return listings | dict.fromkeys(paths)
+
+        generation = self.dir_cache.generation
+        fmt = shlex.quote(FIND_LISTING_FORMAT)
+        # Sonda: marca el output si find no soporta -printf (ej: BSD/busybox)
+        commands = [f"find / -maxdepth 0 -printf '' 2>/dev/null || printf '{NO_PRINTF_MARKER}\\0'"]
+        commands += [
+            f"printf '{FIND_SECTION_MARKER}{i}\\0'; "
+            f"find {shlex.quote(path)} -mindepth 1 -maxdepth 1 -printf {fmt} 2>/dev/null"
+            f" || printf '{FIND_SECTION_MARKER}ERR\\0'"
+            for i, path in enumerate(paths)
+        ]
+        result = self._run_ssh_command("; ".join(commands))
+
+        # El último comando siempre termina bien: un error es del transporte
+        if result.returncode != 0 or not result.stdout:
+            return listings | dict.fromkeys(paths)
+        if result.stdout.startswith(NO_PRINTF_MARKER + "\0"):
+            return listings | {path: self.list_dir(path) for path in paths}
+
+        sections = parse_find_sections(result.stdout, len(paths))
+        for path, section in zip(paths, sections, strict=True):
+            listings[path] = section
+            if section is not None:
+                self.dir_cache.put(path, section, generation)
+        return listings
+
     def file_exists(self, path: str) -> bool:
         """Verifica si un archivo o directorio existe en el remoto."""
         if not self.is_connected():
@@ -334,6 +486,9 @@ class RemoteTmuxClient:
         cmd = f"mv {old_path!r} {new_path!r}"
         result = self._run_ssh_command(cmd)
         success = result.returncode == 0
+        self.dir_cache.invalidate_tree(old_path)
+        self.dir_cache.invalidate_parent(old_path)
+        self.dir_cache.invalidate_parent(new_path)
 
         if not success:
             logger.error(f"Error renombrando en {self.host}: {result.stderr}")
@@ -358,6 +513,8 @@ class RemoteTmuxClient:
         cmd = f"rm -rf {path!r}"
         result = self._run_ssh_command(cmd)
         success = result.returncode == 0
+        self.dir_cache.invalidate_tree(path)
+        self.dir_cache.invalidate_parent(path)
 
         if success:
             logger.info(f"✅ Eliminado exitosamente: {path}")
@@ -372,6 +529,11 @@ class RemoteTmuxClient:
             return False
         cmd = f"mkdir -p {path!r}"
         result = self._run_ssh_command(cmd)
+        # mkdir -p puede crear cualquier ancestro: invalidar toda la rama
+        parent = path
+        while (parent := posixpath.dirname(parent)) not in ("", "/"):
+            self.dir_cache.invalidate(parent)
+        self.dir_cache.invalidate("/")
         return result.returncode == 0
 
     def copy_file(self, src_path: str, dst_path: str) -> bool:
@@ -380,8 +542,45 @@ class RemoteTmuxClient:
             return False
         cmd = f"cp -r {src_path!r} {dst_path!r}"
         result = self._run_ssh_command(cmd)
+        self.dir_cache.invalidate_tree(dst_path)
+        self.dir_cache.invalidate_parent(dst_path)
         return result.returncode == 0
 
+    def paste_file(self, src_path: str, destination: str) -> str | None:
+        """
+        Copia src_path dentro de destination sin pisar archivos existentes.
+
+        Todo ocurre en un solo script remoto: si destination no es un
+        directorio se usa su padre, se busca el primer nombre libre
+        (nombre, nombre_1, nombre_2, ... antes de la extensión) y se copia.
+
+        Returns:
+            Path remoto de la copia, o None si falló
+        """
+        if not self.is_connected():
+            return None
+
+        stem, ext = split_copy_name(posixpath.basename(src_path.rstrip("/")))
+        script = (
+            f"src={shlex.quote(src_path)}; dir={shlex.quote(destination)}; "
+            f"stem={shlex.quote(stem)}; ext={shlex.quote(ext)}; "
+            '[ -d "$dir" ] || dir=$(dirname "$dir"); dir=${dir%/}; '
+            'target="$dir/$stem$ext"; n=1; '
+            'while [ -e "$target" ] || [ -L "$target" ]; do '
+            'target="$dir/${stem}_$n$ext"; n=$((n + 1)); done; '
+            'cp -r -- "$src" "$target" && printf "%s" "$target"'
+        )
+        # sh -c: el script no depende del shell de login del usuario remoto
+        result = self._run_ssh_command(f"sh -c {shlex.quote(script)}")
+        target = result.stdout if result.returncode == 0 else ""
+        if not target:
+            logger.error(f"Error pegando en {self.host}: {result.stderr}")
+            return None
+
+        self.dir_cache.invalidate_tree(target)
+        self.dir_cache.invalidate_parent(target)
+        return target
+
     def download_file(self, remote_path: str, local_path: str) -> bool:
         """Descarga un archivo del servidor remoto usando scp."""
         if not self.is_connected():
@@ -404,20 +603,51 @@ class RemoteTmuxClient:
         except subprocess.TimeoutExpired:
             return False
 
-    def search_files(self, root: str, query: str, mode: str = "name") -> list[str]:
-        """Busca archivos en el servidor remoto."""
+    def search_files(
+        self, root: str, query: str, mode: str = "name", token: Cancellable | None = None
+    ) -> list[SearchHit]:
+        """
+        Busca archivos en el servidor remoto.
+
+        Cada resultado incluye si es un directorio, resuelto en el mismo
+        comando (find -printf), sin un round trip extra por resultado.
+
+        Args:
+            root: Directorio raíz de búsqueda
+            query: Texto a buscar
+            mode: "name" o "content"
+            token: Cancela la búsqueda (mata el comando en curso); una
+                búsqueda cancelada retorna []
+        """
         if not self.is_connected():
             return []
 
+        quoted_root = shlex.quote(root)
         if mode == "name":
-            cmd = f"find {root!r} -name '*{query}*' -not -path '*/.*' 2>/dev/null | head -100"
+            pattern = shlex.quote(f"*{query}*")
+            fmt = shlex.quote(FIND_SEARCH_FORMAT)
+            limit = MAX_SEARCH_RESULTS * FIND_SEARCH_FIELDS
+            find = f"find {quoted_root} -name {pattern} ! -path '*/.*'"
+            gnu_cmd = f"{find} -printf {fmt} 2>/dev/null | head -z -n {limit}"
+            posix_cmd = f"{find} {POSIX_FIND_MARK_DIRS} 2>/dev/null | head -n {MAX_SEARCH_RESULTS}"
         elif mode == "content":
-            cmd = f"grep -r -l -i {query!r} {root!r} 2>/dev/null | head -100"
+            # grep -l solo lista archivos regulares
+            grep_args = f"-- {shlex.quote(query)} {quoted_root} 2>/dev/null"
+            gnu_cmd = f"grep -r -l -i --null {grep_args} | head -z -n {MAX_SEARCH_RESULTS}"
+            posix_cmd = f"grep -r -l -i {grep_args} | head -n {MAX_SEARCH_RESULTS}"
         else:
             return []
 
-        result = self._run_ssh_command(cmd, timeout=10.0)
-        if result.returncode != 0 or not result.stdout.strip():
+        cmd = f"if {GNU_SEARCH_PROBE}; then {gnu_cmd}; else {posix_cmd}; fi"
+        result = self._run_ssh_command(cmd, timeout=10.0, token=token)
+        if token is not None and token.cancelled:
+            return []
+        if result.returncode != 0 or not result.stdout.strip("\0\n"):
             return []
 
-        return [line for line in result.stdout.strip().split("\n") if line]
+        # La variante GNU separa con NUL; la POSIX nunca lo contiene
+        if "\0" not in result.stdout:
+            return parse_search_lines(result.stdout)[:MAX_SEARCH_RESULTS]
+        if mode == "name":
+            return parse_find_search(result.stdout)[:MAX_SEARCH_RESULTS]
+        return [SearchHit(path) for path in result.stdout.split("\0") if path]
@@ -0,0 +1,16 @@
+"""
+search - Búsqueda de archivos sin dependencias de GTK
+
+Los módulos de este package se importan en los procesos worker de la
+búsqueda por contenido, así que no deben importar gi.
+
+Autor: Homero Thompson del Lago del Terror
+"""
+
+from .content_scan import compile_content_pattern, scan_file, scan_files
+
+__all__ = [
+    "compile_content_pattern",
+    "scan_file",
+    "scan_files",
+]
@@ -0,0 +1,78 @@
+"""
+content_scan.py - Revisión del contenido de archivos
+
+Abre cada archivo con mmap, descarta los binarios (un NUL en los primeros
+bytes, la misma heurística que grep) y busca la primera coincidencia. Corre
+dentro de los workers del pool de procesos: los workers se lanzan con spawn
+e importan este módulo, por eso no depende de GTK.
+
+Autor: Homero Thompson del Lago del Terror
+"""
+
+import mmap
+import os
+import re
+
+from ..clients.models import SearchHit
+
+# Archivos más grandes no se revisan
+MAX_FILE_BYTES = 32 * 1024 * 1024
+# Bytes iniciales donde un NUL marca el archivo como binario
+BINARY_SNIFF_BYTES = 8192
+# Largo máximo del fragmento de la línea que coincide
+SNIPPET_CHARS = 120
+
+
+def compile_content_pattern(query: str) -> re.Pattern[bytes]:
+    """Patrón literal sin distinguir mayúsculas (como grep -i -F)."""
+    return re.compile(re.escape(os.fsencode(query)), re.IGNORECASE)
+
+
+def _snippet(line: bytes, start: int) -> str:
+    """Fragmento de la línea centrado en la coincidencia."""
+    if len(line) > SNIPPET_CHARS:
+        begin = max(0, min(start - SNIPPET_CHARS // 3, len(line) - SNIPPET_CHARS))
+        line = line[begin : begin + SNIPPET_CHARS]
+    return line.decode(errors="replace").strip()
+
+
+def scan_file(path: str, pattern: re.Pattern[bytes]) -> tuple[int, str] | None:
+    """
+    Busca la primera coincidencia en un archivo.
+
+    Returns:
+        (número de línea, fragmento) o None si no coincide, es binario,
+        está vacío, es demasiado grande o no se puede leer
+    """
+    try:
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0 or size > MAX_FILE_BYTES:
+                return None
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                if data.find(b"\0", 0, BINARY_SNIFF_BYTES) != -1:
+                    return None
+                match = pattern.search(data)
+                if match is None:
+                    return None
+                match_start = match.start()
+                del match
+                start = data.rfind(b"\n", 0, match_start) + 1
+                end = data.find(b"\n", match_start)
+                if end == -1:
+                    end = size
+                line_number = data[:start].count(b"\n") + 1
+                line = data[start:end]
+    except (OSError, ValueError):
+        return None
+    return line_number, _snippet(line, match_start - start)
+
+
+def scan_files(paths: list[str], pattern: re.Pattern[bytes]) -> list[SearchHit]:
+    """Worker: revisa un lote de archivos y retorna los que coinciden."""
+    hits = []
+    for path in paths:
+        found = scan_file(path, pattern)
+        if found is not None:
+            hits.append(SearchHit(path, line=found[0], preview=found[1]))
+    return hits
@@ -5,7 +5,8 @@ Autor: Homero Thompson del Lago del Terror
 """
 
 from .file_tree import FileTree
-from .session_row import SessionRow, WindowRow
+from .session_row import SessionRow
 from .terminal_view import TerminalView
+from .window_row import WindowRow
 
 __all__ = ["SessionRow", "WindowRow", "TerminalView", "FileTree"]
@@ -5,7 +5,9 @@ Autor: Homero Thompson del Lago del Terror
 """
 
 import os
+from collections.abc import Callable
 from pathlib import Path
+from typing import Any
 
 import gi
 
@@ -22,14 +24,26 @@ except ImportError:
 
     logger = logging.getLogger(__name__)  # type: ignore
 
+from ...clients import RemotePrefetcher, RemoteTmuxClient, SearchHit
 from .local import (
     FileTreeRow,
     SearchResultRow,
-    search_by_content,
-    search_by_name,
-    search_by_regex,
+    iter_by_content,
+    iter_by_name,
+    iter_by_regex,
 )
+from .local.listing_cache import LocalListingCache
+from .local.name_index import FilenameIndex
+from .local.scanner import ScanJob
+from .local.watcher import DirectoryWatcher
 from .remote import RemoteFileTreeRow, RemoteSearchResultRow
+from .remote.loader import collect_expanded_paths
+from .remote.tasks import RemoteTask
+from .row_events import RowEventDelegate
+from .search_jobs import CancelToken, SearchJobManager, SearchSource
+from .tree_factory import create_tree_factory
+from .tree_items import FileItem, items_from_dir_entries, items_from_remote_entries, loading_item
+from .tree_model import FileTreeModel
 from .ui import FavoritesManager
 
 
@@ -59,13 +73,24 @@ class FileTree(Gtk.Box):
         self._remote_root: str | None = None  # Remote root path
         self._is_remote = False
         self._remote_clipboard_path: str | None = None  # Path copiado en remoto
+        # Check de conexión / home en curso (resuelve el root remoto)
+        self._remote_root_task: RemoteTask | None = None
+        # Precarga de subdirectorios remotos (por host)
+        self._prefetcher: RemotePrefetcher | None = None
 
         self._setup_ui()
         self._load_tree()
 
     def set_remote_mode(self, client, root_path: str | None = None):
         """Cambia a modo remoto usando el cliente SSH proporcionado."""
+        self._search_jobs.cancel()
+        self._cancel_scans()
+        self._cancel_remote_root_task()
+        self._watcher.clear()
+        self._close_prefetcher()
+        self._close_name_index()
         self._remote_client = client
+        self._prefetcher = RemotePrefetcher(client)
         self._is_remote = True
         self._expanded_dirs.clear()
         self._remote_root = root_path  # Puede ser None inicialmente
@@ -76,15 +101,30 @@ class FileTree(Gtk.Box):
 
     def _try_load_remote_tree(self):
         """Intenta cargar el árbol remoto, reintentando si la conexión no está lista."""
-        from gi.repository import GLib
-
         if not self._remote_client:
             return
 
-        # Verificar si la conexión está lista
-        is_conn = self._remote_client.is_connected()
+        # Check de conexión y home en un worker: un host lento no congela la UI
+        client = self._remote_client
+        need_home = not self._remote_root
+
+        def check_connection():
+            if not client.is_connected():
+                return (False, None)
+            return (True, client.get_home_dir() if need_home else None)
 
-        if not is_conn:
+        self._cancel_remote_root_task()
+        self._remote_root_task = RemoteTask(check_connection, self._on_remote_connection_checked)
+        self._remote_root_task.start()
+
+    def _on_remote_connection_checked(self, result: tuple[bool, str | None] | None):
+        """Resultado del check de conexión (main loop)."""
+        from gi.repository import GLib
+
+        self._remote_root_task = None
+        connected, home = result or (False, None)
+
+        if not connected:
             self._remote_retry_count += 1
             if self._remote_retry_count <= 120:  # Máximo 120 intentos (60 segundos)
                 # Mostrar mensaje de espera
@@ -97,14 +137,42 @@ class FileTree(Gtk.Box):
                 self._load_tree()
                 return
 
-        # Conexión lista - obtener home si no tenemos root
+        # Conexión lista - usar el home si no tenemos root
         if not self._remote_root:
-            self._remote_root = self._remote_client.get_home_dir()
-            if not self._remote_root:
-                self._remote_root = "/"
+            self._remote_root = home or "/"
 
         self._load_tree()
 
+    def _cancel_remote_root_task(self):
+        """Descarta el check de conexión / home en curso."""
+        if self._remote_root_task is not None:
+            self._remote_root_task.cancel()
+            self._remote_root_task = None
+
+    def _close_prefetcher(self):
+        """Descarta la precarga del host anterior."""
+        if self._prefetcher is not None:
+            self._prefetcher.close()
+            self._prefetcher = None
+
+    def _prefetch_subdirectories(self, items: list[FileItem]):
+        """Precarga el primer nivel bajo un directorio recién listado."""
+        if self._prefetcher is not None:
+            self._prefetcher.prefetch(
+                item.path for item in items if item.is_dir and not item.is_hidden
+            )
+
+    def _on_row_hover(self, cell):
+        """Precarga el directorio remoto bajo el puntero."""
+        if (
+            self._prefetcher is not None
+            and isinstance(cell, RemoteFileTreeRow)
+            and cell.is_directory
+            and not cell.expanded
+            and cell.path
+        ):
+            self._prefetcher.prefetch([cell.path])
+
     def _retry_load_remote(self) -> bool:
         """Callback para reintentar carga remota."""
         if self._is_remote and self._remote_client:
@@ -146,6 +214,9 @@ class FileTree(Gtk.Box):
 
     def set_local_mode(self, root_path: str | None = None):
         """Vuelve al modo local."""
+        self._search_jobs.cancel()
+        self._cancel_remote_root_task()
+        self._close_prefetcher()
         self._remote_client = None
         self._is_remote = False
         self._remote_root = None
@@ -243,6 +314,8 @@ class FileTree(Gtk.Box):
         self._search_entry = Gtk.SearchEntry()
         self._search_entry.set_placeholder_text("Search files...")
         self._search_entry.set_hexpand(True)
+        # El debounce lo hace el SearchJobManager
+        self._search_entry.set_search_delay(0)
         self._search_entry.connect("search-changed", self._on_search_changed)
         self._search_entry.connect("stop-search", self._on_search_stopped)
         search_box.append(self._search_entry)
@@ -259,21 +332,57 @@ class FileTree(Gtk.Box):
 
         # Estado de búsqueda
         self._search_mode = "name"  # name, regex, content
-        self._search_results: list[Path] = []
+        self._search_results: list[SearchHit] = []
         self._is_searching = False
-
-        # ScrolledWindow para el árbol
-        scrolled = Gtk.ScrolledWindow()
-        scrolled.set_policy(Gtk.PolicyType.AUTOMATIC, Gtk.PolicyType.AUTOMATIC)
-        scrolled.set_vexpand(True)
-
-        # ListBox para archivos
+        # Búsqueda en curso: debounce, cancelación y resultados en streaming
+        self._search_jobs = SearchJobManager(
+            self._on_search_started, self._on_search_hits, self._on_search_finished
+        )
+        # Fila "Searching..." / "No results found" de la lista de resultados
+        self._search_status_row: Gtk.ListBoxRow | None = None
+
+        # Árbol virtualizado: ListView sobre TreeListModel (solo se crean
+        # widgets para las filas visibles)
+        self._tree_model = FileTreeModel(self._load_child_items)
+        self._local_factory = create_tree_factory(self._create_local_cell)
+        self._remote_factory = create_tree_factory(self._create_remote_cell)
+        self._list_view = Gtk.ListView(
+            model=self._tree_model.selection, factory=self._local_factory
+        )
+        self._list_view.add_css_class("file-tree-sidebar")
+        # Clicks, drag y menú contextual de todas las celdas
+        self._row_events = RowEventDelegate(
+            self._list_view, (FileTreeRow, RemoteFileTreeRow), on_hover=self._on_row_hover
+        )
+        # Listados obtenidos por adelantado para reconstruir el árbol remoto
+        self._pending_listings: dict[str, list | None] = {}
+        # Listados en curso por directorio (locales o remotos)
+        self._scans: dict[str, ScanJob | RemoteTask] = {}
+        # Listados locales ya leídos, válidos mientras el directorio no cambie
+        self._listing_cache = LocalListingCache()
+        # Monitores de los directorios locales cargados (root y expandidos)
+        self._watcher = DirectoryWatcher(self._on_directory_changed)
+        # Índice de nombres del root local (se crea con la primera búsqueda)
+        self._name_index: FilenameIndex | None = None
+
+        tree_scrolled = Gtk.ScrolledWindow()
+        tree_scrolled.set_policy(Gtk.PolicyType.AUTOMATIC, Gtk.PolicyType.AUTOMATIC)
+        tree_scrolled.set_child(self._list_view)
+
+        # ListBox para resultados de búsqueda y mensajes (pocas filas)
         self._list_box = Gtk.ListBox()
         self._list_box.set_selection_mode(Gtk.SelectionMode.NONE)
         self._list_box.add_css_class("file-tree-sidebar")
-        scrolled.set_child(self._list_box)
 
-        self.append(scrolled)
+        list_scrolled = Gtk.ScrolledWindow()
+        list_scrolled.set_policy(Gtk.PolicyType.AUTOMATIC, Gtk.PolicyType.AUTOMATIC)
+        list_scrolled.set_child(self._list_box)
+
+        self._content_stack = Gtk.Stack()
+        self._content_stack.set_vexpand(True)
+        self._content_stack.add_named(tree_scrolled, "tree")
+        self._content_stack.add_named(list_scrolled, "list")
+        self.append(self._content_stack)
 
     def _load_tree(self):
         """Carga el árbol desde el directorio raíz."""
@@ -299,22 +408,262 @@ class FileTree(Gtk.Box):
 
         self._update_favorites_popover()  # Actualizar estado del botón favoritos
 
+        # Los listados en curso y los monitores corresponden al árbol anterior
+        self._cancel_scans()
+        self._watcher.clear()
+
         # Limpiar lista actual
         self._clear_list_box()
 
         # Si hay búsqueda activa, mostrar resultados
-        if self._is_searching and self._search_results:
+        if self._is_searching:
             self._show_search_results()
+        elif self._is_remote:
+            self._load_remote_tree()
         else:
-            # Cargar recursivamente
+            self._load_local_tree()
+
+    def _load_local_tree(self):
+        """Carga el árbol local desde el root, re-expandiendo los directorios."""
+        root = str(self._root_path)
+        # El árbol se muestra vacío y las entradas llegan en lotes
+        self._show_tree(root, [], remote=False)
+        self._start_scan(root)
+
+    def _load_remote_tree(self):
+        """Carga el árbol remoto desde el root, re-expandiendo los directorios."""
+        # Todos los directorios expandidos en una sola llamada SSH, en un worker
+        client = self._remote_client
+        root = self._remote_root
+        paths = collect_expanded_paths(root, self._expanded_dirs)
+        self._list_box.append(self._create_error_row("Loading...", 0))
+
+        task = RemoteTask(
+            lambda: client.list_dirs(paths),
+            lambda listings: self._on_remote_tree_listed(task, root, listings),
+        )
+        self._scans[root] = task
+        task.start()
+
+    def _on_remote_tree_listed(self, task: RemoteTask, root: str, listings: dict | None):
+        """Listados del árbol remoto recibidos (main loop)."""
+        if self._scans.get(root) is task:
+            del self._scans[root]
+        self._clear_list_box()
+        self._pending_listings = listings or {}
+        entries = self._pending_listings.pop(root, None)
+
+        if not entries:
+            self._pending_listings = {}
+            if entries is None:
+                message = "Connection error or permission denied"
+            else:
+                message = "Directory is empty"
+            self._list_box.append(self._create_error_row(message, 0))
+            return
+
+        items = items_from_remote_entries(root, entries)
+        self._prefetch_subdirectories(items)
+        # Los subdirectorios expandidos se llenan desde _pending_listings
+        self._show_tree(root, items, remote=True)
+        self._pending_listings = {}
+
+    def _show_tree(self, root: str, items: list[FileItem], remote: bool):
+        """Muestra el árbol con las entradas del root."""
+        factory = self._remote_factory if remote else self._local_factory
+        if self._list_view.get_factory() is not factory:
+            self._list_view.set_factory(factory)
+        # Los hijos de los directorios expandidos se cargan vía _load_child_items
+        self._tree_model.set_root(root, items, self._expanded_dirs)
+        self._content_stack.set_visible_child_name("tree")
+
+    def _load_child_items(self, path: str) -> list[FileItem]:
+        """Lista un directorio al expandirlo en el árbol (create_func del modelo)."""
+        if not self._is_remote:
+            # Local: el listado llega en lotes desde un worker
+            self._start_scan(path)
+            return []
+
+        if not self._remote_client:
+            return []
+        if path in self._pending_listings:
+            entries = self._pending_listings.pop(path)
+            items = items_from_remote_entries(path, entries or [])
+            self._prefetch_subdirectories(items)
+            return items
+        # Remoto: fila de carga hasta que llegue el listado
+        self._start_remote_listing(path)
+        return [loading_item(path)]
+
+    def _start_remote_listing(self, path: str, refresh: bool = False):
+        """
+        Lista un directorio remoto en un worker.
+
+        Args:
+            path: Directorio a listar
+            refresh: Aplicar el listado como diff (directorio ya cargado) en
+                vez de reemplazar la fila de carga
+        """
+        previous = self._scans.pop(path, None)
+        if previous is not None:
+            previous.cancel()
+
+        client = self._remote_client
+        task = RemoteTask(
+            lambda: client.list_dir(path),
+            lambda entries: self._on_remote_listed(task, path, entries, refresh),
+        )
+        self._scans[path] = task
+        task.start()
+
+    def _on_remote_listed(self, task: RemoteTask, path: str, entries: list | None, refresh: bool):
+        """Listado de un directorio remoto recibido (main loop)."""
+        if self._scans.get(path) is task:
+            del self._scans[path]
+        items = items_from_remote_entries(path, entries or [])
+        if refresh:
+            self._apply_directory_listing(path, items)
+        else:
+            self._tree_model.fill_directory(path, items, self._expanded_dirs)
+            self._prefetch_subdirectories(items)
+
+    def _start_scan(self, path: str, refresh: bool = False):
+        """
+        Lista un directorio local en background.
+
+        Args:
+            path: Directorio a listar
+            refresh: Aplicar el listado completo como diff (directorio ya
+                cargado) en vez de insertar lotes a medida que llegan
+        """
+        previous = self._scans.pop(path, None)
+        if previous is not None:
+            previous.cancel()
+        # Vigilar antes de listar: no se pierden cambios hechos durante el scan
+        self._watcher.watch(path)
+
+        if refresh:
+
+            def on_batch(entries):
+                self._apply_directory_listing(path, items_from_dir_entries(entries))
+
+        else:
+
+            def on_batch(entries):
+                items = items_from_dir_entries(entries)
+                self._tree_model.insert_sorted(path, items, self._expanded_dirs)
+
+        job = ScanJob(
+            path,
+            on_batch,
+            lambda error: self._on_scan_done(job, error),
+            stream=not refresh,
+            cache=self._listing_cache,
+        )
+        self._scans[path] = job
+        job.start()
+
+    def _on_scan_done(self, job: ScanJob, error: OSError | None):
+        """Fin de un listado local."""
+        if self._scans.get(job.path) is job:
+            del self._scans[job.path]
+        if error is None or job.path != str(self._root_path) or self._is_remote:
+            return
+        # Solo el root muestra error (los subdirectorios quedan vacíos)
+        self._clear_list_box()
+        if isinstance(error, PermissionError):
+            message = "Permission denied"
+        else:
+            logger.error(f"Error listing {job.path}: {error}")
+            message = "Cannot read directory"
+        self._list_box.append(self._create_error_row(message, 0))
+
+    def _on_directory_changed(self, path: str):
+        """Cambios externos en un directorio vigilado: refrescarlo como diff."""
+        if self._is_remote:
+            return
+        if self._name_index is not None:
+            self._name_index.refresh_directory(path)
+        if path in self._tree_model.stores:
+            self._start_scan(path, refresh=True)
+
+    def _cancel_scans(self, path: str | None = None):
+        """Cancela los listados en curso (todos, o los de un subárbol)."""
+        prefix = path.rstrip("/") + "/" if path else ""
+        for key in list(self._scans):
+            if path is None or key == path or key.startswith(prefix):
+                self._scans.pop(key).cancel()
+
+    def _create_local_cell(self) -> FileTreeRow:
+        """Crea una celda del árbol local (una por fila visible)."""
+        row = FileTreeRow()
+        row.connect("toggle-expand", self._on_toggle_expand)
+        row.connect("copy-requested", self._on_copy_requested)
+        row.connect("paste-requested", self._on_paste_requested)
+        row.connect("rename-requested", self._on_rename_requested)
+        row.connect("delete-requested", self._on_delete_requested)
+        row.connect("copy-path-requested", self._on_copy_path_requested)
+        row.connect("copy-relative-path-requested", self._on_copy_relative_path_requested)
+        row.connect("add-to-favorites-requested", self._on_add_to_favorites_requested)
+        row.connect("create-folder-requested", self._on_create_folder_requested)
+        return row
+
+    def _create_remote_cell(self) -> RemoteFileTreeRow:
+        """Crea una celda del árbol remoto (una por fila visible)."""
+        row = RemoteFileTreeRow()
+        row.connect("toggle-expand", self._on_remote_toggle_expand)
+        row.connect("copy-path-requested", self._on_remote_copy_path_requested)
+        row.connect("download-requested", self._on_download_requested)
+        row.connect("rename-requested", self._on_remote_rename_requested)
+        row.connect("delete-requested", self._on_remote_delete_requested)
+        row.connect("create-folder-requested", self._on_remote_create_folder_requested)
+        row.connect("copy-requested", self._on_remote_copy_requested)
+        row.connect("paste-requested", self._on_remote_paste_requested)
+        return row
+
+    def _refresh_directory(self, path: str, expand: bool = False):
+        """
+        Re-lista un directorio y actualiza solo sus filas (sin recargar el árbol).
+
+        Args:
+            path: Directorio que cambió
+            expand: Expandir el directorio si está visible pero colapsado
+        """
+        if self._is_searching:
+            # Los resultados de búsqueda se muestran en la lista, no en el árbol
+            self._load_tree()
+            return
+
+        if path in self._tree_model.stores:
             if self._is_remote:
-                self._load_remote_directory_recursive(self._remote_root, 0)
+                self._start_remote_listing(path, refresh=True)
             else:
-                self._load_directory_recursive(self._root_path, 0)
+                self._start_scan(path, refresh=True)
+        elif expand:
+            row = self._tree_model.find_row(path)
+            if row is not None:
+                self._expanded_dirs.add(path)
+                self._tree_model.set_expanded(row, True)
+
+    def _apply_directory_listing(self, path: str, items: list[FileItem]):
+        """Aplica el listado nuevo de un directorio cargado como diff."""
+        if not self._tree_model.update_directory(path, items):
+            return
+        # Dejar de vigilar los subdirectorios que desaparecieron
+        self._watcher.retain(self._tree_model.stores)
+        # Olvidar subdirectorios expandidos que ya no existen
+        prefix = path.rstrip("/") + "/"
+        self._expanded_dirs = {
+            p
+            for p in self._expanded_dirs
+            if not p.startswith(prefix) or p in self._tree_model.stores
+        }
 
     def _clear_list_box(self):
-        """Limpia todas las filas del list box (O(1) con GTK4)."""
+        """Limpia la lista de mensajes/resultados y la muestra en lugar del árbol."""
         self._list_box.remove_all()
+        self._search_status_row = None
+        self._content_stack.set_visible_child_name("list")
 
     def _setup_search_options_menu(self):
         """Configura el menú de opciones de búsqueda."""
@@ -353,7 +702,7 @@ class FileTree(Gtk.Box):
         # Re-ejecutar búsqueda si hay texto
         query = self._search_entry.get_text().strip()
         if query:
-            self._perform_search(query)
+            self._perform_search(query, immediate=True)
 
     def _on_search_changed(self, entry: Gtk.SearchEntry):
         """Maneja cambios en el search entry."""
@@ -361,82 +710,116 @@ class FileTree(Gtk.Box):
         if query:
             self._perform_search(query)
         else:
+            self._search_jobs.cancel()
             self._is_searching = False
             self._search_results = []
             self._load_tree()
 
     def _on_search_stopped(self, entry: Gtk.SearchEntry):
         """Limpia la búsqueda."""
+        self._search_jobs.cancel()
         self._is_searching = False
         self._search_results = []
         self._search_entry.set_text("")
         self._load_tree()
 
-    def _perform_search(self, query: str):
-        """Ejecuta la búsqueda según el modo."""
+    def _perform_search(self, query: str, immediate: bool = False):
+        """
+        Programa la búsqueda según el modo (cancela la anterior).
+
+        Args:
+            query: Texto de búsqueda
+            immediate: Lanzar sin debounce (ej: cambio de modo)
+        """
         self._is_searching = True
+        self._search_jobs.submit(self._search_source(query), immediate)
 
+    def _search_source(self, query: str) -> SearchSource:
+        """Función que genera los resultados de query en el worker."""
         if self._is_remote:
-            # Búsqueda remota
-            self._search_results = self._search_remote(query)
-        else:
-            # Búsqueda local
-            if self._search_mode == "name":
-                self._search_results = self._search_by_name(query)
-            elif self._search_mode == "regex":
-                self._search_results = self._search_by_regex(query)
-            elif self._search_mode == "content":
-                self._search_results = self._search_by_content(query)
-            else:
-                self._search_results = []
-
+            client, root = self._remote_client, self._remote_root
+            mode = "name" if self._search_mode in ("name", "regex") else "content"
+            # Un solo comando SSH: los resultados llegan juntos; cancelar mata ssh
+            return lambda token: client.search_files(root, query, mode, token) if client else []
+
+        root = self._root_path
+        if self._search_mode == "name":
+            index = self._get_name_index()
+            return lambda token: self._iter_by_name(index, root, query, token)
+        if self._search_mode == "regex":
+            return lambda token: iter_by_regex(root, query, token)
+        if self._search_mode == "content":
+            return lambda token: iter_by_content(root, query, token)
+        return lambda token: []
+
+    @staticmethod
+    def _iter_by_name(index: FilenameIndex, root: Path, query: str, token: CancelToken):
+        """Busca por nombre en el índice (find mientras no esté listo)."""
+        hits = index.search(query)
+        if hits is None:
+            return iter_by_name(root, query, token)
+        return hits
+
+    def _get_name_index(self) -> FilenameIndex:
+        """Índice de nombres del root actual (lo crea si cambió el root)."""
+        root = str(self._root_path)
+        if self._name_index is None or self._name_index.root != root:
+            self._close_name_index()
+            self._name_index = FilenameIndex(root).start()
+        return self._name_index
+
+    def _close_name_index(self):
+        """Libera el índice de nombres."""
+        if self._name_index is not None:
+            self._name_index.close()
+            self._name_index = None
+
+    def _on_search_started(self):
+        """Comienza una búsqueda: vaciar la lista de resultados."""
+        self._search_results = []
         self._clear_list_box()
         self._show_search_results()
 
-    def _search_remote(self, query: str) -> list:
-        """Busca archivos en el servidor remoto."""
-        if not self._remote_client:
-            return []
-
-        mode = "name" if self._search_mode in ("name", "regex") else "content"
-        results = self._remote_client.search_files(self._remote_root, query, mode)
+    def _on_search_hits(self, hits: list[SearchHit]):
+        """Agrega un lote de resultados a medida que llegan."""
+        if self._search_status_row is not None:
+            self._list_box.remove(self._search_status_row)
+            self._search_status_row = None
+        self._search_results.extend(hits)
+        self._append_search_rows(hits)
 
-        # Convertir a paths remotos (strings en vez de Path objects)
-        return results
-
-    def _search_by_name(self, query: str) -> list[Path]:
-        """Busca archivos por nombre usando find."""
-        return search_by_name(self._root_path, query)
-
-    def _search_by_regex(self, query: str) -> list[Path]:
-        """Busca archivos por patrón regex."""
-        return search_by_regex(self._root_path, query)
-
-    def _search_by_content(self, query: str) -> list[Path]:
-        """Busca en contenido de archivos usando grep."""
-        return search_by_content(self._root_path, query)
+    def _on_search_finished(self, count: int):
+        """Fin de la búsqueda: avisar si no hubo resultados."""
+        if not self._search_results:
+            self._clear_list_box()
+            self._show_search_results()
 
     def _show_search_results(self):
-        """Muestra los resultados de búsqueda."""
+        """Muestra los resultados de búsqueda obtenidos hasta ahora."""
+        self._search_status_row = None
         if not self._search_results:
-            # Mostrar mensaje de no resultados
-            row = self._create_error_row("No results found", 0)
-            self._list_box.append(row)
+            # Búsqueda en curso o sin resultados
+            message = "Searching..." if self._search_jobs.active else "No results found"
+            self._search_status_row = self._create_error_row(message, 0)
+            self._list_box.append(self._search_status_row)
             return
+        self._append_search_rows(self._search_results)
 
+    def _append_search_rows(self, hits: list[SearchHit]):
+        """Agrega filas de resultados a la lista."""
+        # SearchHit: path y tipo ya resueltos por la búsqueda (sin stat)
         if self._is_remote:
-            # Resultados remotos (strings)
-            for path_str in self._search_results:
-                name = os.path.basename(path_str)
-                is_dir = self._remote_client.is_dir(path_str) if self._remote_client else False
-                row = RemoteSearchResultRow(path_str, name, is_dir, self._remote_root)
+            for hit in hits:
+                name = os.path.basename(hit.path)
+                row = RemoteSearchResultRow(hit.path, name, hit.is_dir, self._remote_root)
                 row.connect("navigate-requested", self._on_remote_navigate_requested)
                 row.connect("copy-path-requested", self._on_remote_copy_path_requested)
                 self._list_box.append(row)
         else:
-            # Resultados locales (Path objects)
-            for path in self._search_results:
-                row = SearchResultRow(path, self._root_path)
+            for hit in hits:
+                row = SearchResultRow(
+                    Path(hit.path), self._root_path, hit.is_dir, hit.line, hit.preview
+                )
                 row.connect("copy-requested", self._on_copy_requested)
                 row.connect("paste-requested", self._on_paste_requested)
                 row.connect("rename-requested", self._on_rename_requested)
@@ -459,7 +842,7 @@ class FileTree(Gtk.Box):
 
     def _on_navigate_requested(self, row, path: Path):
         """Navega a la ubicación del archivo."""
-        parent = path.parent if path.is_file() else path
+        parent = path if row.is_directory else path.parent
         if parent.exists():
             self._root_path = parent
             self._expanded_dirs.clear()
@@ -468,100 +851,9 @@ class FileTree(Gtk.Box):
             self._search_entry.set_text("")
             self._load_tree()
 
-    def _load_directory_recursive(self, path: Path, depth: int):
-        """Carga un directorio y sus hijos expandidos recursivamente.
-
-        Usa os.scandir para mejor performance (evita doble stat() por archivo).
-        """
-        import os
-
-        try:
-            # scandir retorna DirEntry con is_dir() cacheado del syscall original
-            with os.scandir(path) as scanner:
-                entries = sorted(
-                    scanner,
-                    key=lambda e: (not e.is_dir(follow_symlinks=False), e.name.lower()),
-                )
-        except PermissionError:
-            if depth == 0:
-                row = self._create_error_row("Permission denied", depth)
-                self._list_box.append(row)
-            return
-
-        for entry in entries:
-            # Ignorar archivos ocultos
-            if entry.name.startswith("."):
-                continue
-
-            # is_dir() usa stat cacheado del DirEntry (no hace syscall adicional)
-            is_dir = entry.is_dir(follow_symlinks=False)
-            entry_path = Path(entry.path)
-            is_expanded = str(entry_path) in self._expanded_dirs
-
-            row = FileTreeRow(entry_path, depth, is_expanded)
-            row.connect("toggle-expand", self._on_toggle_expand)
-            row.connect("copy-requested", self._on_copy_requested)
-            row.connect("paste-requested", self._on_paste_requested)
-            row.connect("rename-requested", self._on_rename_requested)
-            row.connect("delete-requested", self._on_delete_requested)
-            row.connect("copy-path-requested", self._on_copy_path_requested)
-            row.connect("copy-relative-path-requested", self._on_copy_relative_path_requested)
-            row.connect("add-to-favorites-requested", self._on_add_to_favorites_requested)
-            row.connect("create-folder-requested", self._on_create_folder_requested)
-            self._list_box.append(row)
-
-            # Si es directorio expandido, cargar hijos
-            if is_dir and is_expanded:
-                self._load_directory_recursive(entry_path, depth + 1)
-
-    def _load_remote_directory_recursive(self, path: str, depth: int):
-        """Carga un directorio remoto y sus hijos expandidos recursivamente."""
-        if not self._remote_client:
-            return
-
-        entries = self._remote_client.list_dir(path)
-
-        if entries is None:
-            if depth == 0:
-                row = self._create_error_row("Connection error or permission denied", depth)
-                self._list_box.append(row)
-            return
-
-        if len(entries) == 0 and depth == 0:
-            row = self._create_error_row("Directory is empty", depth)
-            self._list_box.append(row)
-            return
-
-        for entry in entries:
-            name = entry["name"]
-            is_dir = entry["is_dir"]
-            is_hidden = entry.get("is_hidden", False)
-            full_path = f"{path.rstrip('/')}/{name}"
-            is_expanded = full_path in self._expanded_dirs
-
-            row = RemoteFileTreeRow(full_path, name, is_dir, depth, is_expanded, is_hidden)
-            row.connect("toggle-expand", self._on_remote_toggle_expand)
-            row.connect("copy-path-requested", self._on_remote_copy_path_requested)
-            row.connect("download-requested", self._on_download_requested)
-            row.connect("rename-requested", self._on_remote_rename_requested)
-            row.connect("delete-requested", self._on_remote_delete_requested)
-            row.connect("create-folder-requested", self._on_remote_create_folder_requested)
-            row.connect("copy-requested", self._on_remote_copy_requested)
-            row.connect("paste-requested", self._on_remote_paste_requested)
-            self._list_box.append(row)
-
-            # Si es directorio expandido, cargar hijos
-            if is_dir and is_expanded:
-                self._load_remote_directory_recursive(full_path, depth + 1)
-
     def _on_remote_toggle_expand(self, row, path: str, expanded: bool):
         """Maneja el toggle de expansión de un directorio remoto."""
-        if expanded:
-            self._expanded_dirs.add(path)
-        else:
-            # Remover este y todos los subdirectorios expandidos
-            self._expanded_dirs = {p for p in self._expanded_dirs if not p.startswith(path)}
-        self._load_tree()
+        self._toggle_expanded(row, path, expanded)
 
     def _on_remote_copy_path_requested(self, row, path: str):
         """Copia el path remoto al clipboard."""
@@ -639,8 +931,10 @@ class FileTree(Gtk.Box):
                 if new_name and new_name != name:
                     parent = os.path.dirname(path)
                     new_path = f"{parent}/{new_name}"
-                    if self._remote_client and self._remote_client.rename_file(path, new_path):
-                        self._load_tree()
+                    self._run_remote_mutation(
+                        lambda client: client.rename_file(path, new_path),
+                        lambda _ok: self._refresh_directory(parent),
+                    )
 
         dialog.connect("response", on_response)
         dialog.present()
@@ -650,8 +944,8 @@ class FileTree(Gtk.Box):
         name = os.path.basename(path)
         root = self.get_root()
 
-        is_dir = self._remote_client.is_dir(path) if self._remote_client else False
-        if is_dir:
+        # El tipo ya está en la celda (sin un round trip SSH antes del diálogo)
+        if row.is_directory and row.path == path:
             body = (
                 "This will permanently delete this folder and all its "
                 "contents on the remote server."
@@ -673,8 +967,10 @@ class FileTree(Gtk.Box):
 
         def on_response(dialog, response):
             if response == "delete":
-                if self._remote_client and self._remote_client.delete_file(path):
-                    self._load_tree()
+                self._run_remote_mutation(
+                    lambda client: client.delete_file(path),
+                    lambda _ok: self._refresh_directory(os.path.dirname(path)),
+                )
 
         dialog.connect("response", on_response)
         dialog.present()
@@ -707,10 +1003,11 @@ class FileTree(Gtk.Box):
                 folder_name = entry.get_text().strip()
                 if folder_name:
                     new_path = f"{path.rstrip('/')}/{folder_name}"
-                    if self._remote_client and self._remote_client.create_directory(new_path):
-                        # Expandir el directorio padre para mostrar la nueva carpeta
-                        self._expanded_dirs.add(path)
-                        self._load_tree()
+                    # Expandir el directorio padre para mostrar la nueva carpeta
+                    self._run_remote_mutation(
+                        lambda client: client.create_directory(new_path),
+                        lambda _ok: self._refresh_directory(path, expand=True),
+                    )
 
         dialog.connect("response", on_response)
         dialog.present()
@@ -724,34 +1021,32 @@ class FileTree(Gtk.Box):
         if not self._remote_clipboard_path or not self._remote_client:
             return
 
+        # Destino, nombre libre y copia se resuelven en un solo comando remoto
         source = self._remote_clipboard_path
-        source_name = os.path.basename(source)
+        # Expandir el directorio destino para mostrar el archivo copiado
+        self._run_remote_mutation(
+            lambda client: client.paste_file(source, path),
+            lambda target: self._refresh_directory(os.path.dirname(target), expand=True),
+        )
 
-        # Destino es el directorio donde pegar
-        if self._remote_client.is_dir(path):
-            destination = path
-        else:
-            destination = os.path.dirname(path)
+    def _run_remote_mutation(
+        self, operation: Callable[[RemoteTmuxClient], Any], on_success: Callable[[Any], None]
+    ):
+        """
+        Ejecuta una modificación remota (rename, delete...) en un worker.
 
-        target = f"{destination.rstrip('/')}/{source_name}"
+        on_success(result) se llama en el main loop solo si la operación tuvo
+        éxito y el árbol sigue mostrando el mismo host.
+        """
+        client = self._remote_client
+        if client is None:
+            return
 
-        # Si ya existe, agregar sufijo
-        counter = 1
-        original_name = source_name
-        while self._remote_client.file_exists(target):
-            # Separar nombre y extensión
-            if "." in original_name and not original_name.startswith("."):
-                name_parts = original_name.rsplit(".", 1)
-                new_name = f"{name_parts[0]}_{counter}.{name_parts[1]}"
-            else:
-                new_name = f"{original_name}_{counter}"
-            target = f"{destination.rstrip('/')}/{new_name}"
-            counter += 1
+        def on_done(result):
+            if result and client is self._remote_client:
+                on_success(result)
 
-        if self._remote_client.copy_file(source, target):
-            # Expandir el directorio destino para mostrar el archivo copiado
-            self._expanded_dirs.add(destination)
-            self._load_tree()
+        RemoteTask(lambda: operation(client), on_done).start()
 
     def _create_error_row(self, message: str, depth: int) -> Gtk.ListBoxRow:
         """Crea una fila de error."""
@@ -773,21 +1068,46 @@ class FileTree(Gtk.Box):
 
     def _on_toggle_expand(self, row, path: Path, expanded: bool):
         """Maneja el toggle de expansión de un directorio."""
-        path_str = str(path)
+        self._toggle_expanded(row, str(path), expanded)
+
+    def _toggle_expanded(self, row, path: str, expanded: bool):
+        """Expande/colapsa solo el subárbol de la fila (sin recargar el árbol)."""
         if expanded:
-            self._expanded_dirs.add(path_str)
+            self._expanded_dirs.add(path)
         else:
             # Remover este y todos los subdirectorios expandidos
-            self._expanded_dirs = {p for p in self._expanded_dirs if not p.startswith(path_str)}
-        self._load_tree()
+            prefix = path.rstrip("/") + "/"
+            self._expanded_dirs = {
+                p for p in self._expanded_dirs if p != path and not p.startswith(prefix)
+            }
+
+        if not expanded:
+            self._cancel_scans(path)
+        if row.list_row is not None:
+            self._tree_model.set_expanded(row.list_row, expanded)
+            if not expanded:
+                self._watcher.retain(self._tree_model.stores)
+        else:
+            self._load_tree()
 
     def _on_home_clicked(self, button: Gtk.Button):
         """Va al directorio home."""
         self._expanded_dirs.clear()
         if self._is_remote and self._remote_client:
-            self._remote_root = self._remote_client.get_home_dir() or "/"
-        else:
-            self._root_path = Path.home()
+            # El home remoto se resuelve en un worker
+            self._cancel_remote_root_task()
+            self._remote_root_task = RemoteTask(
+                self._remote_client.get_home_dir, self._on_remote_home_resolved
+            )
+            self._remote_root_task.start()
+            return
+        self._root_path = Path.home()
+        self._load_tree()
+
+    def _on_remote_home_resolved(self, home: str | None):
+        """Home remoto recibido (main loop)."""
+        self._remote_root_task = None
+        self._remote_root = home or "/"
         self._load_tree()
 
     def _on_up_clicked(self, button: Gtk.Button):
@@ -848,7 +1168,7 @@ class FileTree(Gtk.Box):
                 shutil.copytree(source, target)
             else:
                 shutil.copy2(source, target)
-            self._load_tree()
+            self._refresh_directory(str(destination))
         except (PermissionError, OSError) as e:
             logger.error(f"Error copying: {e}")
 
@@ -860,7 +1180,7 @@ class FileTree(Gtk.Box):
         new_path = path.parent / new_name
         try:
             path.rename(new_path)
-            self._load_tree()
+            self._refresh_directory(str(path.parent))
         except (PermissionError, OSError) as e:
             logger.error(f"Error renaming: {e}")
 
@@ -887,7 +1207,7 @@ class FileTree(Gtk.Box):
 
         try:
             shutil.move(str(path), str(target))
-            self._load_tree()
+            self._refresh_directory(str(path.parent))
         except (PermissionError, OSError) as e:
             logger.error(f"Error moving to trash: {e}")
 
@@ -1030,8 +1350,7 @@ class FileTree(Gtk.Box):
         try:
             new_folder.mkdir(parents=False, exist_ok=False)
             # Expandir el directorio padre para mostrar la nueva carpeta
-            self._expanded_dirs.add(str(parent_path))
-            self._load_tree()
+            self._refresh_directory(str(parent_path), expand=True)
         except (PermissionError, OSError) as e:
             logger.error(f"Error creating folder: {e}")
 
@@ -5,7 +5,14 @@ Autor: Homero Thompson del Lago del Terror
 """
 
 from .file_row import FileTreeRow
-from .search import search_by_content, search_by_name, search_by_regex
+from .search import (
+    iter_by_content,
+    iter_by_name,
+    iter_by_regex,
+    search_by_content,
+    search_by_name,
+    search_by_regex,
+)
 from .search_row import SearchResultRow
 
 __all__ = [
@@ -14,4 +21,7 @@ __all__ = [
     "search_by_name",
     "search_by_regex",
     "search_by_content",
+    "iter_by_name",
+    "iter_by_regex",
+    "iter_by_content",
 ]
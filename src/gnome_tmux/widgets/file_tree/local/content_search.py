@@ -0,0 +1,143 @@
+"""
+content_search.py - Búsqueda por contenido en proceso
+
+Recorre el root con el walker podado (sin ocultos ni directorios ignorados,
+como node_modules) y reparte los archivos en lotes a un pool de procesos
+que los revisa con scan_files (gnome_tmux.search, sin GTK).
+
+Los lotes se consumen en orden de recorrido y con pocos en vuelo, así los
+resultados salen en streaming y al alcanzar el máximo se deja de recorrer
+sin terminar de leer el árbol. Si el pool se rompe (ej: un worker muere)
+la búsqueda termina con los resultados obtenidos hasta ese momento.
+
+Autor: Homero Thompson del Lago del Terror
+"""
+
+import multiprocessing
+import os
+import threading
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+from ....clients import SearchHit
+from ....search import compile_content_pattern, scan_files
+from ..search_jobs import CancelToken
+from .walker import IGNORED_DIRS, walk
+
+try:
+    from loguru import logger
+except ImportError:
+    import logging
+
+    logger = logging.getLogger(__name__)  # type: ignore
+
+# Archivos por tarea enviada al pool
+FILES_PER_TASK = 64
+# Workers del pool de procesos
+CONTENT_WORKERS = max(1, min(4, os.cpu_count() or 1))
+
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> Executor:
+    """Pool de procesos compartido (se crea con la primera búsqueda)."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: hacer fork de un proceso con GTK y threads no es seguro
+            _pool = ProcessPoolExecutor(
+                CONTENT_WORKERS, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pool
+
+
+def _reset_pool():
+    """Descarta un pool roto (el próximo _get_pool crea otro)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def iter_content_matches(
+    root_path: Path,
+    query: str,
+    token: CancelToken | None = None,
+    executor: Executor | None = None,
+) -> Iterator[SearchHit]:
+    """
+    Genera los archivos que contienen query, con línea y fragmento.
+
+    Args:
+        root_path: Directorio raíz de búsqueda
+        query: Texto a buscar (literal, sin distinguir mayúsculas)
+        token: Cancela la búsqueda (se deja de recorrer)
+        executor: Pool donde revisar los lotes (por defecto, procesos)
+    """
+    if not query:
+        return
+    pattern = compile_content_pattern(query)
+    pool = executor or _get_pool()
+    # Lotes en vuelo: suficientes para ocupar los workers, no más
+    max_in_flight = CONTENT_WORKERS * 2
+    pending: deque = deque()
+    batch: list[str] = []
+
+    def submit(paths: list[str]) -> bool:
+        try:
+            pending.append(pool.submit(scan_files, paths, pattern))
+        except (BrokenProcessPool, RuntimeError) as e:
+            on_pool_error(e)
+            return False
+        return True
+
+    def collect() -> list[SearchHit] | None:
+        try:
+            return pending.popleft().result()
+        except BrokenProcessPool as e:
+            on_pool_error(e)
+            return None
+
+    def on_pool_error(e: Exception):
+        # No revisar el lote en este thread: un archivo que rompió el pool
+        # (ej: mmap de un archivo truncado) podría tirar el proceso de la UI
+        logger.warning(f"Content search pool unavailable, stopping search: {e}")
+        if executor is None:
+            _reset_pool()
+
+    def head_done() -> bool:
+        return bool(pending) and pending[0].done()
+
+    try:
+        for _, _, entries in walk(str(root_path), ignored=IGNORED_DIRS):
+            if token is not None and token.cancelled:
+                return
+            batch.extend(entry.path for entry in entries if entry.is_file(follow_symlinks=False))
+            while len(batch) >= FILES_PER_TASK:
+                if not submit(batch[:FILES_PER_TASK]):
+                    return
+                del batch[:FILES_PER_TASK]
+            # Entregar lo terminado sin esperar y no acumular más lotes
+            while len(pending) >= max_in_flight or head_done():
+                hits = collect()
+                if hits is None:
+                    return
+                yield from hits
+        if batch and not submit(batch):
+            return
+        while pending:
+            if token is not None and token.cancelled:
+                return
+            hits = collect()
+            if hits is None:
+                return
+            yield from hits
+    finally:
+        # Cortado (límite o cancelación): no revisar los lotes restantes
+        for future in pending:
+            future.cancel()
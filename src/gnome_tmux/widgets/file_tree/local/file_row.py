@@ -11,11 +11,31 @@ import gi
 gi.require_version("Gtk", "4.0")
 gi.require_version("Gdk", "4.0")
 
-from gi.repository import Gdk, Gio, GObject, Gtk
+from gi.repository import Gio, GObject, Gtk
 
+from ..row_events import build_action_group
 
-class FileTreeRow(Gtk.ListBoxRow):
-    """Fila que representa un archivo o directorio en el árbol."""
+# Acción del menú -> señal emitida con el path
+_MENU_ACTIONS = (
+    ("copy", "copy-requested"),
+    ("paste", "paste-requested"),
+    ("copy_path", "copy-path-requested"),
+    ("copy_relative_path", "copy-relative-path-requested"),
+    ("rename", "rename-requested"),
+    ("delete", "delete-requested"),
+    ("add_favorite", "add-to-favorites-requested"),
+    ("create_folder", "create-folder-requested"),
+)
+
+
+class FileTreeRow(Gtk.Box):
+    """
+    Celda del ListView que representa un archivo o directorio del árbol.
+
+    Se crea una por fila visible y se reutiliza: bind() la asocia con otra
+    entrada al hacer scroll. Los clicks, el drag y el menú llegan desde el
+    RowEventDelegate del ListView.
+    """
 
     __gtype_name__ = "FileTreeRow"
 
@@ -31,98 +51,97 @@ class FileTreeRow(Gtk.ListBoxRow):
         "create-folder-requested": (GObject.SignalFlags.RUN_FIRST, None, (object,)),
     }
 
-    def __init__(self, path: Path, depth: int, expanded: bool = False):
-        super().__init__()
-
-        self.path = path
-        self.depth = depth
-        self.is_directory = path.is_dir()
-        self.expanded = expanded
-        self._popover = None
-
-        self.set_selectable(False)
-
-        box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=4)
-        box.set_margin_start(4 + depth * 16)
-        box.set_margin_end(4)
-        box.set_margin_top(1)
-        box.set_margin_bottom(1)
-
-        if self.is_directory:
-            self._arrow = Gtk.Image()
-            self._update_arrow()
-            box.append(self._arrow)
-
-            folder_icon = Gtk.Image.new_from_icon_name(
-                "folder-open-symbolic" if expanded else "folder-symbolic"
-            )
-            folder_icon.set_pixel_size(14)
-            box.append(folder_icon)
-
-            label = Gtk.Label(label=path.name)
-            label.set_ellipsize(3)
-            label.set_hexpand(True)
-            label.set_xalign(0)
-            box.append(label)
-
-            click = Gtk.GestureClick()
-            click.connect("released", self._on_clicked)
-            self.add_controller(click)
-        else:
-            spacer = Gtk.Box()
-            spacer.set_size_request(14, -1)
-            box.append(spacer)
-
-            file_icon = Gtk.Image.new_from_icon_name("text-x-generic-symbolic")
-            file_icon.set_pixel_size(14)
-            box.append(file_icon)
-
-            label = Gtk.Label(label=path.name)
-            label.set_ellipsize(3)
-            label.set_hexpand(True)
-            label.set_xalign(0)
-            box.append(label)
+    def __init__(self):
+        super().__init__(orientation=Gtk.Orientation.HORIZONTAL, spacing=4)
 
-        self.set_child(box)
+        self.path: Path | None = None
+        self.depth = 0
+        self.is_directory = False
+        self.expanded = False
+        self.list_row: Gtk.TreeListRow | None = None
+        self._expanded_handler: int | None = None
 
-        drag_source = Gtk.DragSource()
-        drag_source.set_actions(Gdk.DragAction.COPY)
-        drag_source.connect("prepare", self._on_drag_prepare)
-        drag_source.connect("drag-begin", self._on_drag_begin)
-        self.add_controller(drag_source)
+        self.set_margin_end(4)
+        self.set_margin_top(1)
+        self.set_margin_bottom(1)
 
-        right_click = Gtk.GestureClick()
-        right_click.set_button(3)
-        right_click.connect("pressed", self._on_right_click)
-        self.add_controller(right_click)
+        # La flecha ocupa el mismo ancho que el espaciador de los archivos
+        self._arrow = Gtk.Image()
+        self._arrow.set_pixel_size(12)
+        self._arrow.set_size_request(14, -1)
+        self.append(self._arrow)
+
+        self._icon = Gtk.Image()
+        self._icon.set_pixel_size(14)
+        self.append(self._icon)
+
+        self._label = Gtk.Label()
+        self._label.set_ellipsize(3)
+        self._label.set_hexpand(True)
+        self._label.set_xalign(0)
+        self.append(self._label)
+
+    def bind(self, item, list_row: Gtk.TreeListRow):
+        """Muestra una entrada (FileItem) en esta celda."""
+        self.path = Path(item.path)
+        self.depth = list_row.get_depth()
+        self.is_directory = item.is_dir
+        self.expanded = list_row.get_expanded()
+        # La fila también se expande/colapsa sin click (restaurar el árbol,
+        # colapsar un ancestro): seguir el estado real del TreeListRow
+        self._expanded_handler = list_row.connect("notify::expanded", self._on_expanded_changed)
+        self.list_row = list_row
+
+        self.set_margin_start(4 + self.depth * 16)
+        self._label.set_label(item.name)
+        self._update_arrow()
+
+    def unbind(self):
+        """Libera la celda para otra entrada."""
+        if self.list_row is not None and self._expanded_handler is not None:
+            self.list_row.disconnect(self._expanded_handler)
+        self._expanded_handler = None
+        self.list_row = None
+
+    def _on_expanded_changed(self, list_row: Gtk.TreeListRow, _pspec):
+        """El TreeListRow cambió de estado: actualizar la flecha."""
+        self.expanded = list_row.get_expanded()
+        self._update_arrow()
 
     def _update_arrow(self):
-        """Actualiza el icono de la flecha."""
+        """Actualiza la flecha y el icono según el tipo y estado."""
+        if not self.is_directory:
+            self._arrow.clear()
+            self._icon.set_from_icon_name("text-x-generic-symbolic")
+            return
         if self.expanded:
             self._arrow.set_from_icon_name("pan-down-symbolic")
+            self._icon.set_from_icon_name("folder-open-symbolic")
         else:
             self._arrow.set_from_icon_name("pan-end-symbolic")
-        self._arrow.set_pixel_size(12)
+            self._icon.set_from_icon_name("folder-symbolic")
 
-    def _on_clicked(self, gesture, n_press, x, y):
-        """Maneja el click para expandir/colapsar."""
-        if self.is_directory:
+    def on_primary_click(self, n_press: int):
+        """Click izquierdo: expandir/colapsar directorios."""
+        if self.is_directory and self.path is not None:
+            if self.list_row is not None:
+                self.expanded = self.list_row.get_expanded()
             self.expanded = not self.expanded
+            self._update_arrow()
             self.emit("toggle-expand", self.path, self.expanded)
 
-    def _on_drag_prepare(self, source, x, y):
-        """Prepara los datos para el drag."""
-        return Gdk.ContentProvider.new_for_value(str(self.path))
+    def drag_value(self) -> str | None:
+        """Valor que se arrastra desde esta celda."""
+        return str(self.path) if self.path is not None else None
 
-    def _on_drag_begin(self, source, drag):
-        """Configura el icono del drag."""
-        icon = Gtk.Image.new_from_icon_name(
-            "folder-symbolic" if self.is_directory else "text-x-generic-symbolic"
-        )
-        source.set_icon(icon.get_paintable(), 0, 0)
+    def drag_icon_name(self) -> str:
+        """Icono del drag."""
+        return "folder-symbolic" if self.is_directory else "text-x-generic-symbolic"
 
-    def _on_right_click(self, gesture, n_press, x, y):
-        """Muestra el menú contextual."""
+    def build_context_menu(self) -> tuple[Gio.Menu, Gio.SimpleActionGroup] | None:
+        """Arma el menú contextual (solo al hacer click derecho)."""
+        if self.path is None:
+            return None
         menu = Gio.Menu()
 
         copy_paste_section = Gio.Menu()
@@ -146,82 +165,6 @@ class FileTreeRow(Gtk.ListBoxRow):
         edit_section.append("Delete", "file.delete")
         menu.append_section(None, edit_section)
 
-        action_group = Gio.SimpleActionGroup()
-
-        copy_action = Gio.SimpleAction.new("copy", None)
-        copy_action.connect("activate", self._on_copy_action)
-        action_group.add_action(copy_action)
-
-        paste_action = Gio.SimpleAction.new("paste", None)
-        paste_action.connect("activate", self._on_paste_action)
-        action_group.add_action(paste_action)
-
-        copy_path_action = Gio.SimpleAction.new("copy_path", None)
-        copy_path_action.connect("activate", self._on_copy_path_action)
-        action_group.add_action(copy_path_action)
-
-        copy_relative_path_action = Gio.SimpleAction.new("copy_relative_path", None)
-        copy_relative_path_action.connect("activate", self._on_copy_relative_path_action)
-        action_group.add_action(copy_relative_path_action)
-
-        rename_action = Gio.SimpleAction.new("rename", None)
-        rename_action.connect("activate", self._on_rename_action)
-        action_group.add_action(rename_action)
-
-        delete_action = Gio.SimpleAction.new("delete", None)
-        delete_action.connect("activate", self._on_delete_action)
-        action_group.add_action(delete_action)
-
-        add_favorite_action = Gio.SimpleAction.new("add_favorite", None)
-        add_favorite_action.connect("activate", self._on_add_favorite_action)
-        action_group.add_action(add_favorite_action)
-
-        create_folder_action = Gio.SimpleAction.new("create_folder", None)
-        create_folder_action.connect("activate", self._on_create_folder_action)
-        action_group.add_action(create_folder_action)
-
-        self._popover = Gtk.PopoverMenu.new_from_model(menu)
-        self._popover.set_parent(self)
-        self._popover.insert_action_group("file", action_group)
-        self._popover.set_has_arrow(False)
-
-        rect = Gdk.Rectangle()
-        rect.x = int(x)
-        rect.y = int(y)
-        rect.width = 1
-        rect.height = 1
-        self._popover.set_pointing_to(rect)
-
-        self._popover.popup()
-
-    def _on_copy_action(self, action, param):
-        """Acción de copiar."""
-        self.emit("copy-requested", self.path)
-
-    def _on_paste_action(self, action, param):
-        """Acción de pegar."""
-        self.emit("paste-requested", self.path)
-
-    def _on_rename_action(self, action, param):
-        """Acción de renombrar."""
-        self.emit("rename-requested", self.path)
-
-    def _on_delete_action(self, action, param):
-        """Acción de eliminar."""
-        self.emit("delete-requested", self.path)
-
-    def _on_copy_path_action(self, action, param):
-        """Acción de copiar path absoluto."""
-        self.emit("copy-path-requested", self.path)
-
-    def _on_copy_relative_path_action(self, action, param):
-        """Acción de copiar path relativo."""
-        self.emit("copy-relative-path-requested", self.path)
-
-    def _on_add_favorite_action(self, action, param):
-        """Acción de agregar a favoritos."""
-        self.emit("add-to-favorites-requested", self.path)
-
-    def _on_create_folder_action(self, action, param):
-        """Acción de crear carpeta."""
-        self.emit("create-folder-requested", self.path)
+        # El path se fija al abrir el menú: la celda puede reutilizarse antes
+        # de que se elija una acción
+        return menu, build_action_group(self, self.path, _MENU_ACTIONS)
@@ -0,0 +1,94 @@
+"""
+listing_cache.py - Caché de listados de directorios locales
+
+Caché LRU de listados ordenados por path, validado con la identidad del
+directorio (inode, device y st_mtime_ns): crear, borrar o renombrar una
+entrada cambia el mtime del directorio, así que un listado cacheado sigue
+siendo válido mientras la identidad no cambie. Validar cuesta un stat en
+lugar de un scandir completo.
+
+Autor: Homero Thompson del Lago del Terror
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# Máximo de directorios cacheados
+DEFAULT_MAX_DIRS = 512
+# Máximo de entradas sumando todos los directorios
+DEFAULT_MAX_ENTRIES = 200_000
+# Un directorio modificado hace menos de esto no se cachea: con timestamps de
+# baja resolución, un cambio en el mismo tick no modificaría el mtime
+RACY_WINDOW_NS = 2_000_000_000
+
+DirIdentity = tuple[int, int, int]
+
+
+def directory_identity(path: str) -> DirIdentity:
+    """
+    Identidad de un directorio: (inode, device, mtime_ns).
+
+    Raises:
+        OSError: Si el path no se puede leer
+    """
+    st = os.stat(path)
+    return (st.st_ino, st.st_dev, st.st_mtime_ns)
+
+
+class LocalListingCache:
+    """Caché LRU de listados locales validados por mtime (thread-safe)."""
+
+    def __init__(self, max_dirs: int = DEFAULT_MAX_DIRS, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self._max_dirs = max_dirs
+        self._max_entries = max_entries
+        # path -> (identidad, entradas); el orden es el de uso (LRU al inicio)
+        self._data: OrderedDict[str, tuple[DirIdentity, list[os.DirEntry]]] = OrderedDict()
+        self._total_entries = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, path: str, identity: DirIdentity) -> list[os.DirEntry] | None:
+        """Retorna el listado si está cacheado con la misma identidad, o None."""
+        with self._lock:
+            item = self._data.get(path)
+            if item is None:
+                return None
+            if item[0] != identity:
+                self._pop(path)
+                return None
+            self._data.move_to_end(path)
+            return item[1]
+
+    def put(self, path: str, identity: DirIdentity, entries: list[os.DirEntry]):
+        """Guarda un listado ordenado tomado con esa identidad."""
+        if len(entries) > self._max_entries:
+            return
+        if time.time_ns() - identity[2] < RACY_WINDOW_NS:
+            return
+        with self._lock:
+            self._pop(path)
+            self._data[path] = (identity, entries)
+            self._total_entries += len(entries)
+            while len(self._data) > self._max_dirs or self._total_entries > self._max_entries:
+                self._pop(next(iter(self._data)))
+
+    def invalidate(self, path: str):
+        """Descarta el listado de un directorio."""
+        with self._lock:
+            self._pop(path)
+
+    def clear(self):
+        """Vacía el caché."""
+        with self._lock:
+            self._data.clear()
+            self._total_entries = 0
+
+    def _pop(self, path: str):
+        """Elimina una clave actualizando el contador (con el lock tomado)."""
+        item = self._data.pop(path, None)
+        if item is not None:
+            self._total_entries -= len(item[1])
@@ -0,0 +1,294 @@
+"""
+name_index.py - Índice de nombres de archivo para la búsqueda local
+
+Índice en memoria de los nombres bajo un root, con un índice de trigramas:
+una búsqueda por subcadena recorre solo los archivos que contienen el
+trigrama menos frecuente de la consulta, en lugar de recorrer el disco en
+cada tecla.
+
+El índice se construye en background con un recorrido podado (sin ocultos)
+y se mantiene al día de forma incremental: se guarda el mtime de cada
+directorio y solo se vuelven a listar los que cambiaron.
+
+Autor: Homero Thompson del Lago del Terror
+"""
+
+import os
+import threading
+import time
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+
+from ....clients import SearchHit
+from .walker import scan_visible, walk
+
+try:
+    from loguru import logger
+except ImportError:
+    import logging
+
+    logger = logging.getLogger(__name__)
+
+# Máximo de entradas indexadas (por encima se usa find)
+MAX_INDEX_ENTRIES = 500_000
+# Segundos tras los que una búsqueda dispara una revalidación en background
+REVALIDATE_SECONDS = 30.0
+# Máximo de resultados por búsqueda
+MAX_RESULTS = 100
+# Caracteres de glob de find -name: esas consultas no van al índice
+_GLOB_CHARS = frozenset("*?[")
+
+# Un solo worker: construcción y actualizaciones nunca corren en paralelo
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="name-index")
+
+
+def _trigrams(name: str) -> set[str]:
+    """Trigramas (en minúsculas) de un nombre."""
+    lower = name.lower()
+    return {lower[i : i + 3] for i in range(len(lower) - 2)}
+
+
+class _IndexData:
+    """Estructuras del índice (se modifican con el lock del FilenameIndex)."""
+
+    def __init__(self):
+        # Por entrada: nombre (None si se eliminó), directorio padre y tipo
+        self.names: list[str | None] = []
+        self.parents = array("I")
+        self.is_dir = bytearray()
+        # Por directorio: path (None si se eliminó), mtime e hijos por nombre
+        self.dir_paths: list[str | None] = []
+        self.dir_mtimes: list[int] = []
+        self.children: list[dict[str, int] | None] = []
+        self.dir_ids: dict[str, int] = {}
+        # Entrada de tipo directorio -> id de su directorio indexado
+        self.entry_dirs: dict[int, int] = {}
+        self.postings: dict[str, array] = {}
+        self.live = 0
+        self.removed = 0
+
+    def add_dir(self, path: str, mtime: int, entry_id: int | None) -> int:
+        """Registra un directorio listado (entry_id: su entrada en el padre)."""
+        dir_id = len(self.dir_paths)
+        self.dir_paths.append(path)
+        self.dir_mtimes.append(mtime)
+        self.children.append({})
+        self.dir_ids[path] = dir_id
+        if entry_id is not None:
+            self.entry_dirs[entry_id] = dir_id
+        return dir_id
+
+    def add_entry(self, dir_id: int, name: str, is_dir: bool) -> int:
+        """Agrega una entrada de un directorio."""
+        entry_id = len(self.names)
+        self.names.append(name)
+        self.parents.append(dir_id)
+        self.is_dir.append(is_dir)
+        self.children[dir_id][name] = entry_id
+        for trigram in _trigrams(name):
+            posting = self.postings.get(trigram)
+            if posting is None:
+                posting = self.postings[trigram] = array("I")
+            posting.append(entry_id)
+        self.live += 1
+        return entry_id
+
+    def remove_entry(self, entry_id: int):
+        """Elimina una entrada (y el subárbol si es un directorio)."""
+        name = self.names[entry_id]
+        if name is None:
+            return
+        children = self.children[self.parents[entry_id]]
+        if children is not None:
+            children.pop(name, None)
+        self.names[entry_id] = None
+        self.live -= 1
+        self.removed += 1
+
+        dir_id = self.entry_dirs.pop(entry_id, None)
+        if dir_id is not None:
+            for child in list(self.children[dir_id].values()):
+                self.remove_entry(child)
+            del self.dir_ids[self.dir_paths[dir_id]]
+            self.dir_paths[dir_id] = None
+            self.children[dir_id] = None
+
+    def path_of(self, entry_id: int) -> str:
+        """Path absoluto de una entrada."""
+        return os.path.join(self.dir_paths[self.parents[entry_id]], self.names[entry_id])
+
+    def search(self, query: str, limit: int) -> list[SearchHit]:
+        """Entradas cuyo nombre contiene query (mismas reglas que find -name)."""
+        trigrams = _trigrams(query)
+        if trigrams:
+            postings = [self.postings.get(trigram) for trigram in trigrams]
+            if any(posting is None for posting in postings):
+                return []
+            candidates = min(postings, key=len)
+        else:
+            candidates = range(len(self.names))
+
+        hits = []
+        for entry_id in candidates:
+            name = self.names[entry_id]
+            if name is not None and query in name:
+                hits.append(SearchHit(self.path_of(entry_id), is_dir=bool(self.is_dir[entry_id])))
+                if len(hits) >= limit:
+                    break
+        return hits
+
+
+class FilenameIndex:
+    """
+    Índice de nombres bajo un directorio raíz.
+
+    search() retorna None mientras el índice no esté listo o si la consulta
+    no se puede responder desde el índice; en ese caso usar find.
+    """
+
+    def __init__(self, root: str, max_entries: int = MAX_INDEX_ENTRIES):
+        self.root = root
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._data: _IndexData | None = None
+        self._cancelled = threading.Event()
+        self._validated_at = 0.0
+        self._revalidating = False
+        # True si el árbol supera max_entries (el índice no se usa)
+        self.truncated = False
+
+    @property
+    def ready(self) -> bool:
+        return self._data is not None
+
+    def start(self) -> "FilenameIndex":
+        """Construye el índice en background."""
+        _executor.submit(self._build)
+        return self
+
+    def close(self):
+        """Detiene la construcción/actualización y libera el índice."""
+        self._cancelled.set()
+        with self._lock:
+            self._data = None
+
+    def search(self, query: str, limit: int = MAX_RESULTS) -> list[SearchHit] | None:
+        """Busca nombres que contienen query (None: usar find)."""
+        if _GLOB_CHARS.intersection(query):
+            return None
+        with self._lock:
+            if self._data is None:
+                return None
+            hits = self._data.search(query, limit)
+            stale = time.monotonic() - self._validated_at > REVALIDATE_SECONDS
+            if stale and not self._revalidating:
+                self._revalidating = True
+                _executor.submit(self._revalidate)
+        return hits
+
+    def refresh_directory(self, path: str):
+        """Vuelve a listar un directorio indexado que cambió (en background)."""
+        with self._lock:
+            if self._data is None or path not in self._data.dir_ids:
+                return
+        _executor.submit(self._rescan, path)
+
+    def _build(self):
+        """Worker: recorre el root y publica el índice completo."""
+        data = _IndexData()
+        if not self._index_tree(data, self.root, None):
+            return
+        with self._lock:
+            if not self._cancelled.is_set():
+                self._data = data
+                self._validated_at = time.monotonic()
+        logger.debug(f"Filename index for {self.root}: {data.live} entries")
+
+    def _index_tree(self, data: _IndexData, root: str, entry_id: int | None) -> bool:
+        """
+        Agrega un subárbol al índice.
+
+        Returns:
+            False si se canceló o se superó el máximo de entradas
+        """
+        # Entradas de directorio cuyo listado todavía no se agregó
+        pending = {root: entry_id}
+        for path, mtime, entries in walk(root):
+            if self._cancelled.is_set():
+                return False
+            with self._lock:
+                dir_id = data.add_dir(path, mtime, pending.pop(path, None))
+                for entry in entries:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                    child_id = data.add_entry(dir_id, entry.name, is_dir)
+                    if is_dir:
+                        pending[entry.path] = child_id
+            if data.live > self._max_entries:
+                self.truncated = True
+                logger.debug(f"Filename index for {self.root} exceeds {self._max_entries}")
+                self.close()
+                return False
+        return True
+
+    def _revalidate(self):
+        """Worker: vuelve a listar los directorios cuyo mtime cambió."""
+        try:
+            with self._lock:
+                data = self._data
+                if data is None:
+                    return
+                if data.removed > max(data.live, 10_000):
+                    # Demasiadas entradas eliminadas: reconstruir compacto
+                    rebuild = True
+                else:
+                    rebuild = False
+                    dirs = [
+                        (path, data.dir_mtimes[dir_id]) for path, dir_id in data.dir_ids.items()
+                    ]
+            if rebuild:
+                self._build()
+                return
+            for path, mtime in dirs:
+                if self._cancelled.is_set():
+                    return
+                try:
+                    changed = os.stat(path).st_mtime_ns != mtime
+                except OSError:
+                    # Eliminado: lo detecta el listado de su padre
+                    continue
+                if changed:
+                    self._rescan(path)
+        finally:
+            with self._lock:
+                self._revalidating = False
+                self._validated_at = time.monotonic()
+
+    def _rescan(self, path: str):
+        """Worker: actualiza un directorio con su listado actual."""
+        try:
+            mtime, entries = scan_visible(path)
+        except OSError:
+            return
+        current = {entry.name: entry for entry in entries}
+        new_dirs = []
+        with self._lock:
+            data = self._data
+            dir_id = data.dir_ids.get(path) if data is not None else None
+            if dir_id is None:
+                return
+            data.dir_mtimes[dir_id] = mtime
+            for name, child_id in list(data.children[dir_id].items()):
+                entry = current.get(name)
+                if entry is None or bool(data.is_dir[child_id]) != entry.is_dir(
+                    follow_symlinks=False
+                ):
+                    data.remove_entry(child_id)
+            for name, entry in current.items():
+                if name in data.children[dir_id]:
+                    continue
+                is_dir = entry.is_dir(follow_symlinks=False)
+                child_id = data.add_entry(dir_id, name, is_dir)
+                if is_dir:
+                    new_dirs.append((entry.path, child_id))
+        for subdir, child_id in new_dirs:
+            self._index_tree(data, subdir, child_id)
@@ -0,0 +1,177 @@
+"""
+scanner.py - Listado de directorios locales en background
+
+El scandir corre en un thread (un mount NFS/FUSE lento o una carpeta enorme
+no congela la ventana) y las entradas llegan al main loop en lotes. Cada
+iteración del main loop procesa como máximo MAX_ENTRIES_PER_ITERATION
+entradas, así GTK sigue dibujando mientras se carga un directorio grande.
+Con un LocalListingCache, un directorio sin cambios se entrega desde memoria
+con un solo stat.
+
+Autor: Homero Thompson del Lago del Terror
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+
+import gi
+
+gi.require_version("GLib", "2.0")
+
+from gi.repository import GLib
+
+from .listing_cache import LocalListingCache, directory_identity
+from .loader import entry_is_dir, sort_entries
+
+# Entradas por lote enviado desde el worker
+MAX_BATCH_ENTRIES = 500
+# Segundos máximos antes de enviar un lote incompleto (mounts lentos)
+BATCH_FLUSH_SECONDS = 0.05
+# Entradas aplicadas a la UI por iteración del main loop
+MAX_ENTRIES_PER_ITERATION = 1000
+# Directorios listados en paralelo
+SCAN_WORKERS = 4
+
+_executor = ThreadPoolExecutor(max_workers=SCAN_WORKERS, thread_name_prefix="file-scan")
+
+
+class ScanJob:
+    """
+    Lista un directorio en un worker y entrega las entradas en el main loop.
+
+    on_batch(entries) recibe lotes ordenados (sin archivos ocultos); sin
+    streaming se recibe un único lote con el directorio completo.
+    on_done(error) se llama al final, con el OSError si el listado falló.
+    Tras cancel() no se llama a ningún callback. Con cache, los listados
+    completos se guardan y se reutilizan mientras el directorio no cambie.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        on_batch: Callable[[list[os.DirEntry]], None],
+        on_done: Callable[[OSError | None], None] | None = None,
+        stream: bool = True,
+        dispatcher: Callable = GLib.idle_add,
+        cache: LocalListingCache | None = None,
+    ):
+        self.path = path
+        self._cache = cache
+        self._on_batch = on_batch
+        self._on_done = on_done
+        self._stream = stream
+        self._dispatcher = dispatcher
+        self._cancelled = threading.Event()
+        # Lotes pendientes de aplicar; una tupla (None, error) marca el final
+        self._pending: deque = deque()
+        self._lock = threading.Lock()
+        self._drain_scheduled = False
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def start(self) -> "ScanJob":
+        """Inicia el listado en el pool de workers."""
+        _executor.submit(self._run)
+        return self
+
+    def cancel(self):
+        """Cancela el listado (el worker corta en la próxima entrada)."""
+        self._cancelled.set()
+
+    def _run(self):
+        """Worker: scandir enviando lotes a medida que se leen."""
+        identity = self._cached_identity()
+        if identity is not None:
+            cached = self._cache.get(self.path, identity)
+            if cached is not None:
+                self._push_cached(cached)
+                return
+
+        scanned: list[os.DirEntry] = []
+        batch: list[os.DirEntry] = []
+        error = None
+        last_flush = time.monotonic()
+        try:
+            with os.scandir(self.path) as scanner:
+                for entry in scanner:
+                    if self._cancelled.is_set():
+                        return
+                    if entry.name.startswith("."):
+                        continue
+                    # Resolver el tipo acá (en el worker): sin d_type implica
+                    # un lstat y un symlink un stat de su destino
+                    entry_is_dir(entry)
+                    batch.append(entry)
+                    scanned.append(entry)
+                    if self._stream and (
+                        len(batch) >= MAX_BATCH_ENTRIES
+                        or time.monotonic() - last_flush >= BATCH_FLUSH_SECONDS
+                    ):
+                        self._push(sort_entries(batch))
+                        batch = []
+                        last_flush = time.monotonic()
+        except OSError as e:
+            error = e
+
+        if error is None and (batch or not self._stream):
+            self._push(sort_entries(batch))
+        if error is None and identity is not None and not self._cancelled.is_set():
+            self._cache.put(self.path, identity, sort_entries(scanned))
+        self._push((None, error))
+
+    def _cached_identity(self):
+        """Identidad del directorio para el caché (None sin caché o si falla)."""
+        if self._cache is None:
+            return None
+        try:
+            return directory_identity(self.path)
+        except OSError:
+            # scandir reporta el error
+            return None
+
+    def _push_cached(self, entries: list[os.DirEntry]):
+        """Entrega un listado cacheado (ya ordenado) con los mismos lotes."""
+        if self._stream:
+            for start in range(0, len(entries), MAX_BATCH_ENTRIES):
+                self._push(entries[start : start + MAX_BATCH_ENTRIES])
+        else:
+            self._push(list(entries))
+        self._push((None, None))
+
+    def _push(self, item):
+        """Encola un lote y programa el drenado en el main loop."""
+        if self._cancelled.is_set():
+            return
+        with self._lock:
+            self._pending.append(item)
+            if self._drain_scheduled:
+                return
+            self._drain_scheduled = True
+        self._dispatcher(self._drain)
+
+    def _drain(self) -> bool:
+        """Main loop: aplica lotes hasta el presupuesto por iteración."""
+        applied = 0
+        while applied < MAX_ENTRIES_PER_ITERATION:
+            if self._cancelled.is_set():
+                return False
+            with self._lock:
+                if not self._pending:
+                    self._drain_scheduled = False
+                    return False
+                item = self._pending.popleft()
+
+            if isinstance(item, tuple):
+                if self._on_done is not None:
+                    self._on_done(item[1])
+                continue
+            self._on_batch(item)
+            applied += max(len(item), 1)
+        # Quedan lotes: seguir en la próxima iteración (GTK dibuja entre medio)
+        return True
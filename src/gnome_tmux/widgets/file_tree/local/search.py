@@ -1,104 +1,185 @@
 """
 search.py - Búsqueda de archivos locales
 
+Los resultados son SearchHit con el tipo ya resuelto por la herramienta de
+búsqueda (find -printf, scandir), así mostrarlos no requiere un stat por
+resultado. Las búsquedas por regex y por contenido recorren el árbol con el
+walker compartido (walker.py); la de contenido revisa los archivos con un
+pool de procesos (content_search.py), sin lanzar grep.
+
+Las funciones iter_* generan los resultados a medida que aparecen y se
+pueden cancelar; las search_* retornan la lista completa.
+
 Autor: Homero Thompson del Lago del Terror
 """
 
+import os
 import re
 import subprocess
+import threading
+from collections.abc import Iterator
+from itertools import islice
 from pathlib import Path
 
-try:
-    from loguru import logger
-except ImportError:
-    import logging
+from ....clients import FIND_SEARCH_FORMAT, SearchHit
+from ..search_jobs import CancelToken
+from .content_search import iter_content_matches
+from .walker import IGNORED_DIRS, walk
 
-    logger = logging.getLogger(__name__)  # type: ignore
+# Máximo de resultados por búsqueda
+MAX_SEARCH_RESULTS = 100
+# Profundidad máxima de la búsqueda por regex
+MAX_SEARCH_DEPTH = 32
+# Segundos máximos de find
+NAME_SEARCH_TIMEOUT = 5
+# Bytes leídos por vez de la salida de find
+_READ_CHUNK = 65536
 
 
-def search_by_name(root_path: Path, query: str) -> list[Path]:
+def _stream_records(
+    args: list[str], timeout: float, token: CancelToken | None = None
+) -> Iterator[str]:
     """
-    Busca archivos por nombre usando find.
+    Ejecuta un comando y genera los registros separados por NUL de su salida
+    a medida que llegan.
+
+    El proceso se mata al cancelar el token, al vencer el timeout o al
+    cerrar el generador (ej: se alcanzó el máximo de resultados).
+    """
+    if token is not None and token.cancelled:
+        return
+    try:
+        proc = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    except FileNotFoundError:
+        return
+    timer = threading.Timer(timeout, proc.kill)
+    timer.daemon = True
+    timer.start()
+    if token is not None:
+        token.on_cancel(proc.kill)
+    try:
+        pending = b""
+        while chunk := proc.stdout.read1(_READ_CHUNK):
+            records = (pending + chunk).split(b"\0")
+            pending = records.pop()
+            for record in records:
+                yield os.fsdecode(record)
+    finally:
+        timer.cancel()
+        proc.kill()
+        proc.stdout.close()
+        proc.wait()
+
+
+def iter_by_name(
+    root_path: Path, query: str, token: CancelToken | None = None
+) -> Iterator[SearchHit]:
+    """
+    Busca archivos por nombre usando find, generando los resultados a medida
+    que find los encuentra.
 
     Args:
         root_path: Directorio raíz de búsqueda
         query: Patrón de búsqueda
-
-    Returns:
-        Lista de paths que coinciden (max 100)
+        token: Cancela la búsqueda (mata find)
     """
+    args = [
+        "find",
+        str(root_path),
+        "-mindepth",
+        "1",
+        "-name",
+        f"*{query}*",
+        "-not",
+        "-path",
+        "*/.*",
+        "-printf",
+        FIND_SEARCH_FORMAT,
+    ]
+    # Registros de a pares: tipo y path
+    records = _stream_records(args, NAME_SEARCH_TIMEOUT, token)
     try:
-        result = subprocess.run(
-            ["find", str(root_path), "-name", f"*{query}*", "-not", "-path", "*/.*"],
-            capture_output=True,
-            text=True,
-            timeout=5,
-        )
-        paths = []
-        for line in result.stdout.strip().split("\n"):
-            if line:
-                path = Path(line)
-                if path.exists() and path != root_path:
-                    paths.append(path)
-        return paths[:100]
-    except (subprocess.TimeoutExpired, FileNotFoundError):
-        return []
-
-
-def search_by_regex(root_path: Path, query: str) -> list[Path]:
+        for kind in records:
+            path = next(records, None)
+            if path is None:
+                return
+            yield SearchHit(path, is_dir=kind == "d")
+    finally:
+        records.close()
+
+
+def iter_by_regex(
+    root_path: Path, query: str, token: CancelToken | None = None
+) -> Iterator[SearchHit]:
     """
-    Busca archivos por patrón regex.
+    Busca archivos por patrón regex, directorio por directorio.
+
+    No entra en symlinks a directorios (podrían salir de root) ni en
+    directorios ocultos o ignorados (node_modules, etc.). Los symlinks se
+    listan igual, con el tipo de su destino.
 
     Args:
         root_path: Directorio raíz de búsqueda
         query: Expresión regular
-
-    Returns:
-        Lista de paths que coinciden (max 100)
+        token: Cancela la búsqueda (se revisa en cada directorio)
     """
     try:
-        pattern = re.compile(query, re.IGNORECASE)
+        matches = re.compile(query, re.IGNORECASE).search
     except re.error:
-        return []
-
-    results = []
-    try:
-        for path in root_path.rglob("*"):
-            if path.name.startswith("."):
-                continue
-            if pattern.search(path.name):
-                results.append(path)
-            if len(results) >= 100:
-                break
-    except (PermissionError, OSError) as e:
-        logger.debug(f"Permission error during regex search: {e}")
-    return results
-
-
-def search_by_content(root_path: Path, query: str) -> list[Path]:
+        return
+
+    for _, _, entries in walk(
+        str(root_path),
+        max_depth=MAX_SEARCH_DEPTH,
+        ignored=IGNORED_DIRS,
+    ):
+        if token is not None and token.cancelled:
+            return
+        for entry in entries:
+            if matches(entry.name):
+                yield SearchHit(entry.path, is_dir=entry.is_dir())
+
+
+def iter_by_content(
+    root_path: Path, query: str, token: CancelToken | None = None
+) -> Iterator[SearchHit]:
     """
-    Busca en contenido de archivos usando grep.
+    Busca en contenido de archivos, generando cada archivo (con línea y
+    fragmento de la coincidencia) en cuanto se encuentra.
 
     Args:
         root_path: Directorio raíz de búsqueda
         query: Texto a buscar
+        token: Cancela la búsqueda
+    """
+    return iter_content_matches(root_path, query, token)
+
+
+def search_by_name(root_path: Path, query: str) -> list[SearchHit]:
+    """
+    Busca archivos por nombre usando find.
 
     Returns:
-        Lista de paths que contienen el texto (max 100)
+        Resultados que coinciden (max 100)
     """
-    try:
-        result = subprocess.run(
-            ["grep", "-r", "-l", "-i", "--include=*", query, str(root_path)],
-            capture_output=True,
-            text=True,
-            timeout=10,
-        )
-        paths = []
-        for line in result.stdout.strip().split("\n"):
-            if line:
-                path = Path(line)
-                if path.exists() and not any(p.startswith(".") for p in path.parts):
-                    paths.append(path)
-        return paths[:100]
-    except (subprocess.TimeoutExpired, FileNotFoundError):
-        return []
+    return list(islice(iter_by_name(root_path, query), MAX_SEARCH_RESULTS))
+
+
+def search_by_regex(root_path: Path, query: str) -> list[SearchHit]:
+    """
+    Busca archivos por patrón regex.
+
+    Returns:
+        Resultados que coinciden (max 100)
+    """
+    return list(islice(iter_by_regex(root_path, query), MAX_SEARCH_RESULTS))
+
+
+def search_by_content(root_path: Path, query: str) -> list[SearchHit]:
+    """
+    Busca en contenido de archivos.
+
+    Returns:
+        Archivos que contienen el texto (max 100)
+    """
+    return list(islice(iter_by_content(root_path, query), MAX_SEARCH_RESULTS))
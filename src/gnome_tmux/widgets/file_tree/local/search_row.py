@@ -29,12 +29,21 @@ class SearchResultRow(Gtk.ListBoxRow):
         "navigate-requested": (GObject.SignalFlags.RUN_FIRST, None, (object,)),
     }
 
-    def __init__(self, path: Path, root_path: Path):
+    def __init__(
+        self,
+        path: Path,
+        root_path: Path,
+        is_directory: bool = False,
+        line: int = 0,
+        preview: str = "",
+    ):
         super().__init__()
 
         self.path = path
         self.root_path = root_path
-        self.is_directory = path.is_dir()
+        self.is_directory = is_directory
+        # Búsqueda por contenido: línea y fragmento de la coincidencia
+        self.line = line
         self._popover = None
 
         self.set_selectable(False)
@@ -62,6 +71,8 @@ class SearchResultRow(Gtk.ListBoxRow):
             relative = str(path.relative_to(root_path))
         except ValueError:
             relative = str(path)
+        if line:
+            relative = f"{relative}:{line}"
         path_label = Gtk.Label(label=relative)
         path_label.set_ellipsize(3)
         path_label.set_xalign(0)
@@ -69,6 +80,15 @@ class SearchResultRow(Gtk.ListBoxRow):
         path_label.add_css_class("caption")
         text_box.append(path_label)
 
+        if preview:
+            preview_label = Gtk.Label(label=preview)
+            preview_label.set_ellipsize(3)
+            preview_label.set_xalign(0)
+            preview_label.set_tooltip_text(preview)
+            preview_label.add_css_class("caption")
+            preview_label.add_css_class("monospace")
+            text_box.append(preview_label)
+
         box.append(text_box)
 
         nav_btn = Gtk.Button()
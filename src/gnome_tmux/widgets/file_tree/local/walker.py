@@ -0,0 +1,90 @@
+"""
+walker.py - Recorrido de árboles locales con scandir
+
+Recorrido iterativo con os.scandir que poda los directorios ocultos (y los
+ignorados, como node_modules) antes de descender: nunca se listan .git,
+.venv, etc. El tipo de cada entrada sale del d_type de scandir, sin un stat
+por archivo. Lo comparten el índice de nombres y las búsquedas locales.
+
+Autor: Homero Thompson del Lago del Terror
+"""
+
+import os
+from collections.abc import Iterator
+
+# Directorios que las búsquedas no recorren (dependencias y caches)
+IGNORED_DIRS = frozenset({"node_modules", "__pycache__", "site-packages", "venv"})
+
+
+def _scan(path: str) -> tuple[os.stat_result, list[os.DirEntry]]:
+    """stat del directorio (antes del scandir) y sus entradas visibles."""
+    st = os.stat(path)
+    with os.scandir(path) as scanner:
+        entries = [entry for entry in scanner if not entry.name.startswith(".")]
+    return st, entries
+
+
+def scan_visible(path: str) -> tuple[int, list[os.DirEntry]]:
+    """
+    Lista las entradas visibles (no ocultas) de un directorio.
+
+    Returns:
+        (st_mtime_ns del directorio, entradas). El mtime se toma antes del
+        scandir: un cambio durante el listado deja un mtime distinto.
+
+    Raises:
+        OSError: Si el directorio no se puede leer
+    """
+    st, entries = _scan(path)
+    return st.st_mtime_ns, entries
+
+
+def walk(
+    root: str,
+    max_depth: int | None = None,
+    follow_symlinks: bool = False,
+    ignored: frozenset[str] = frozenset(),
+) -> Iterator[tuple[str, int, list[os.DirEntry]]]:
+    """
+    Recorre root en profundidad sin entrar en directorios ocultos.
+
+    Los directorios ilegibles se saltean.
+
+    Args:
+        root: Directorio raíz
+        max_depth: Profundidad máxima de las entradas listadas (1: solo las
+            de root); None sin límite
+        follow_symlinks: Entrar en symlinks a directorios. Cada directorio
+            se recorre una sola vez (por dispositivo e inodo), así un
+            symlink que apunta a un ancestro no genera un ciclo
+        ignored: Nombres de directorios que se listan pero no se recorren
+
+    Yields:
+        (path del directorio, st_mtime_ns, entradas visibles)
+    """
+    seen: set[tuple[int, int]] = set()
+    stack = [(root, 1)]
+    while stack:
+        path, depth = stack.pop()
+        try:
+            st, entries = _scan(path)
+        except OSError:
+            continue
+        if follow_symlinks:
+            identity = (st.st_dev, st.st_ino)
+            if identity in seen:
+                continue
+            seen.add(identity)
+        yield path, st.st_mtime_ns, entries
+        if max_depth is not None and depth >= max_depth:
+            continue
+        # En orden inverso: el primer subdirectorio se recorre primero
+        for entry in reversed(entries):
+            if entry.name in ignored:
+                continue
+            try:
+                is_dir = entry.is_dir(follow_symlinks=follow_symlinks)
+            except OSError:
+                continue
+            if is_dir:
+                stack.append((entry.path, depth + 1))
@@ -0,0 +1,124 @@
+"""
+watcher.py - Vigilancia de directorios locales del árbol
+
+Un Gio.FileMonitor (inotify) por directorio cargado: el root y cada
+directorio expandido. Los eventos se agrupan por directorio y se entregan
+una sola vez por ventana de DEBOUNCE_MS, así una ráfaga (git checkout, la
+salida de un build) produce un único refresco incremental por directorio.
+
+Autor: Homero Thompson del Lago del Terror
+"""
+
+from collections.abc import Callable, Iterable
+
+import gi
+
+gi.require_version("Gio", "2.0")
+gi.require_version("GLib", "2.0")
+
+from gi.repository import Gio, GLib
+
+try:
+    from loguru import logger
+except ImportError:
+    import logging
+
+    logger = logging.getLogger(__name__)
+
+# Milisegundos que se acumulan eventos antes de refrescar
+DEBOUNCE_MS = 250
+
+# Eventos que cambian el listado (no el contenido de los archivos)
+_LISTING_EVENTS = {
+    Gio.FileMonitorEvent.CREATED,
+    Gio.FileMonitorEvent.DELETED,
+    Gio.FileMonitorEvent.MOVED_IN,
+    Gio.FileMonitorEvent.MOVED_OUT,
+    Gio.FileMonitorEvent.RENAMED,
+}
+
+
+def _is_hidden(file) -> bool:
+    """True si el archivo del evento está oculto (no se muestra en el árbol)."""
+    name = file.get_basename() if file is not None else None
+    return name is None or name.startswith(".")
+
+
+class DirectoryWatcher:
+    """
+    Vigila directorios locales y avisa qué directorio cambió.
+
+    on_changed(path) se llama en el main loop como máximo una vez por
+    directorio y por ventana de debounce.
+    """
+
+    def __init__(
+        self,
+        on_changed: Callable[[str], None],
+        debounce_ms: int = DEBOUNCE_MS,
+        scheduler: Callable = GLib.timeout_add,
+    ):
+        self._on_changed = on_changed
+        self._debounce_ms = debounce_ms
+        self._scheduler = scheduler
+        self._monitors: dict[str, Gio.FileMonitor] = {}
+        # Directorios con cambios pendientes, en orden de llegada
+        self._pending: dict[str, None] = {}
+        self._flush_scheduled = False
+
+    def __contains__(self, path: str) -> bool:
+        return path in self._monitors
+
+    def watch(self, path: str):
+        """Empieza a vigilar un directorio (no hace nada si ya se vigila)."""
+        if path in self._monitors:
+            return
+        try:
+            monitor = Gio.File.new_for_path(path).monitor_directory(
+                Gio.FileMonitorFlags.WATCH_MOVES, None
+            )
+        except GLib.Error as e:
+            # Sin inotify (límite de watches, filesystem sin soporte)
+            logger.warning(f"Cannot watch {path}: {e}")
+            return
+        monitor.connect("changed", self._on_monitor_changed, path)
+        self._monitors[path] = monitor
+
+    def retain(self, paths: Iterable[str]):
+        """Deja de vigilar los directorios que no están en paths."""
+        keep = set(paths)
+        for path in [p for p in self._monitors if p not in keep]:
+            self._unwatch(path)
+
+    def clear(self):
+        """Deja de vigilar todos los directorios."""
+        for path in list(self._monitors):
+            self._unwatch(path)
+
+    def _unwatch(self, path: str):
+        """Cancela el monitor de un directorio y sus cambios pendientes."""
+        self._monitors.pop(path).cancel()
+        self._pending.pop(path, None)
+
+    def _on_monitor_changed(self, _monitor, file, other_file, event_type, path: str):
+        """Handler de Gio.FileMonitor: acumula el directorio afectado."""
+        if event_type not in _LISTING_EVENTS:
+            return
+        # Renombres de un oculto a otro oculto (ej: archivos swap de editores)
+        if _is_hidden(file) and _is_hidden(other_file):
+            return
+        if path not in self._monitors:
+            return
+        self._pending[path] = None
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self._scheduler(self._debounce_ms, self._flush)
+
+    def _flush(self) -> bool:
+        """Entrega los directorios acumulados durante la ventana."""
+        self._flush_scheduled = False
+        pending = list(self._pending)
+        self._pending.clear()
+        for path in pending:
+            self._on_changed(path)
+        return False
@@ -68,31 +68,12 @@ class RemoteFileOperations:
             return False
 
         source = self._clipboard_path
-        source_name = os.path.basename(source)
 
-        # Determinar directorio destino
-        if self._client.is_dir(destination):
-            dest_dir = destination
-        else:
-            dest_dir = os.path.dirname(destination)
-
-        target = f"{dest_dir.rstrip('/')}/{source_name}"
-
-        # Manejar colisiones de nombres
-        counter = 1
-        original_name = source_name
-        while self._client.file_exists(target):
-            if "." in original_name and not original_name.startswith("."):
-                name_parts = original_name.rsplit(".", 1)
-                new_name = f"{name_parts[0]}_{counter}.{name_parts[1]}"
-            else:
-                new_name = f"{original_name}_{counter}"
-            target = f"{dest_dir.rstrip('/')}/{new_name}"
-            counter += 1
-
-        logger.info(f"📋 Pegando remoto: {source} → {target}")
-        if self._client.copy_file(source, target):
-            logger.info(f"✅ Copiado exitosamente en {self._client.host}")
+        # Destino, nombre libre y copia se resuelven en un solo comando remoto
+        logger.info(f"📋 Pegando remoto: {source} → {destination}")
+        target = self._client.paste_file(source, destination)
+        if target:
+            logger.info(f"✅ Copiado exitosamente en {self._client.host}: {target}")
             on_success()
             return True
         else:
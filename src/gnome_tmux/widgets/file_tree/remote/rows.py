@@ -4,16 +4,47 @@ rows.py - Filas para el árbol de archivos remoto
 Autor: Homero Thompson del Lago del Terror
 """
 
+import time
+
 import gi
 
 gi.require_version("Gtk", "4.0")
 gi.require_version("Gdk", "4.0")
 
-from gi.repository import Gdk, Gio, GObject, Gtk
+from gi.repository import Gdk, Gio, GLib, GObject, Gtk
+
+from ..row_events import build_action_group
+
+# Acción del menú -> señal emitida con el path
+_MENU_ACTIONS = (
+    ("copy", "copy-requested"),
+    ("paste", "paste-requested"),
+    ("copy_path", "copy-path-requested"),
+    ("download", "download-requested"),
+    ("rename", "rename-requested"),
+    ("delete", "delete-requested"),
+    ("create_folder", "create-folder-requested"),
+)
+
+
+def format_entry_tooltip(is_dir: bool, size: int | None, mtime: float | None) -> str:
+    """Texto de tooltip con tamaño (solo archivos) y fecha de modificación."""
+    parts = []
+    if size is not None and not is_dir:
+        parts.append(GLib.format_size(size))
+    if mtime:
+        parts.append(time.strftime("%Y-%m-%d %H:%M", time.localtime(mtime)))
+    return " · ".join(parts)
+
 
+class RemoteFileTreeRow(Gtk.Box):
+    """
+    Celda del ListView que representa un archivo o directorio remoto.
 
-class RemoteFileTreeRow(Gtk.ListBoxRow):
-    """Fila que representa un archivo o directorio remoto."""
+    Se crea una por fila visible y se reutiliza: bind() la asocia con otra
+    entrada al hacer scroll. Los clicks, el drag y el menú llegan desde el
+    RowEventDelegate del ListView.
+    """
 
     __gtype_name__ = "RemoteFileTreeRow"
 
@@ -28,122 +59,115 @@ class RemoteFileTreeRow(Gtk.ListBoxRow):
         "paste-requested": (GObject.SignalFlags.RUN_FIRST, None, (str,)),
     }
 
-    def __init__(
-        self,
-        path: str,
-        name: str,
-        is_dir: bool,
-        depth: int,
-        expanded: bool = False,
-        is_hidden: bool = False,
-    ):
-        super().__init__()
-
-        self.path = path
-        self.name = name
-        self.depth = depth
-        self.is_directory = is_dir
-        self.expanded = expanded
-        self.is_hidden = is_hidden
+    def __init__(self):
+        super().__init__(orientation=Gtk.Orientation.HORIZONTAL, spacing=4)
 
-        self.set_selectable(False)
+        self.path = ""
+        self.name = ""
+        self.depth = 0
+        self.is_directory = False
+        self.expanded = False
+        self.is_hidden = False
+        self.list_row: Gtk.TreeListRow | None = None
+        self._expanded_handler: int | None = None
 
-        box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=4)
-        box.set_margin_start(4 + depth * 16)
-        box.set_margin_end(4)
-        box.set_margin_top(1)
-        box.set_margin_bottom(1)
+        self.set_margin_end(4)
+        self.set_margin_top(1)
+        self.set_margin_bottom(1)
 
-        if self.is_directory:
-            self._arrow = Gtk.Image()
-            self._update_arrow()
-            box.append(self._arrow)
-
-            folder_icon = Gtk.Image.new_from_icon_name(
-                "folder-open-symbolic" if expanded else "folder-symbolic"
-            )
-            folder_icon.set_pixel_size(14)
-            box.append(folder_icon)
-
-            label = Gtk.Label(label=name)
-            label.set_ellipsize(3)
-            label.set_hexpand(True)
-            label.set_xalign(0)
-            if is_hidden:
-                label.add_css_class("dim-label")
-            box.append(label)
-
-            click = Gtk.GestureClick()
-            click.connect("released", self._on_clicked)
-            self.add_controller(click)
+        # La flecha ocupa el mismo ancho que el espaciador de los archivos
+        self._arrow = Gtk.Image()
+        self._arrow.set_pixel_size(12)
+        self._arrow.set_size_request(14, -1)
+        self.append(self._arrow)
+
+        self._icon = Gtk.Image()
+        self._icon.set_pixel_size(14)
+        self.append(self._icon)
+
+        self._label = Gtk.Label()
+        self._label.set_ellipsize(3)
+        self._label.set_hexpand(True)
+        self._label.set_xalign(0)
+        self.append(self._label)
+
+    def bind(self, item, list_row: Gtk.TreeListRow):
+        """Muestra una entrada (FileItem) en esta celda."""
+        # La fila de carga no tiene path: clicks, drag y menú la ignoran
+        self.path = "" if item.is_placeholder else item.path
+        self.name = item.name
+        self.depth = list_row.get_depth()
+        self.is_directory = item.is_dir
+        self.expanded = list_row.get_expanded()
+        # La fila también se expande/colapsa sin click (restaurar el árbol,
+        # colapsar un ancestro): seguir el estado real del TreeListRow
+        self._expanded_handler = list_row.connect("notify::expanded", self._on_expanded_changed)
+        self.is_hidden = item.is_hidden
+        self.list_row = list_row
+
+        self.set_margin_start(4 + self.depth * 16)
+        self._label.set_label(item.name)
+        if item.is_hidden or item.is_placeholder:
+            self._label.add_css_class("dim-label")
         else:
-            spacer = Gtk.Box()
-            spacer.set_size_request(14, -1)
-            box.append(spacer)
-
-            file_icon = Gtk.Image.new_from_icon_name("text-x-generic-symbolic")
-            file_icon.set_pixel_size(14)
-            box.append(file_icon)
-
-            label = Gtk.Label(label=name)
-            label.set_ellipsize(3)
-            label.set_hexpand(True)
-            label.set_xalign(0)
-            if is_hidden:
-                label.add_css_class("dim-label")
-            box.append(label)
-
-        self.set_child(box)
-
-        drag_source = Gtk.DragSource()
-        drag_source.set_actions(Gdk.DragAction.COPY)
-        drag_source.connect("prepare", self._on_drag_prepare)
-        drag_source.connect("drag-begin", self._on_drag_begin)
-        self.add_controller(drag_source)
-
-        right_click = Gtk.GestureClick()
-        right_click.set_button(3)
-        right_click.connect("pressed", self._on_right_click)
-        self.add_controller(right_click)
-
-        if not self.is_directory:
-            double_click = Gtk.GestureClick()
-            double_click.set_button(1)
-            double_click.connect("released", self._on_double_click)
-            self.add_controller(double_click)
-
-    def _on_double_click(self, gesture, n_press, x, y):
-        """Descarga el archivo con doble click."""
-        if n_press == 2 and not self.is_directory:
-            self.emit("download-requested", self.path)
+            self._label.remove_css_class("dim-label")
+        self._update_arrow()
+        if item.is_placeholder:
+            self._icon.set_from_icon_name("content-loading-symbolic")
+
+        # Tamaño y fecha (vienen en el mismo listado, sin llamadas extra)
+        self.set_tooltip_text(format_entry_tooltip(item.is_dir, item.size, item.mtime) or None)
+
+    def unbind(self):
+        """Libera la celda para otra entrada."""
+        if self.list_row is not None and self._expanded_handler is not None:
+            self.list_row.disconnect(self._expanded_handler)
+        self._expanded_handler = None
+        self.list_row = None
+
+    def _on_expanded_changed(self, list_row: Gtk.TreeListRow, _pspec):
+        """El TreeListRow cambió de estado: actualizar la flecha."""
+        self.expanded = list_row.get_expanded()
+        self._update_arrow()
 
     def _update_arrow(self):
-        """Actualiza el icono de la flecha."""
+        """Actualiza la flecha y el icono según el tipo y estado."""
+        if not self.is_directory:
+            self._arrow.clear()
+            self._icon.set_from_icon_name("text-x-generic-symbolic")
+            return
         if self.expanded:
             self._arrow.set_from_icon_name("pan-down-symbolic")
+            self._icon.set_from_icon_name("folder-open-symbolic")
         else:
             self._arrow.set_from_icon_name("pan-end-symbolic")
-        self._arrow.set_pixel_size(12)
+            self._icon.set_from_icon_name("folder-symbolic")
 
-    def _on_clicked(self, gesture, n_press, x, y):
-        """Maneja el click para expandir/colapsar."""
+    def on_primary_click(self, n_press: int):
+        """Expande/colapsa directorios; descarga archivos con doble click."""
+        if not self.path:
+            return
         if self.is_directory:
+            if self.list_row is not None:
+                self.expanded = self.list_row.get_expanded()
             self.expanded = not self.expanded
+            self._update_arrow()
             self.emit("toggle-expand", self.path, self.expanded)
+        elif n_press == 2:
+            self.emit("download-requested", self.path)
 
-    def _on_drag_prepare(self, source, x, y):
-        """Prepara los datos para el drag."""
-        return Gdk.ContentProvider.new_for_value(self.path)
+    def drag_value(self) -> str | None:
+        """Valor que se arrastra desde esta celda."""
+        return self.path or None
 
-    def _on_drag_begin(self, source, drag):
-        """Configura el icono del drag."""
-        icon = Gtk.Image.new_from_icon_name(
-            "folder-symbolic" if self.is_directory else "text-x-generic-symbolic"
-        )
-        source.set_icon(icon.get_paintable(), 0, 0)
+    def drag_icon_name(self) -> str:
+        """Icono del drag."""
+        return "folder-symbolic" if self.is_directory else "text-x-generic-symbolic"
 
-    def _on_right_click(self, gesture, n_press, x, y):
-        """Muestra el menú contextual."""
+    def build_context_menu(self) -> tuple[Gio.Menu, Gio.SimpleActionGroup] | None:
+        """Arma el menú contextual (solo al hacer click derecho)."""
+        if not self.path:
+            return None
         menu = Gio.Menu()
 
         if not self.is_directory:
@@ -170,52 +194,9 @@ class RemoteFileTreeRow(Gtk.ListBoxRow):
         edit_section.append("Delete", "file.delete")
         menu.append_section(None, edit_section)
 
-        action_group = Gio.SimpleActionGroup()
-
-        copy_action = Gio.SimpleAction.new("copy", None)
-        copy_action.connect("activate", lambda a, p: self.emit("copy-requested", self.path))
-        action_group.add_action(copy_action)
-
-        paste_action = Gio.SimpleAction.new("paste", None)
-        paste_action.connect("activate", lambda a, p: self.emit("paste-requested", self.path))
-        action_group.add_action(paste_action)
-
-        copy_path_action = Gio.SimpleAction.new("copy_path", None)
-        copy_path_action.connect(
-            "activate", lambda a, p: self.emit("copy-path-requested", self.path)
-        )
-        action_group.add_action(copy_path_action)
-
-        download_action = Gio.SimpleAction.new("download", None)
-        download_action.connect("activate", lambda a, p: self.emit("download-requested", self.path))
-        action_group.add_action(download_action)
-
-        rename_action = Gio.SimpleAction.new("rename", None)
-        rename_action.connect("activate", lambda a, p: self.emit("rename-requested", self.path))
-        action_group.add_action(rename_action)
-
-        delete_action = Gio.SimpleAction.new("delete", None)
-        delete_action.connect("activate", lambda a, p: self.emit("delete-requested", self.path))
-        action_group.add_action(delete_action)
-
-        create_folder_action = Gio.SimpleAction.new("create_folder", None)
-        create_folder_action.connect(
-            "activate", lambda a, p: self.emit("create-folder-requested", self.path)
-        )
-        action_group.add_action(create_folder_action)
-
-        popover = Gtk.PopoverMenu.new_from_model(menu)
-        popover.set_parent(self)
-        popover.insert_action_group("file", action_group)
-        popover.set_has_arrow(False)
-
-        rect = Gdk.Rectangle()
-        rect.x = int(x)
-        rect.y = int(y)
-        rect.width = 1
-        rect.height = 1
-        popover.set_pointing_to(rect)
-        popover.popup()
+        # El path se fija al abrir el menú: la celda puede reutilizarse antes
+        # de que se elija una acción
+        return menu, build_action_group(self, self.path, _MENU_ACTIONS)
 
 
 class RemoteSearchResultRow(Gtk.ListBoxRow):
@@ -291,4 +272,6 @@ class RemoteSearchResultRow(Gtk.ListBoxRow):
 
     def _on_drag_prepare(self, source, x, y):
         """Prepara los datos para el drag."""
+        if not self.path:
+            return None
         return Gdk.ContentProvider.new_for_value(self.path)
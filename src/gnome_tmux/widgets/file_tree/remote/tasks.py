@@ -0,0 +1,83 @@
+"""
+tasks.py - Llamadas SSH del árbol remoto fuera del main loop
+
+Cada llamada (check de conexión, home, listados) corre en un worker y el
+resultado se aplica en el main loop. Un host lento o caído no congela la
+ventana ni la entrada de los terminales.
+
+Autor: Homero Thompson del Lago del Terror
+"""
+
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import gi
+
+gi.require_version("GLib", "2.0")
+
+from gi.repository import GLib
+
+try:
+    from loguru import logger
+except ImportError:
+    import logging
+
+    logger = logging.getLogger(__name__)
+
+# Llamadas SSH en paralelo (comparten la conexión ControlMaster)
+REMOTE_WORKERS = 4
+
+_executor = ThreadPoolExecutor(max_workers=REMOTE_WORKERS, thread_name_prefix="remote-io")
+
+
+class RemoteTask:
+    """
+    Ejecuta una llamada remota en un worker y entrega el resultado.
+
+    on_done(result) se llama en el main loop; si la llamada lanza una
+    excepción se registra y se entrega None. Tras cancel() no se llama.
+    """
+
+    def __init__(
+        self,
+        func: Callable[[], Any],
+        on_done: Callable[[Any], None],
+        dispatcher: Callable = GLib.idle_add,
+    ):
+        self._func = func
+        self._on_done = on_done
+        self._dispatcher = dispatcher
+        self._cancelled = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def start(self) -> "RemoteTask":
+        """Inicia la llamada en el pool de workers."""
+        _executor.submit(self._run)
+        return self
+
+    def cancel(self):
+        """Descarta el resultado (la llamada en curso no se interrumpe)."""
+        self._cancelled.set()
+
+    def _run(self):
+        """Worker: ejecuta la llamada y programa la entrega."""
+        if self._cancelled.is_set():
+            return
+        try:
+            result = self._func()
+        except Exception as e:
+            logger.error(f"Remote call failed: {e}")
+            result = None
+        if not self._cancelled.is_set():
+            self._dispatcher(self._deliver, result)
+
+    def _deliver(self, result) -> bool:
+        """Main loop: entrega el resultado si la tarea sigue vigente."""
+        if not self._cancelled.is_set():
+            self._on_done(result)
+        return False
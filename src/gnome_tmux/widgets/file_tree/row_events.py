@@ -0,0 +1,189 @@
+"""
+row_events.py - Eventos de las filas del árbol a nivel del ListView
+
+Un solo GestureClick y un solo DragSource en el ListView atienden a todas
+las filas: cada evento se reenvía a la celda bajo el puntero. Las celdas no
+tienen controllers propios, y el menú contextual se arma recién al hacer
+click derecho y se libera al cerrarse.
+
+Autor: Homero Thompson del Lago del Terror
+"""
+
+from collections.abc import Callable
+from typing import Any
+
+import gi
+
+gi.require_version("Gtk", "4.0")
+gi.require_version("Gdk", "4.0")
+
+from gi.repository import Gdk, Gio, GLib, Gtk
+
+
+class RowEventDelegate:
+    """
+    Delegado de clicks, drag y menú contextual de las celdas del árbol.
+
+    Las celdas implementan:
+        on_primary_click(n_press): click izquierdo (al soltar)
+        build_context_menu(): (Gio.Menu, Gio.SimpleActionGroup) o None
+        drag_value(): valor a arrastrar o None
+        drag_icon_name(): nombre del icono del drag
+    """
+
+    def __init__(
+        self,
+        list_view: Gtk.Widget,
+        cell_types: tuple[type, ...],
+        on_hover: Callable[[Any], None] | None = None,
+    ):
+        """
+        Args:
+            list_view: Widget que contiene las celdas
+            cell_types: Clases de celda a las que se reenvían los eventos
+            on_hover: Se llama con la celda cuando el puntero entra en otra
+        """
+        self._list_view = list_view
+        self._cell_types = cell_types
+        self._on_hover = on_hover
+        self._hover_cell = None
+        self._drag_cell = None
+        self._popover: Gtk.PopoverMenu | None = None
+
+        click = Gtk.GestureClick()
+        click.set_button(0)
+        # Captura: recibir el evento antes que los widgets internos del ListView
+        click.set_propagation_phase(Gtk.PropagationPhase.CAPTURE)
+        click.connect("pressed", self._on_pressed)
+        click.connect("released", self._on_released)
+        list_view.add_controller(click)
+
+        drag_source = Gtk.DragSource()
+        drag_source.set_actions(Gdk.DragAction.COPY)
+        drag_source.set_propagation_phase(Gtk.PropagationPhase.CAPTURE)
+        drag_source.connect("prepare", self._on_drag_prepare)
+        drag_source.connect("drag-begin", self._on_drag_begin)
+        drag_source.connect("drag-end", self._on_drag_end)
+        list_view.add_controller(drag_source)
+
+        if on_hover is not None:
+            motion = Gtk.EventControllerMotion()
+            motion.connect("motion", self._on_motion)
+            motion.connect("leave", self._on_leave)
+            list_view.add_controller(motion)
+
+    def cell_at(self, x: float, y: float):
+        """Retorna la celda en las coordenadas (del ListView), o None."""
+        widget = self._list_view.pick(x, y, Gtk.PickFlags.DEFAULT)
+        while widget is not None and widget is not self._list_view:
+            if isinstance(widget, self._cell_types):
+                return widget
+            widget = widget.get_parent()
+        return None
+
+    def _on_motion(self, controller, x, y):
+        """Avisa solo cuando el puntero cambia de celda."""
+        cell = self.cell_at(x, y)
+        if cell is self._hover_cell:
+            return
+        self._hover_cell = cell
+        if cell is not None:
+            self._on_hover(cell)
+
+    def _on_leave(self, controller):
+        """El puntero salió de la lista."""
+        self._hover_cell = None
+
+    def _on_pressed(self, gesture, n_press, x, y):
+        """Click derecho: menú contextual de la celda."""
+        if gesture.get_current_button() != Gdk.BUTTON_SECONDARY:
+            return
+        cell = self.cell_at(x, y)
+        if cell is not None:
+            self._show_menu(cell, x, y)
+
+    def _on_released(self, gesture, n_press, x, y):
+        """Click izquierdo: acción principal de la celda."""
+        if gesture.get_current_button() != Gdk.BUTTON_PRIMARY:
+            return
+        cell = self.cell_at(x, y)
+        if cell is not None:
+            cell.on_primary_click(n_press)
+
+    def _on_drag_prepare(self, source, x, y):
+        """Prepara el drag con el valor de la celda bajo el puntero."""
+        cell = self.cell_at(x, y)
+        value = cell.drag_value() if cell is not None else None
+        if value is None:
+            return None
+        self._drag_cell = cell
+        return Gdk.ContentProvider.new_for_value(value)
+
+    def _on_drag_begin(self, source, drag):
+        """Configura el icono del drag."""
+        if self._drag_cell is None:
+            return
+        icon = Gtk.Image.new_from_icon_name(self._drag_cell.drag_icon_name())
+        source.set_icon(icon.get_paintable(), 0, 0)
+
+    def _on_drag_end(self, source, drag, delete_data):
+        """Fin del drag."""
+        self._drag_cell = None
+
+    def _show_menu(self, cell, x: float, y: float):
+        """Arma y muestra el menú contextual de una celda."""
+        built = cell.build_context_menu()
+        if built is None:
+            return
+        menu, action_group = built
+        if self._popover is not None:
+            self._popover.popdown()
+
+        ok, cell_x, cell_y = self._list_view.translate_coordinates(cell, x, y)
+        if not ok:
+            cell_x, cell_y = x, y
+
+        popover = Gtk.PopoverMenu.new_from_model(menu)
+        popover.set_parent(cell)
+        popover.insert_action_group("file", action_group)
+        popover.set_has_arrow(False)
+
+        rect = Gdk.Rectangle()
+        rect.x = int(cell_x)
+        rect.y = int(cell_y)
+        rect.width = 1
+        rect.height = 1
+        popover.set_pointing_to(rect)
+
+        popover.connect("closed", self._on_menu_closed)
+        self._popover = popover
+        popover.popup()
+
+    def _on_menu_closed(self, popover: Gtk.PopoverMenu):
+        """Libera el menú (en idle: la acción elegida se activa después de closed)."""
+        GLib.idle_add(self._release_menu, popover)
+
+    def _release_menu(self, popover: Gtk.PopoverMenu) -> bool:
+        """Desvincula un menú cerrado de su celda."""
+        if popover.get_parent() is not None:
+            popover.unparent()
+        if self._popover is popover:
+            self._popover = None
+        return False
+
+
+def build_action_group(cell, path, actions: tuple[tuple[str, str], ...]) -> Gio.SimpleActionGroup:
+    """
+    Crea las acciones del menú de una celda.
+
+    Args:
+        cell: Celda que emite las señales
+        path: Path fijado al abrir el menú
+        actions: Pares (nombre de acción, señal a emitir con el path)
+    """
+    action_group = Gio.SimpleActionGroup()
+    for name, signal in actions:
+        action = Gio.SimpleAction.new(name, None)
+        action.connect("activate", lambda _action, _param, signal=signal: cell.emit(signal, path))
+        action_group.add_action(action)
+    return action_group
@@ -0,0 +1,195 @@
+"""
+search_jobs.py - Búsquedas en background con debounce y resultados en streaming
+
+Cada consulta se lanza después de una pausa en la escritura (debounce). La
+búsqueda corre en un worker y los resultados llegan a la UI en lotes a
+medida que aparecen. Una consulta nueva cancela la anterior: se descarta su
+timer y se corta su proceso (find/grep) o recorrido en curso, así nunca se
+acumulan búsquedas viejas.
+
+Autor: Homero Thompson del Lago del Terror
+"""
+
+import threading
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+
+import gi
+
+gi.require_version("GLib", "2.0")
+
+from gi.repository import GLib
+
+from ...clients import SearchHit
+
+try:
+    from loguru import logger
+except ImportError:
+    import logging
+
+    logger = logging.getLogger(__name__)
+
+# Milisegundos sin escribir antes de lanzar la búsqueda
+SEARCH_DEBOUNCE_MS = 200
+# Segundos máximos entre lotes de resultados enviados a la UI
+HITS_FLUSH_SECONDS = 0.05
+# Máximo de resultados por búsqueda
+MAX_SEARCH_HITS = 100
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="file-search")
+
+
+class CancelToken:
+    """Cancelación de una búsqueda, con callbacks (ej: matar el proceso)."""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._callbacks: list[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self):
+        """Cancela y ejecuta los callbacks registrados (una sola vez)."""
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def on_cancel(self, callback: Callable[[], None]):
+        """Registra un callback; si ya se canceló se ejecuta en el momento."""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+
+SearchSource = Callable[[CancelToken], Iterable[SearchHit]]
+
+
+class SearchJobManager:
+    """
+    Ejecuta como máximo una búsqueda a la vez.
+
+    Los callbacks se llaman en el main loop y solo para la búsqueda vigente:
+    on_start() al lanzarla, on_hits(hits) por cada lote y on_done(count) al
+    terminar.
+    """
+
+    def __init__(
+        self,
+        on_start: Callable[[], None],
+        on_hits: Callable[[list[SearchHit]], None],
+        on_done: Callable[[int], None],
+        debounce_ms: int = SEARCH_DEBOUNCE_MS,
+        limit: int = MAX_SEARCH_HITS,
+        timeout_add: Callable = GLib.timeout_add,
+        source_remove: Callable = GLib.source_remove,
+        dispatcher: Callable = GLib.idle_add,
+        submit: Callable = _executor.submit,
+    ):
+        self._on_start = on_start
+        self._on_hits = on_hits
+        self._on_done = on_done
+        self._debounce_ms = debounce_ms
+        self._limit = limit
+        self._timeout_add = timeout_add
+        self._source_remove = source_remove
+        self._dispatcher = dispatcher
+        self._submit = submit
+        self._timer_id: int | None = None
+        self._token: CancelToken | None = None
+
+    @property
+    def active(self) -> bool:
+        """True si hay una búsqueda esperando el debounce o en curso."""
+        return self._timer_id is not None or self._token is not None
+
+    def submit(self, source: SearchSource, immediate: bool = False):
+        """
+        Programa una búsqueda cancelando la anterior.
+
+        Args:
+            source: Genera los resultados; recibe el CancelToken
+            immediate: Lanzar sin esperar el debounce (ej: cambio de modo)
+        """
+        self.cancel()
+        if immediate:
+            self._start(source)
+        else:
+            self._timer_id = self._timeout_add(self._debounce_ms, self._on_debounced, source)
+
+    def cancel(self):
+        """Cancela la búsqueda pendiente o en curso."""
+        if self._timer_id is not None:
+            self._source_remove(self._timer_id)
+            self._timer_id = None
+        if self._token is not None:
+            self._token.cancel()
+            self._token = None
+
+    def _on_debounced(self, source: SearchSource) -> bool:
+        """Fin del debounce: lanzar la búsqueda."""
+        self._timer_id = None
+        self._start(source)
+        return False
+
+    def _start(self, source: SearchSource):
+        """Lanza la búsqueda en un worker."""
+        token = CancelToken()
+        self._token = token
+        self._on_start()
+        self._submit(self._run, source, token)
+
+    def _run(self, source: SearchSource, token: CancelToken):
+        """Worker: recorre los resultados y los envía en lotes."""
+        batch: list[SearchHit] = []
+        count = 0
+        # El primer resultado se envía enseguida, el resto en lotes
+        last_flush = float("-inf")
+        hits = None
+        try:
+            hits = iter(source(token))
+            for hit in hits:
+                if token.cancelled:
+                    return
+                batch.append(hit)
+                count += 1
+                if count >= self._limit:
+                    break
+                if time.monotonic() - last_flush >= HITS_FLUSH_SECONDS:
+                    self._dispatcher(self._deliver_hits, token, batch)
+                    batch = []
+                    last_flush = time.monotonic()
+        except Exception as e:
+            logger.error(f"Search failed: {e}")
+        finally:
+            # Cerrar el generador corta su proceso/recorrido (ej: al llegar al límite)
+            close = getattr(hits, "close", None)  # None si no es un generador
+            if close is not None:
+                close()
+        if token.cancelled:
+            return
+        if batch:
+            self._dispatcher(self._deliver_hits, token, batch)
+        self._dispatcher(self._deliver_done, token, count)
+
+    def _deliver_hits(self, token: CancelToken, hits: list[SearchHit]) -> bool:
+        """Main loop: entrega un lote si la búsqueda sigue vigente."""
+        if token is self._token and not token.cancelled:
+            self._on_hits(hits)
+        return False
+
+    def _deliver_done(self, token: CancelToken, count: int) -> bool:
+        """Main loop: fin de la búsqueda vigente."""
+        if token is self._token and not token.cancelled:
+            self._token = None
+            self._on_done(count)
+        return False
@@ -0,0 +1,39 @@
+"""
+tree_factory.py - Factory de celdas del ListView del árbol de archivos
+
+Autor: Homero Thompson del Lago del Terror
+"""
+
+from collections.abc import Callable
+
+import gi
+
+gi.require_version("Gtk", "4.0")
+
+from gi.repository import Gtk
+
+
+def create_tree_factory(create_cell: Callable[[], Gtk.Widget]) -> Gtk.SignalListItemFactory:
+    """
+    Crea el factory del ListView del árbol.
+
+    Las celdas se crean una vez por fila visible (setup) y se reutilizan
+    cambiando el item asociado (bind/unbind). Cada celda debe implementar
+    bind(item, list_row) y unbind().
+    """
+    factory = Gtk.SignalListItemFactory()
+    factory.connect("setup", lambda _factory, list_item: list_item.set_child(create_cell()))
+    factory.connect("bind", _on_bind)
+    factory.connect("unbind", _on_unbind)
+    return factory
+
+
+def _on_bind(_factory, list_item: Gtk.ListItem):
+    """Asocia la celda con la fila del árbol."""
+    list_row = list_item.get_item()
+    list_item.get_child().bind(list_row.get_item(), list_row)
+
+
+def _on_unbind(_factory, list_item: Gtk.ListItem):
+    """Libera la celda para reutilizarla."""
+    list_item.get_child().unbind()
@@ -0,0 +1,104 @@
+"""
+tree_items.py - Entradas del árbol de archivos y diff de listados
+
+FileItem es el objeto que guarda cada Gio.ListStore del árbol. Las funciones
+de orden e identidad definen cómo se ordena un directorio y qué entradas se
+conservan al aplicar un listado nuevo con el menor número de splices.
+
+Autor: Homero Thompson del Lago del Terror
+"""
+
+import difflib
+from collections.abc import Hashable, Iterable, Sequence
+
+import gi
+
+gi.require_version("GObject", "2.0")
+
+from gi.repository import GObject
+
+from .local.loader import entry_is_dir
+
+
+class FileItem(GObject.Object):
+    """
+    Entrada del árbol (archivo o directorio, local o remoto).
+
+    is_placeholder marca la fila "Loading..." de un directorio cuyo listado
+    todavía no llegó.
+    """
+
+    __gtype_name__ = "FileTreeItem"
+
+    def __init__(
+        self,
+        path: str,
+        name: str,
+        is_dir: bool,
+        is_hidden: bool = False,
+        size: int | None = None,
+        mtime: float | None = None,
+        is_placeholder: bool = False,
+    ):
+        super().__init__()
+        self.path = path
+        self.name = name
+        self.is_dir = is_dir
+        self.is_hidden = is_hidden
+        self.size = size
+        self.mtime = mtime
+        self.is_placeholder = is_placeholder
+
+
+def loading_item(parent: str) -> FileItem:
+    """Fila de carga de un directorio (el path no puede ser de una entrada real)."""
+    return FileItem(parent.rstrip("/") + "/", "Loading...", False, is_placeholder=True)
+
+
+def items_from_dir_entries(entries: Iterable) -> list[FileItem]:
+    """Crea items desde os.DirEntry (usa el tipo cacheado por scandir)."""
+    return [FileItem(entry.path, entry.name, entry_is_dir(entry)) for entry in entries]
+
+
+def items_from_remote_entries(parent: str, entries: Iterable) -> list[FileItem]:
+    """Crea items desde RemoteEntry de un directorio remoto."""
+    prefix = parent.rstrip("/")
+    return [
+        FileItem(
+            f"{prefix}/{entry.name}",
+            entry.name,
+            entry.is_dir,
+            entry.is_hidden,
+            size=entry.size,
+            mtime=entry.mtime,
+        )
+        for entry in entries
+    ]
+
+
+def plan_splices(
+    old_keys: Sequence[Hashable], new_keys: Sequence[Hashable]
+) -> list[tuple[int, int, int, int]]:
+    """
+    Calcula los cambios mínimos para pasar de old_keys a new_keys.
+
+    Returns:
+        Tuplas (i1, i2, j1, j2): reemplazar old[i1:i2] por new[j1:j2]. Van en
+        orden inverso para poder aplicarlas sin recalcular posiciones.
+    """
+    matcher = difflib.SequenceMatcher(None, old_keys, new_keys, autojunk=False)
+    return [
+        (i1, i2, j1, j2)
+        for tag, i1, i2, j1, j2 in reversed(matcher.get_opcodes())
+        if tag != "equal"
+    ]
+
+
+def item_key(item: FileItem) -> tuple[str, bool]:
+    """Identidad de un item: cambiar de tipo cuenta como otra entrada."""
+    return (item.path, item.is_dir)
+
+
+def sort_key(item: FileItem) -> tuple[bool, str]:
+    """Orden del árbol: directorios primero, luego por nombre."""
+    return (not item.is_dir, item.name.lower())
@@ -0,0 +1,238 @@
+"""
+tree_model.py - Modelo virtualizado del árbol de archivos
+
+El árbol se arma con un Gio.ListStore por directorio cargado dentro de un
+Gtk.TreeListModel, y se muestra con un Gtk.ListView: solo existen widgets
+para las filas visibles y se reciclan al hacer scroll. Los hijos de un
+directorio se cargan recién cuando se expande.
+
+Autor: Homero Thompson del Lago del Terror
+"""
+
+import bisect
+import posixpath
+from collections.abc import Callable
+
+import gi
+
+gi.require_version("Gtk", "4.0")
+
+from gi.repository import Gio, Gtk
+
+from .tree_items import FileItem, item_key, plan_splices, sort_key
+
+
+class FileTreeModel:
+    """
+    Árbol de FileItem sobre Gtk.TreeListModel.
+
+    Mantiene el Gio.ListStore de cada directorio cargado (root y expandidos)
+    indexado por path, para poder actualizar un directorio puntual. Cada
+    store está ordenado con sort_key.
+    """
+
+    def __init__(self, load_children: Callable[[str], list[FileItem]]):
+        """
+        Args:
+            load_children: Retorna los items de un directorio al expandirlo
+                (puede retornar [] y agregarlos después con insert_sorted)
+        """
+        self._load_children = load_children
+        self._root = Gio.ListStore(item_type=FileItem)
+        self.stores: dict[str, Gio.ListStore] = {}
+        # Claves de orden de cada store, en paralelo (para insertar con bisect)
+        self._keys: dict[str, list[tuple[bool, str]]] = {}
+        # No usar TreeListRow.is_expandable() ni Gtk.TreeExpander: llaman a
+        # create_func para cada fila visible (un listado por directorio)
+        self.tree = Gtk.TreeListModel.new(self._root, False, False, self._create_child_model)
+        self.selection = Gtk.NoSelection(model=self.tree)
+
+    def set_root(self, path: str, items: list[FileItem], expanded: set[str]):
+        """
+        Reemplaza el contenido del árbol y re-expande los directorios.
+
+        Args:
+            path: Directorio raíz
+            items: Entradas del directorio raíz (pueden llegar después con
+                insert_sorted)
+            expanded: Paths de los directorios que deben quedar expandidos
+        """
+        self._root.remove_all()
+        self.stores = {path: self._root}
+        self._keys = {path: []}
+        self.insert_sorted(path, items, expanded)
+
+    def clear(self):
+        """Vacía el árbol."""
+        self.stores = {}
+        self._keys = {}
+        self._root.remove_all()
+
+    def insert_sorted(
+        self, path: str, items: list[FileItem], expanded: set[str] | None = None
+    ) -> bool:
+        """
+        Agrega entradas a un directorio cargado en su posición ordenada.
+
+        Las entradas que caen en la misma posición se insertan con un solo
+        splice. Los directorios nuevos incluidos en expanded se expanden.
+
+        Returns:
+            False si el directorio no está cargado en el árbol
+        """
+        store = self.stores.get(path)
+        if store is None:
+            return False
+        if not items:
+            return True
+
+        keys = self._keys[path]
+        batch = sorted(items, key=sort_key)
+        batch_keys = [sort_key(item) for item in batch]
+        # Posiciones sobre el store original; agrupar las iguales
+        groups: list[tuple[int, int, int]] = []
+        for index, key in enumerate(batch_keys):
+            position = bisect.bisect_right(keys, key)
+            if groups and groups[-1][0] == position:
+                groups[-1] = (position, groups[-1][1], index + 1)
+            else:
+                groups.append((position, index, index + 1))
+        # De atrás hacia adelante: las posiciones anteriores siguen válidas
+        for position, start, end in reversed(groups):
+            keys[position:position] = batch_keys[start:end]
+            store.splice(position, 0, batch[start:end])
+
+        if expanded:
+            self._expand_items(path, batch, expanded)
+        return True
+
+    def fill_directory(
+        self, path: str, items: list[FileItem], expanded: set[str] | None = None
+    ) -> bool:
+        """
+        Reemplaza el contenido de un directorio (ej: su fila de carga).
+
+        Returns:
+            False si el directorio no está cargado en el árbol
+        """
+        store = self.stores.get(path)
+        if store is None:
+            return False
+        store.remove_all()
+        self._keys[path] = []
+        return self.insert_sorted(path, items, expanded)
+
+    def update_directory(self, path: str, items: list[FileItem]) -> bool:
+        """
+        Actualiza las filas de un directorio cargado con un listado nuevo.
+
+        Solo se insertan/eliminan las entradas que cambiaron; las demás
+        conservan su objeto, así los subdirectorios expandidos siguen
+        expandidos y no se recargan.
+
+        Returns:
+            False si el directorio no está cargado en el árbol
+        """
+        store = self.stores.get(path)
+        if store is None:
+            return False
+
+        items = sorted(items, key=sort_key)
+        old_items = list(store)
+        old_keys = [item_key(item) for item in old_items]
+        new_keys = [item_key(item) for item in items]
+        for i1, i2, j1, j2 in plan_splices(old_keys, new_keys):
+            for removed in old_items[i1:i2]:
+                if removed.is_dir:
+                    self._forget_subtree(removed.path)
+            store.splice(i1, i2 - i1, items[j1:j2])
+        self._keys[path] = [sort_key(item) for item in items]
+
+        # Metadatos de las entradas conservadas (tamaño, fecha)
+        fresh = dict(zip(new_keys, items, strict=True))
+        for key, item in zip(old_keys, old_items, strict=True):
+            new_item = fresh.get(key)
+            if new_item is not None and new_item is not item:
+                item.size = new_item.size
+                item.mtime = new_item.mtime
+        return True
+
+    def find_row(self, path: str) -> Gtk.TreeListRow | None:
+        """Retorna la fila de un path si está visible (sus ancestros expandidos)."""
+        parent_path = posixpath.dirname(path.rstrip("/")) or "/"
+        parent = self._parent_node(parent_path)
+        if parent is None:
+            return None
+        store = self.stores[parent_path]
+        for position in range(store.get_n_items()):
+            if store.get_item(position).path == path:
+                return parent.get_child_row(position)
+        return None
+
+    def set_expanded(self, list_row: Gtk.TreeListRow, expanded: bool):
+        """
+        Expande o colapsa una fila.
+
+        Expandir inserta solo los hijos de ese directorio después de su fila;
+        colapsar elimina solo sus descendientes.
+        """
+        list_row.set_expanded(expanded)
+        if not expanded:
+            self._forget_subtree(list_row.get_item().path)
+
+    def _parent_node(self, path: str):
+        """TreeListModel (root) o TreeListRow cuyos hijos son el store de path."""
+        store = self.stores.get(path)
+        if store is None:
+            return None
+        if store is self._root:
+            return self.tree
+        return self.find_row(path)
+
+    def _position_of(self, path: str, item: FileItem) -> int | None:
+        """Posición de un item en el store de su directorio (búsqueda binaria)."""
+        store = self.stores[path]
+        keys = self._keys[path]
+        position = bisect.bisect_left(keys, sort_key(item))
+        while position < len(keys) and keys[position] == sort_key(item):
+            if store.get_item(position) is item:
+                return position
+            position += 1
+        return None
+
+    def _expand_items(self, path: str, items: list[FileItem], expanded: set[str]):
+        """Expande los directorios de items (hijos de path) que estén en expanded."""
+        targets = [item for item in items if item.is_dir and item.path in expanded]
+        if not targets:
+            return
+        parent = self._parent_node(path)
+        if parent is None:
+            return
+        for item in targets:
+            position = self._position_of(path, item)
+            row = parent.get_child_row(position) if position is not None else None
+            if row is None or row.get_expanded():
+                continue
+            row.set_expanded(True)
+            # Hijos ya cargados (ej: listados remotos obtenidos por adelantado)
+            children = self.stores.get(item.path)
+            if children is not None and children.get_n_items():
+                self._expand_items(item.path, list(children), expanded)
+
+    def _forget_subtree(self, path: str):
+        """Descarta los stores de un directorio colapsado y sus subdirectorios."""
+        prefix = path.rstrip("/") + "/"
+        for key in [k for k in self.stores if k == path or k.startswith(prefix)]:
+            del self.stores[key]
+            self._keys.pop(key, None)
+
+    def _create_child_model(self, item: FileItem) -> Gio.ListModel | None:
+        """create_func del TreeListModel: se llama al expandir un directorio."""
+        if not item.is_dir:
+            return None
+        store = Gio.ListStore(item_type=FileItem)
+        # Registrar antes de cargar: los hijos pueden llegar con insert_sorted
+        self.stores[item.path] = store
+        self._keys[item.path] = []
+        self.insert_sorted(item.path, self._load_children(item.path))
+        return store
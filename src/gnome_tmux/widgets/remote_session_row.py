@@ -9,9 +9,10 @@ import gi
 gi.require_version("Gtk", "4.0")
 gi.require_version("Adw", "1")
 
-from gi.repository import Adw, GObject, Gtk
+from gi.repository import Adw, GLib, GObject, Gtk
 
 from ..clients import Session, Window
+from .session_list import reconcile_window_rows
 
 
 class RemoteWindowRow(Adw.ActionRow):
@@ -36,14 +37,7 @@ class RemoteWindowRow(Adw.ActionRow):
         self.user = user
         self.port = port
 
-        # Título: índice y nombre (resaltado si está activa)
-        title = f"{window.index}: {window.name}"
-        if window.active:
-            self.set_title(f"<b>{title}</b>")
-            self.set_use_markup(True)
-            self.add_css_class("accent")
-        else:
-            self.set_title(title)
+        self._update_title()
         self.set_activatable(True)
         self.set_title_lines(1)
         self.set_subtitle_lines(0)
@@ -51,6 +45,24 @@ class RemoteWindowRow(Adw.ActionRow):
         # Conectar activación
         self.connect("activated", self._on_activated)
 
+    def _update_title(self):
+        """Título: índice y nombre (resaltado si está activa)."""
+        title = f"{self.window.index}: {self.window.name}"
+        # El nombre lo elige el usuario: escaparlo y usar markup solo si está activa
+        if self.window.active:
+            self.set_use_markup(True)
+            self.set_title(f"<b>{GLib.markup_escape_text(title)}</b>")
+            self.add_css_class("accent")
+        else:
+            self.set_use_markup(False)
+            self.set_title(title)
+            self.remove_css_class("accent")
+
+    def update_window(self, window: Window):
+        """Actualiza los datos de la ventana sin recrear la fila."""
+        self.window = window
+        self._update_title()
+
     def _on_activated(self, row):
         """Emite señal cuando se selecciona la ventana."""
         self.emit(
@@ -105,26 +117,18 @@ class RemoteSessionRow(Adw.ExpanderRow):
         self.port = port
         self.connected = connected
 
-        # Título: nombre de sesión @ host
+        # Título: nombre de sesión @ host (el nombre no es markup)
         display_host = host if port == "22" else f"{host}:{port}"
+        self.set_use_markup(False)
         self.set_title(session.name)
         self.set_subtitle(f"{user}@{display_host}")
         self.set_title_lines(1)
         self.set_subtitle_lines(1)
 
         # Icono de red (verde si conectado/attached)
-        if session.attached:
-            icon = Gtk.Image.new_from_icon_name("network-server-symbolic")
-            icon.add_css_class("success")
-            icon.set_tooltip_text("Session attached")
-        else:
-            icon = Gtk.Image.new_from_icon_name("network-server-symbolic")
-            if connected:
-                icon.set_tooltip_text("Remote session")
-            else:
-                icon.add_css_class("dim-label")
-                icon.set_tooltip_text("Disconnected")
-        self.add_prefix(icon)
+        self._icon = Gtk.Image.new_from_icon_name("network-server-symbolic")
+        self._update_icon()
+        self.add_prefix(self._icon)
 
         # Box compacto para botones de acción (igual que SessionRow local)
         actions_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=0)
@@ -159,10 +163,49 @@ class RemoteSessionRow(Adw.ExpanderRow):
         self.add_suffix(actions_box)
 
         # Agregar ventanas como filas hijas
-        for window in session.windows:
-            window_row = RemoteWindowRow(session.name, window, host, user, port)
-            window_row.connect("window-selected", self._on_window_selected)
-            self.add_row(window_row)
+        self._window_rows: list[RemoteWindowRow] = reconcile_window_rows(
+            self, [], session.windows, self._create_window_row
+        )
+
+    def _create_window_row(self, window: Window) -> RemoteWindowRow:
+        """Crea la fila de una ventana remota y conecta sus señales."""
+        window_row = RemoteWindowRow(self.session.name, window, self.host, self.user, self.port)
+        window_row.connect("window-selected", self._on_window_selected)
+        return window_row
+
+    def _update_icon(self):
+        """Actualiza el icono según si la sesión está attached."""
+        self._icon.remove_css_class("success")
+        self._icon.remove_css_class("dim-label")
+        if self.session.attached:
+            self._icon.add_css_class("success")
+            self._icon.set_tooltip_text("Session attached")
+        elif self.connected:
+            self._icon.set_tooltip_text("Remote session")
+        else:
+            self._icon.add_css_class("dim-label")
+            self._icon.set_tooltip_text("Disconnected")
+
+    def update_session(self, session: Session):
+        """
+        Actualiza la fila con datos nuevos de la misma sesión.
+
+        Solo toca los widgets que cambiaron; sin cambios no hace nada.
+        """
+        if session == self.session:
+            return
+        old = self.session
+        self.session = session
+        if session.name != old.name:
+            self.set_title(session.name)
+            for window_row in self._window_rows:
+                window_row.session_name = session.name
+        if session.attached != old.attached:
+            self._update_icon()
+        if session.windows != old.windows:
+            self._window_rows = reconcile_window_rows(
+                self, self._window_rows, session.windows, self._create_window_row
+            )
 
     def _on_new_window_clicked(self, button: Gtk.Button):
         """Emite señal para crear nueva ventana."""
@@ -0,0 +1,105 @@
+"""
+session_list.py - Reconciliación incremental de filas de sesiones y ventanas
+
+En cada refresh, las filas existentes se emparejan con los datos nuevos por
+identidad estable (session_id/window_id de tmux, más el host en remotas).
+Solo se crean, eliminan o actualizan las filas que cambiaron, así un refresh
+sin cambios no toca widgets y las filas conservan su estado (expandidas,
+foco, drag).
+
+Autor: Homero Thompson del Lago del Terror
+"""
+
+from collections.abc import Callable, Hashable, Sequence
+
+from ..clients import Session, Window
+
+
+def session_key(session: Session) -> str:
+    """Identidad estable de una sesión (session_id; nombre si no hay id)."""
+    return session.session_id or f"name:{session.name}"
+
+
+def window_key(window: Window) -> Hashable:
+    """Identidad estable de una ventana (window_id; índice si no hay id)."""
+    return window.window_id or window.index
+
+
+def reconcile_session_rows(
+    list_box,
+    rows: dict,
+    items: Sequence[tuple[Hashable, Session]],
+    position: int,
+    create_row: Callable,
+):
+    """
+    Sincroniza un bloque contiguo de filas de un Gtk.ListBox con sesiones.
+
+    Args:
+        list_box: ListBox que contiene las filas
+        rows: Filas actuales del bloque por clave (se actualiza en el lugar)
+        items: Pares (clave, sesión) en el orden deseado
+        position: Índice del ListBox donde empieza el bloque
+        create_row: Crea una fila para una sesión nueva, create_row(clave, sesión)
+    """
+    new_keys = {key for key, _ in items}
+    for key in [key for key in rows if key not in new_keys]:
+        list_box.remove(rows.pop(key))
+
+    for offset, (key, session) in enumerate(items):
+        row = rows.get(key)
+        index = position + offset
+        if row is None:
+            row = create_row(key, session)
+            rows[key] = row
+            list_box.insert(row, index)
+            continue
+
+        row.update_session(session)
+        if row.get_index() != index:
+            # Reordenar mueve el mismo widget (conserva su estado)
+            list_box.remove(row)
+            list_box.insert(row, index)
+
+
+def reconcile_window_rows(
+    expander, rows: list, windows: Sequence[Window], create_row: Callable
+) -> list:
+    """
+    Sincroniza las filas hijas de un Adw.ExpanderRow con sus ventanas.
+
+    Args:
+        expander: ExpanderRow padre
+        rows: Filas hijas actuales, en orden
+        windows: Ventanas nuevas, en orden
+        create_row: Crea una fila para una ventana nueva
+
+    Returns:
+        Lista de filas hijas en el orden de windows
+    """
+    existing = {window_key(row.window): row for row in rows}
+    new_rows = []
+    for window in windows:
+        row = existing.pop(window_key(window), None)
+        if row is None:
+            row = create_row(window)
+        elif row.window != window:
+            row.update_window(window)
+        new_rows.append(row)
+
+    for row in existing.values():
+        expander.remove(row)
+
+    # ExpanderRow solo permite agregar al final: si las filas conservadas ya
+    # están en orden y las nuevas van al final, basta con agregar esas
+    old_ids = {id(row) for row in rows}
+    removed_ids = {id(row) for row in existing.values()}
+    kept = [row for row in rows if id(row) not in removed_ids]
+    in_order = new_rows[: len(kept)] == kept
+    for row in new_rows:
+        if id(row) not in old_ids:
+            expander.add_row(row)
+        elif not in_order:
+            expander.remove(row)
+            expander.add_row(row)
+    return new_rows
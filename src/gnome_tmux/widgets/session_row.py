@@ -10,139 +10,11 @@ gi.require_version("Gtk", "4.0")
 gi.require_version("Gdk", "4.0")
 gi.require_version("Adw", "1")
 
-from gi.repository import Adw, Gdk, GObject, Gtk
+from gi.repository import Adw, GObject, Gtk
 
 from ..clients import Session, Window
-
-
-class WindowRow(Adw.ActionRow):
-    """Fila que representa una ventana de tmux."""
-
-    __gtype_name__ = "WindowRow"
-
-    __gsignals__ = {
-        "window-selected": (GObject.SignalFlags.RUN_FIRST, None, (str, int)),
-        "rename-requested": (GObject.SignalFlags.RUN_FIRST, None, (str, int, str)),
-        "exit-requested": (GObject.SignalFlags.RUN_FIRST, None, (str, int)),
-        "swap-requested": (GObject.SignalFlags.RUN_FIRST, None, (str, int, int)),
-    }
-
-    def __init__(self, session_name: str, window: Window):
-        super().__init__()
-
-        self.session_name = session_name
-        self.window = window
-
-        # Título: índice y nombre (resaltado si está activa)
-        title = f"{window.index}: {window.name}"
-        if window.active:
-            self.set_title(f"<b>{title}</b>")
-            self.set_use_markup(True)
-            self.add_css_class("accent")
-        else:
-            self.set_title(title)
-        self.set_activatable(True)
-        self.set_title_lines(1)
-        self.set_subtitle_lines(0)
-
-        # Icono de drag (al inicio)
-        drag_icon = Gtk.Image.new_from_icon_name("list-drag-handle-symbolic")
-        drag_icon.set_opacity(0.5)
-        self.add_prefix(drag_icon)
-
-        # Botón de editar nombre
-        edit_button = Gtk.Button()
-        edit_button.set_icon_name("document-edit-symbolic")
-        edit_button.set_valign(Gtk.Align.CENTER)
-        edit_button.add_css_class("flat")
-        edit_button.set_tooltip_text("Rename window")
-        edit_button.connect("clicked", self._on_edit_clicked)
-        self.add_suffix(edit_button)
-
-        # Botón de cerrar ventana (exit limpio)
-        exit_button = Gtk.Button()
-        exit_button.set_icon_name("window-close-symbolic")
-        exit_button.set_valign(Gtk.Align.CENTER)
-        exit_button.add_css_class("flat")
-        exit_button.set_tooltip_text("Exit window")
-        exit_button.connect("clicked", self._on_exit_clicked)
-        self.add_suffix(exit_button)
-
-        # Conectar activación
-        self.connect("activated", self._on_activated)
-
-        # Drag source
-        drag_source = Gtk.DragSource()
-        drag_source.set_actions(Gdk.DragAction.MOVE)
-        drag_source.connect("prepare", self._on_drag_prepare)
-        drag_source.connect("drag-begin", self._on_drag_begin)
-        self.add_controller(drag_source)
-
-        # Drop target
-        drop_target = Gtk.DropTarget.new(GObject.TYPE_STRING, Gdk.DragAction.MOVE)
-        drop_target.connect("drop", self._on_drop)
-        drop_target.connect("enter", self._on_drag_enter)
-        drop_target.connect("leave", self._on_drag_leave)
-        self.add_controller(drop_target)
-
-    def _on_drag_prepare(self, source, x, y):
-        """Prepara datos para el drag."""
-        # Formato: session_name:window_index
-        data = f"{self.session_name}:{self.window.index}"
-        return Gdk.ContentProvider.new_for_value(data)
-
-    def _on_drag_begin(self, source, drag):
-        """Configura el aspecto visual del drag."""
-        self.add_css_class("dim-label")
-
-    def _on_drop(self, target, value, x, y) -> bool:
-        """Maneja el drop de otra ventana."""
-        self.remove_css_class("suggested-action")
-        if not isinstance(value, str) or ":" not in value:
-            return False
-
-        parts = value.split(":")
-        if len(parts) != 2:
-            return False
-
-        src_session = parts[0]
-        try:
-            src_index = int(parts[1])
-        except ValueError:
-            return False
-
-        # Solo permitir swap dentro de la misma sesión
-        if src_session != self.session_name:
-            return False
-
-        # No hacer nada si es la misma ventana
-        if src_index == self.window.index:
-            return False
-
-        # Emitir señal de swap
-        self.emit("swap-requested", self.session_name, src_index, self.window.index)
-        return True
-
-    def _on_drag_enter(self, target, x, y):
-        """Resalta cuando hay un drag sobre esta fila."""
-        self.add_css_class("suggested-action")
-        return Gdk.DragAction.MOVE
-
-    def _on_drag_leave(self, target):
-        """Quita el resaltado cuando sale el drag."""
-        self.remove_css_class("suggested-action")
-
-    def _on_activated(self, row):
-        """Emite señal cuando se selecciona la ventana."""
-        self.emit("window-selected", self.session_name, self.window.index)
-
-    def _on_edit_clicked(self, button: Gtk.Button):
-        """Emite señal para renombrar."""
-        self.emit("rename-requested", self.session_name, self.window.index, self.window.name)
-
-    def _on_exit_clicked(self, button: Gtk.Button):
-        """Emite señal para cerrar ventana."""
-        self.emit("exit-requested", self.session_name, self.window.index)
+from .session_list import reconcile_window_rows
+from .window_row import WindowRow
 
 
 class SessionRow(Adw.ExpanderRow):
@@ -165,19 +37,16 @@ class SessionRow(Adw.ExpanderRow):
 
         self.session = session
 
-        # Título (sin subtítulo para ser más compacto)
+        # Título (sin subtítulo para ser más compacto); el nombre no es markup
+        self.set_use_markup(False)
         self.set_title(session.name)
         self.set_title_lines(1)
         self.set_subtitle_lines(0)
 
         # Icono de sesión (cambia si está activa)
-        if session.attached:
-            icon = Gtk.Image.new_from_icon_name("media-playback-start-symbolic")
-            icon.add_css_class("success")
-            icon.set_tooltip_text("Session attached")
-        else:
-            icon = Gtk.Image.new_from_icon_name("utilities-terminal-symbolic")
-        self.add_prefix(icon)
+        self._icon = Gtk.Image()
+        self._update_icon()
+        self.add_prefix(self._icon)
 
         # Box compacto para botones de acción
         actions_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=0)
@@ -212,13 +81,70 @@ class SessionRow(Adw.ExpanderRow):
         self.add_suffix(actions_box)
 
         # Agregar ventanas como filas hijas
-        for window in session.windows:
-            window_row = WindowRow(session.name, window)
-            window_row.connect("window-selected", self._on_window_selected)
-            window_row.connect("rename-requested", self._on_window_rename_requested)
-            window_row.connect("exit-requested", self._on_window_exit_requested)
-            window_row.connect("swap-requested", self._on_window_swap_requested)
-            self.add_row(window_row)
+        self._window_rows: list[WindowRow] = reconcile_window_rows(
+            self, [], session.windows, self._create_window_row
+        )
+
+    def _create_window_row(self, window: Window) -> WindowRow:
+        """Crea la fila de una ventana y conecta sus señales."""
+        window_row = WindowRow(self.session.name, window)
+        window_row.connect("window-selected", self._on_window_selected)
+        window_row.connect("rename-requested", self._on_window_rename_requested)
+        window_row.connect("exit-requested", self._on_window_exit_requested)
+        window_row.connect("swap-requested", self._on_window_swap_requested)
+        return window_row
+
+    def _update_icon(self):
+        """Actualiza el icono según si la sesión está attached."""
+        if self.session.attached:
+            self._icon.set_from_icon_name("media-playback-start-symbolic")
+            self._icon.add_css_class("success")
+            self._icon.set_tooltip_text("Session attached")
+        else:
+            self._icon.set_from_icon_name("utilities-terminal-symbolic")
+            self._icon.remove_css_class("success")
+            self._icon.set_tooltip_text(None)
+
+    def update_session(self, session: Session):
+        """
+        Actualiza la fila con datos nuevos de la misma sesión.
+
+        Solo toca los widgets que cambiaron; sin cambios no hace nada.
+        """
+        if session == self.session:
+            return
+        old = self.session
+        self.session = session
+        if session.name != old.name:
+            self.set_title(session.name)
+            for window_row in self._window_rows:
+                window_row.session_name = session.name
+        if session.attached != old.attached:
+            self._update_icon()
+        if session.windows != old.windows:
+            self._window_rows = reconcile_window_rows(
+                self, self._window_rows, session.windows, self._create_window_row
+            )
+
+    def set_session_name(self, name: str):
+        """Actualiza el nombre de la sesión (ej: por %session-renamed)."""
+        self.session.name = name
+        self.set_title(name)
+        for window_row in self._window_rows:
+            window_row.session_name = name
+
+    def set_window_name(self, window_id: str, name: str) -> bool:
+        """
+        Actualiza el nombre de una ventana por su id de tmux (ej: "@3").
+
+        Returns:
+            True si la ventana pertenece a esta sesión
+        """
+        for window_row in self._window_rows:
+            if window_row.window.window_id == window_id:
+                window_row.set_window_name(name)
+                return True
+        return False
 
     def _on_new_window_clicked(self, button: Gtk.Button):
         """Emite señal para crear nueva ventana."""
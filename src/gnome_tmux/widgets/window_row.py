@@ -0,0 +1,161 @@
+"""
+window_row.py - Fila de una ventana de tmux dentro de una sesión
+
+Autor: Homero Thompson del Lago del Terror
+"""
+
+import gi
+
+gi.require_version("Gtk", "4.0")
+gi.require_version("Gdk", "4.0")
+gi.require_version("Adw", "1")
+
+from gi.repository import Adw, Gdk, GLib, GObject, Gtk
+
+from ..clients import Window
+
+
+class WindowRow(Adw.ActionRow):
+    """Fila que representa una ventana de tmux."""
+
+    __gtype_name__ = "WindowRow"
+
+    __gsignals__ = {
+        "window-selected": (GObject.SignalFlags.RUN_FIRST, None, (str, int)),
+        "rename-requested": (GObject.SignalFlags.RUN_FIRST, None, (str, int, str)),
+        "exit-requested": (GObject.SignalFlags.RUN_FIRST, None, (str, int)),
+        "swap-requested": (GObject.SignalFlags.RUN_FIRST, None, (str, int, int)),
+    }
+
+    def __init__(self, session_name: str, window: Window):
+        super().__init__()
+
+        self.session_name = session_name
+        self.window = window
+
+        self._update_title()
+        self.set_activatable(True)
+        self.set_title_lines(1)
+        self.set_subtitle_lines(0)
+
+        # Icono de drag (al inicio)
+        drag_icon = Gtk.Image.new_from_icon_name("list-drag-handle-symbolic")
+        drag_icon.set_opacity(0.5)
+        self.add_prefix(drag_icon)
+
+        # Botón de editar nombre
+        edit_button = Gtk.Button()
+        edit_button.set_icon_name("document-edit-symbolic")
+        edit_button.set_valign(Gtk.Align.CENTER)
+        edit_button.add_css_class("flat")
+        edit_button.set_tooltip_text("Rename window")
+        edit_button.connect("clicked", self._on_edit_clicked)
+        self.add_suffix(edit_button)
+
+        # Botón de cerrar ventana (exit limpio)
+        exit_button = Gtk.Button()
+        exit_button.set_icon_name("window-close-symbolic")
+        exit_button.set_valign(Gtk.Align.CENTER)
+        exit_button.add_css_class("flat")
+        exit_button.set_tooltip_text("Exit window")
+        exit_button.connect("clicked", self._on_exit_clicked)
+        self.add_suffix(exit_button)
+
+        # Conectar activación
+        self.connect("activated", self._on_activated)
+
+        # Drag source
+        drag_source = Gtk.DragSource()
+        drag_source.set_actions(Gdk.DragAction.MOVE)
+        drag_source.connect("prepare", self._on_drag_prepare)
+        drag_source.connect("drag-begin", self._on_drag_begin)
+        self.add_controller(drag_source)
+
+        # Drop target
+        drop_target = Gtk.DropTarget.new(GObject.TYPE_STRING, Gdk.DragAction.MOVE)
+        drop_target.connect("drop", self._on_drop)
+        drop_target.connect("enter", self._on_drag_enter)
+        drop_target.connect("leave", self._on_drag_leave)
+        self.add_controller(drop_target)
+
+    def _update_title(self):
+        """Título: índice y nombre (resaltado si está activa)."""
+        title = f"{self.window.index}: {self.window.name}"
+        # El nombre lo elige el usuario: escaparlo y usar markup solo si está activa
+        if self.window.active:
+            self.set_use_markup(True)
+            self.set_title(f"<b>{GLib.markup_escape_text(title)}</b>")
+            self.add_css_class("accent")
+        else:
+            self.set_use_markup(False)
+            self.set_title(title)
+            self.remove_css_class("accent")
+
+    def set_window_name(self, name: str):
+        """Actualiza el nombre de la ventana sin recrear la fila."""
+        self.window.name = name
+        self._update_title()
+
+    def update_window(self, window: Window):
+        """Actualiza los datos de la ventana sin recrear la fila."""
+        self.window = window
+        self._update_title()
+
+    def _on_drag_prepare(self, source, x, y):
+        """Prepara datos para el drag."""
+        # Formato: session_name:window_index
+        data = f"{self.session_name}:{self.window.index}"
+        return Gdk.ContentProvider.new_for_value(data)
+
+    def _on_drag_begin(self, source, drag):
+        """Configura el aspecto visual del drag."""
+        self.add_css_class("dim-label")
+
+    def _on_drop(self, target, value, x, y) -> bool:
+        """Maneja el drop de otra ventana."""
+        self.remove_css_class("suggested-action")
+        if not isinstance(value, str) or ":" not in value:
+            return False
+
+        parts = value.split(":")
+        if len(parts) != 2:
+            return False
+
+        src_session = parts[0]
+        try:
+            src_index = int(parts[1])
+        except ValueError:
+            return False
+
+        # Solo permitir swap dentro de la misma sesión
+        if src_session != self.session_name:
+            return False
+
+        # No hacer nada si es la misma ventana
+        if src_index == self.window.index:
+            return False
+
+        # Emitir señal de swap
+        self.emit("swap-requested", self.session_name, src_index, self.window.index)
+        return True
+
+    def _on_drag_enter(self, target, x, y):
+        """Resalta cuando hay un drag sobre esta fila."""
+        self.add_css_class("suggested-action")
+        return Gdk.DragAction.MOVE
+
+    def _on_drag_leave(self, target):
+        """Quita el resaltado cuando sale el drag."""
+        self.remove_css_class("suggested-action")
+
+    def _on_activated(self, row):
+        """Emite señal cuando se selecciona la ventana."""
+        self.emit("window-selected", self.session_name, self.window.index)
+
+    def _on_edit_clicked(self, button: Gtk.Button):
+        """Emite señal para renombrar."""
+        self.emit("rename-requested", self.session_name, self.window.index, self.window.name)
+
+    def _on_exit_clicked(self, button: Gtk.Button):
+        """Emite señal para cerrar ventana."""
+        self.emit("exit-requested", self.session_name, self.window.index)
@@ -6,6 +6,8 @@ Autor: Homero Thompson del Lago del Terror
 
 from __future__ import annotations
 
+import time
+from collections.abc import Callable
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -25,12 +27,13 @@ except ImportError:
 
     logger = logging.getLogger(__name__)  # type: ignore
 
-from .clients import RemoteTmuxClient, TmuxClient
+from .clients import RemoteTmuxClient, Session, TmuxClient
 from .dialogs import show_help_dialog, show_theme_dialog
 from .remote_hosts import RemoteHost, remote_hosts_manager
 from .themes import theme_manager
 from .widgets import FileTree, SessionRow, TerminalView
 from .widgets.remote_session_row import RemoteSessionRow
+from .widgets.session_list import reconcile_session_rows, session_key
 
 # UI Constants
 WINDOW_DEFAULT_WIDTH = 1000
@@ -39,9 +42,30 @@ SIDEBAR_DEFAULT_WIDTH = 250
 
 # Timing Constants (milliseconds unless noted)
 AUTO_REFRESH_INTERVAL_SECONDS = 15
+# Con notificaciones de control mode el polling es solo una red de seguridad
+SAFETY_REFRESH_INTERVAL_SECONDS = 60
 REFRESH_DEBOUNCE_MS = 150
 TMUX_CHECK_DELAY_MS = 2000
 
+# Notificaciones de control mode que se aplican sin re-listar
+LOCAL_PATCH_NOTIFICATIONS = frozenset(
+    {"%session-renamed", "%window-renamed", "%unlinked-window-renamed"}
+)
+# Notificaciones que cambian la estructura del árbol (o el estado attached)
+LOCAL_REFRESH_NOTIFICATIONS = frozenset(
+    {
+        "%sessions-changed",
+        "%window-add",
+        "%window-close",
+        "%unlinked-window-add",
+        "%unlinked-window-close",
+        "%session-window-changed",
+        "%client-session-changed",
+        "%client-detached",
+        "%exit",
+    }
+)
+
 
 class MainWindow(Adw.ApplicationWindow):
     """Ventana principal de gnome-tmux."""
@@ -49,11 +73,21 @@ class MainWindow(Adw.ApplicationWindow):
     def __init__(self, app: Adw.Application):
         super().__init__(application=app)
 
-        self.tmux = TmuxClient()
+        # Conexión persistente en control mode (fallback a subprocess).
+        # Las operaciones async entregan su resultado en el main loop de GTK
+        self.tmux = TmuxClient(control_mode=True, dispatcher=GLib.idle_add)
+        # Sesión local adjunta en el terminal (target para splits)
+        self._local_session: str | None = None
         self._refresh_timeout_id: int | None = None
         self._sidebar_position: int = 250  # Guardar posición para restore
         self._file_tree_position: int = 250  # Posición del file tree sidebar
-        self._expanded_sessions: set[str] | None = None  # None = primera carga
+        # Filas del sidebar por identidad estable (reconciliación incremental)
+        self._local_rows: dict[str, SessionRow] = {}
+        self._remote_rows: dict[tuple[str, str], RemoteSessionRow] = {}
+        self._first_load = True  # Expandir sesiones attached solo al inicio
+        # Refresh local en curso (en el worker de tmux) y si hay otro pendiente
+        self._refresh_in_flight = False
+        self._refresh_queued = False
         self._animation: Adw.TimedAnimation | None = None
         self._file_tree_animation: Adw.TimedAnimation | None = None
         # Track remote connections: {f"{user}@{host}:{port}": RemoteTmuxClient}
@@ -63,6 +97,10 @@ class MainWindow(Adw.ApplicationWindow):
         self._remote_executor: ThreadPoolExecutor | None = None
         # Debouncing para refreshes (evita refreshes múltiples consecutivos)
         self._pending_refresh_id: int | None = None
+        # Cambios hechos fuera de la GUI llegan como notificaciones de tmux
+        self.tmux.add_notification_handler(self._on_tmux_notification_received)
+        # Último refresh por polling (monotonic)
+        self._last_poll_time = 0.0
 
         self.set_title("TmuxGUI")
         self.set_default_size(WINDOW_DEFAULT_WIDTH, WINDOW_DEFAULT_HEIGHT)
@@ -76,7 +114,8 @@ class MainWindow(Adw.ApplicationWindow):
         # Cargar sesiones
         self._refresh_sessions()
 
-        # Auto-refresh cada 15 segundos (optimizado para reducir overhead)
+        # Auto-refresh: mientras control mode está conectado solo cubre lo que
+        # no se notifica (ej: sesiones remotas), ver _on_refresh_timeout
         self._refresh_timeout_id = GLib.timeout_add_seconds(
             AUTO_REFRESH_INTERVAL_SECONDS, self._on_refresh_timeout
         )
@@ -357,80 +396,96 @@ class MainWindow(Adw.ApplicationWindow):
 
     def _refresh_sessions(self):
         """Actualiza la lista de sesiones (locales y remotas)."""
-        # Guardar estado de expansión y separar filas locales de remotas
-        remote_rows = []
-        index = 0
-        while True:
-            row = self.sessions_list.get_row_at_index(index)
-            if row is None:
-                break
-            if index == 0 and self._expanded_sessions is None:
-                self._expanded_sessions = set()
-            # Garantizar que _expanded_sessions no es None para mypy
-            expanded = self._expanded_sessions
-            if expanded is None:
-                expanded = set()
-                self._expanded_sessions = expanded
-            if isinstance(row, RemoteSessionRow):
-                key = f"remote:{row.user}@{row.host}:{row.session.name}"
-                if row.get_expanded():
-                    expanded.add(key)
-                elif key in expanded:
-                    expanded.discard(key)
-                remote_rows.append(row)
-            elif isinstance(row, SessionRow):
-                key = f"local:{row.session.name}"
-                if row.get_expanded():
-                    expanded.add(key)
-                elif key in expanded:
-                    expanded.discard(key)
-            index += 1
-
-        # Limpiar solo filas locales (mantener remotas hasta que lleguen datos nuevos)
-        index = 0
-        while True:
-            row = self.sessions_list.get_row_at_index(index)
-            if row is None:
-                break
-            if isinstance(row, SessionRow):
-                self.sessions_list.remove(row)
-            else:
-                index += 1
-
         # Verificar si tmux está disponible
         if not self.tmux.is_available:
+            reconcile_session_rows(
+                self.sessions_list, self._local_rows, [], 0, self._create_session_row
+            )
             self._show_error_placeholder("tmux not installed")
             return
 
-        # Obtener sesiones locales (rápido, no bloquea)
-        sessions = self.tmux.list_sessions()
-
-        # Agregar filas de sesiones locales AL INICIO (antes de las remotas)
-        for i, session in enumerate(sessions):
-            row = SessionRow(session)
-            row.connect("delete-requested", self._on_delete_requested)
-            row.connect("window-selected", self._on_window_selected)
-            row.connect("rename-session-requested", self._on_rename_session_requested)
-            row.connect("rename-window-requested", self._on_rename_window_requested)
-            row.connect("new-window-requested", self._on_new_window_requested)
-            row.connect("exit-window-requested", self._on_exit_window_requested)
-            row.connect("swap-windows-requested", self._on_swap_windows_requested)
-            # Restaurar estado de expansión
-            key = f"local:{session.name}"
-            if self._expanded_sessions is None:
-                if session.attached:
-                    row.set_expanded(True)
-            elif key in self._expanded_sessions:
-                row.set_expanded(True)
-            self.sessions_list.insert(row, i)
-
-        # Inicializar el set si es la primera carga
-        if self._expanded_sessions is None:
-            self._expanded_sessions = set(f"local:{s.name}" for s in sessions if s.attached)
+        # Si ya hay un refresh en curso, agrupar en uno solo al terminar
+        if self._refresh_in_flight:
+            self._refresh_queued = True
+            return
+        self._refresh_in_flight = True
+
+        # Obtener sesiones locales en el worker de tmux (no bloquea la UI)
+        self.tmux.call_async(self.tmux.list_sessions, callback=self._on_local_sessions_loaded)
+
+    def _on_local_sessions_loaded(self, sessions: list[Session] | None) -> bool:
+        """Aplica las sesiones locales al sidebar (main loop)."""
+        self._refresh_in_flight = False
+        if self._closing:
+            return False
+
+        if self._refresh_queued:
+            # Los datos ya están desactualizados: pedir los nuevos
+            self._refresh_queued = False
+            self._refresh_sessions()
+            return False
+
+        if sessions is not None:
+            # Sesiones locales AL INICIO (antes de las remotas); solo cambian
+            # las filas cuyos datos cambiaron
+            reconcile_session_rows(
+                self.sessions_list,
+                self._local_rows,
+                [(session_key(session), session) for session in sessions],
+                0,
+                self._create_session_row,
+            )
+            self._first_load = False
 
         # Cargar sesiones remotas en background (no bloquea UI)
         if self._remote_clients:
             self._refresh_remote_sessions_async()
+        return False
+
+    def _run_tmux_action(
+        self,
+        func: Callable[..., bool],
+        *args,
+        error_message: str,
+        on_success: Callable[[], None] | None = None,
+    ):
+        """
+        Ejecuta una operación tmux en el worker y refresca al terminar.
+
+        Args:
+            func: Método de TmuxClient que retorna bool
+            *args: Argumentos del método
+            error_message: Toast a mostrar si la operación falla
+            on_success: Acción extra en el main loop si la operación tuvo éxito
+        """
+
+        def on_done(ok: bool | None) -> bool:
+            if self._closing:
+                return False
+            if ok:
+                self._refresh_sessions()
+                if on_success is not None:
+                    on_success()
+            else:
+                self._show_toast(error_message)
+            return False
+
+        self.tmux.call_async(func, *args, callback=on_done)
+
+    def _create_session_row(self, key: str, session: Session) -> SessionRow:
+        """Crea la fila de una sesión local y conecta sus señales."""
+        row = SessionRow(session)
+        row.connect("delete-requested", self._on_delete_requested)
+        row.connect("window-selected", self._on_window_selected)
+        row.connect("rename-session-requested", self._on_rename_session_requested)
+        row.connect("rename-window-requested", self._on_rename_window_requested)
+        row.connect("new-window-requested", self._on_new_window_requested)
+        row.connect("exit-window-requested", self._on_exit_window_requested)
+        row.connect("swap-windows-requested", self._on_swap_windows_requested)
+        # En la primera carga, expandir las sesiones attached
+        if self._first_load and session.attached:
+            row.set_expanded(True)
+        return row
 
     def _refresh_remote_sessions_async(self):
         """Carga sesiones remotas usando ThreadPoolExecutor (max 3 concurrent)."""
@@ -449,9 +504,10 @@ class MainWindow(Adw.ApplicationWindow):
             if self._closing:
                 return None
             try:
-                if client.is_connected() and not client.is_tmux_available():
-                    return ("no_tmux", f"{client.user}@{client.host}")
+                # Una sola invocación SSH: sesiones, ventanas y detección de tmux
                 remote_sessions = client.list_sessions()
+                if client.tmux_missing:
+                    return ("no_tmux", f"{client.user}@{client.host}")
                 return ("ok", client, remote_sessions)
             except Exception:
                 return None
@@ -502,36 +558,35 @@ class MainWindow(Adw.ApplicationWindow):
             for host in hosts_without_tmux:
                 self._show_toast(f"tmux not installed on {host}")
 
-        # Primero eliminar todas las filas remotas existentes
-        index = 0
-        while True:
-            row = self.sessions_list.get_row_at_index(index)
-            if row is None:
-                break
-            if isinstance(row, RemoteSessionRow):
-                self.sessions_list.remove(row)
-            else:
-                index += 1
-
-        # Agregar las nuevas filas remotas
+        # Clave estable: host + sesión (el mismo id puede existir en varios hosts)
+        clients_by_key = {}
+        items = []
         for client, remote_sessions in results:
+            host_key = f"{client.user}@{client.host}:{client.port}"
             for session in remote_sessions:
-                row = RemoteSessionRow(
-                    session=session,
-                    host=client.host,
-                    user=client.user,
-                    port=client.port,
-                    connected=True,
-                )
-                row.connect("window-selected", self._on_remote_window_selected)
-                row.connect("rename-requested", self._on_remote_rename_requested)
-                row.connect("kill-requested", self._on_remote_kill_requested)
-                row.connect("new-window-requested", self._on_remote_new_window_requested)
-                # Restaurar estado de expansión
-                key = f"remote:{client.user}@{client.host}:{session.name}"
-                if self._expanded_sessions and key in self._expanded_sessions:
-                    row.set_expanded(True)
-                self.sessions_list.append(row)
+                key = (host_key, session_key(session))
+                clients_by_key[key] = client
+                items.append((key, session))
+
+        def create_row(key: tuple[str, str], session: Session) -> RemoteSessionRow:
+            client = clients_by_key[key]
+            row = RemoteSessionRow(
+                session=session,
+                host=client.host,
+                user=client.user,
+                port=client.port,
+                connected=True,
+            )
+            row.connect("window-selected", self._on_remote_window_selected)
+            row.connect("rename-requested", self._on_remote_rename_requested)
+            row.connect("kill-requested", self._on_remote_kill_requested)
+            row.connect("new-window-requested", self._on_remote_new_window_requested)
+            return row
+
+        # Las remotas van después de las locales
+        reconcile_session_rows(
+            self.sessions_list, self._remote_rows, items, len(self._local_rows), create_row
+        )
 
         return False  # No repetir
 
@@ -751,11 +806,12 @@ class MainWindow(Adw.ApplicationWindow):
                 if name:
                     parent_dialog.set_focus(None)
                     parent_dialog.close()
-                    if self.tmux.create_session(name):
-                        self._refresh_sessions()
-                        GLib.idle_add(self._attach_to_session, name)
-                    else:
-                        self._show_toast("Failed to create session")
+                    self._run_tmux_action(
+                        self.tmux.create_session,
+                        name,
+                        error_message="Failed to create session",
+                        on_success=lambda: self._attach_to_session(name),
+                    )
 
         dialog.connect("response", on_response)
         dialog.present()
@@ -1032,6 +1088,7 @@ class MainWindow(Adw.ApplicationWindow):
         command = self.tmux.get_attach_command(name, window_index)
         self.terminal_view.attach_session(name, command)
         self.terminal_view.grab_focus()
+        self._local_session = name
 
         # Cambiar file tree a modo local
         if hasattr(self, "file_tree_widget") and self.file_tree_widget.is_remote:
@@ -1059,6 +1116,7 @@ class MainWindow(Adw.ApplicationWindow):
         # Ejecutar en el terminal (maneja password prompts)
         self.terminal_view.attach_session(f"{name}@{host}", command)
         self.terminal_view.grab_focus()
+        self._local_session = None
 
         # Cambiar file tree a modo remoto
         if hasattr(self, "file_tree_widget"):
@@ -1131,6 +1189,7 @@ class MainWindow(Adw.ApplicationWindow):
 
         self.terminal_view.attach_session(display_name, command)
         self.terminal_view.grab_focus()
+        self._local_session = None
 
         # Cambiar file tree a modo remoto
         if hasattr(self, "file_tree_widget"):
@@ -1314,10 +1373,12 @@ class MainWindow(Adw.ApplicationWindow):
         if response == "rename":
             new_name = entry.get_text().strip()
             if new_name and new_name != old_name:
-                if self.tmux.rename_session(old_name, new_name):
-                    self._refresh_sessions()
-                else:
-                    self._show_toast("Failed to rename session")
+                self._run_tmux_action(
+                    self.tmux.rename_session,
+                    old_name,
+                    new_name,
+                    error_message="Failed to rename session",
+                )
 
     def _on_rename_window_requested(
         self, row, session_name: str, window_index: int, current_name: str
@@ -1353,10 +1414,13 @@ class MainWindow(Adw.ApplicationWindow):
         if response == "rename":
             new_name = entry.get_text().strip()
             if new_name:
-                if self.tmux.rename_window(session_name, window_index, new_name):
-                    self._refresh_sessions()
-                else:
-                    self._show_toast("Failed to rename window")
+                self._run_tmux_action(
+                    self.tmux.rename_window,
+                    session_name,
+                    window_index,
+                    new_name,
+                    error_message="Failed to rename window",
+                )
 
     def _on_new_window_requested(self, row, session_name: str):
         """Muestra diálogo para crear nueva ventana."""
@@ -1385,23 +1449,28 @@ class MainWindow(Adw.ApplicationWindow):
         dialog.close()
         if response == "create":
             name = entry.get_text().strip() or None
-            if self.tmux.create_window(session_name, name):
-                self._refresh_sessions()
-            else:
-                self._show_toast("Failed to create window")
+            self._run_tmux_action(
+                self.tmux.create_window,
+                session_name,
+                name,
+                error_message="Failed to create window",
+            )
 
     def _on_exit_window_requested(self, row, session_name: str, window_index: int):
         """Envía exit a una ventana (cierre limpio)."""
-        self.tmux.exit_window(session_name, window_index)
+        self.tmux.call_async(self.tmux.exit_window, session_name, window_index)
         # Refresh con debouncing (delay mayor para shells lentos)
         self._schedule_refresh(500)
 
     def _on_swap_windows_requested(self, row, session_name: str, src_index: int, dst_index: int):
         """Intercambia dos ventanas."""
-        if self.tmux.swap_windows(session_name, src_index, dst_index):
-            self._refresh_sessions()
-        else:
-            self._show_toast("Failed to swap windows")
+        self._run_tmux_action(
+            self.tmux.swap_windows,
+            session_name,
+            src_index,
+            dst_index,
+            error_message="Failed to swap windows",
+        )
 
     def _on_delete_requested(self, row: SessionRow, session_name: str):
         """Maneja la solicitud de eliminar una sesión."""
@@ -1426,19 +1495,71 @@ class MainWindow(Adw.ApplicationWindow):
         """Maneja la confirmación de eliminar sesión."""
         dialog.close()
         if response == "delete":
-            if self.tmux.kill_session(session_name):
-                self._refresh_sessions()
-            else:
-                self._show_toast("Failed to delete session")
+            self._run_tmux_action(
+                self.tmux.kill_session,
+                session_name,
+                error_message="Failed to delete session",
+            )
 
     def _on_session_ended(self, terminal_view: TerminalView):
         """Maneja cuando termina una sesión en el terminal."""
         self._refresh_sessions()
 
+    def _on_tmux_notification_received(self, name: str, args: list[str]):
+        """Recibe notificaciones de tmux (thread lector) y las pasa al main loop."""
+        if name in LOCAL_PATCH_NOTIFICATIONS or name in LOCAL_REFRESH_NOTIFICATIONS:
+            GLib.idle_add(self._on_tmux_notification, name, args)
+
+    def _on_tmux_notification(self, name: str, args: list[str]) -> bool:
+        """Aplica una notificación de tmux al sidebar."""
+        if self._closing:
+            return False
+
+        if name in LOCAL_PATCH_NOTIFICATIONS and len(args) == 2:
+            # Renombres: actualizar la fila en el lugar, sin query a tmux
+            if name == "%session-renamed":
+                patched = self._patch_local_session_name(args[0], args[1])
+            else:
+                patched = self._patch_local_window_name(args[0], args[1])
+            if patched:
+                return False
+
+        # Cambios estructurales: re-listar (con debounce para agrupar ráfagas)
+        delay = TMUX_CHECK_DELAY_MS if name == "%exit" else REFRESH_DEBOUNCE_MS
+        self._schedule_refresh(delay)
+        return False
+
+    def _patch_local_session_name(self, session_id: str, name: str) -> bool:
+        """Renombra en el lugar la fila de una sesión local por su id de tmux."""
+        for row in self._local_rows.values():
+            if row.session.session_id == session_id:
+                if self._local_session == row.session.name:
+                    self._local_session = name
+                row.set_session_name(name)
+                return True
+        return False
+
+    def _patch_local_window_name(self, window_id: str, name: str) -> bool:
+        """Renombra en el lugar una ventana local por su id de tmux."""
+        # Una ventana enlazada en varias sesiones aparece en varias filas
+        patched = False
+        for row in self._local_rows.values():
+            patched = row.set_window_name(window_id, name) or patched
+        return patched
+
     def _on_refresh_timeout(self) -> bool:
         """Callback del timeout de auto-refresh."""
         if self._closing:
             return False  # Detener el timeout
+        # Con control mode conectado el polling es solo una red de seguridad;
+        # sin conexión (tmux < 3.2, sin servidor, reintentos) se mantiene
+        now = time.monotonic()
+        if (
+            self.tmux.notifications_active
+            and now - self._last_poll_time < SAFETY_REFRESH_INTERVAL_SECONDS
+        ):
+            return True
+        self._last_poll_time = now
         self._refresh_sessions()
         return True
 
@@ -1566,7 +1687,7 @@ class MainWindow(Adw.ApplicationWindow):
         """Divide el panel actual horizontalmente (lado a lado)."""
         current = self.terminal_view.current_session
         if current:
-            self.tmux.split_horizontal()
+            self.tmux.call_async(self.tmux.split_horizontal, self._local_session)
         else:
             self._show_toast("Select a session and window first")
 
@@ -1574,7 +1695,7 @@ class MainWindow(Adw.ApplicationWindow):
         """Divide el panel actual verticalmente (apilados)."""
         current = self.terminal_view.current_session
         if current:
-            self.tmux.split_vertical()
+            self.tmux.call_async(self.tmux.split_vertical, self._local_session)
         else:
             self._show_toast("Select a session and window first")
 
@@ -1672,6 +1793,9 @@ class MainWindow(Adw.ApplicationWindow):
             except (ProcessLookupError, OSError):
                 pass
 
+        # Cerrar el cliente tmux de control mode
+        self.tmux.close()
+
         # Cerrar conexiones SSH (forzar cierre)
         for client in self._remote_clients.values():
             client.close_connection(force=True)
@@ -0,0 +1,111 @@
+"""
+test_connection_monitor.py - Tests para el monitor de conexiones SSH
+
+Autor: Homero Thompson del Lago del Terror
+"""
+
+from unittest.mock import MagicMock, patch
+
+from gnome_tmux.clients.connection_monitor import ConnectionMonitor
+
+
+def make_monitor(tmp_path, exists=True, check_result=True, validity=5.0):
+    """Crea un monitor con callbacks mockeados."""
+    socket_exists = MagicMock(return_value=exists)
+    check = MagicMock(return_value=check_result)
+    monitor = ConnectionMonitor(str(tmp_path / "sock"), socket_exists, check, validity)
+    return monitor, socket_exists, check
+
+
+class TestConnectionMonitor:
+    """Tests para ConnectionMonitor."""
+
+    def test_no_socket_skips_check(self, tmp_path):
+        """Test que sin socket no se ejecuta el check."""
+        monitor, _, check = make_monitor(tmp_path, exists=False)
+
+        assert monitor.is_connected() is False
+        check.assert_not_called()
+
+    def test_status_cached_within_validity(self, tmp_path):
+        """Test que el check se reutiliza dentro de la ventana de validez."""
+        monitor, _, check = make_monitor(tmp_path)
+
+        assert monitor.is_connected() is True
+        assert monitor.is_connected() is True
+        assert check.call_count == 1
+
+    def test_status_expires(self, tmp_path):
+        """Test que el check se repite al vencer la validez."""
+        monitor, _, check = make_monitor(tmp_path, validity=5.0)
+        clock = "gnome_tmux.clients.connection_monitor.time.monotonic"
+
+        with patch(clock, return_value=100.0):
+            monitor.is_connected()
+        with patch(clock, return_value=106.0):
+            monitor.is_connected()
+
+        assert check.call_count == 2
+
+    def test_invalidate_forces_check(self, tmp_path):
+        """Test que invalidate fuerza un nuevo check."""
+        monitor, _, check = make_monitor(tmp_path)
+        monitor.is_connected()
+
+        monitor.invalidate()
+        monitor.is_connected()
+
+        assert check.call_count == 2
+
+    def test_socket_appears_invalidates(self, tmp_path):
+        """Test que un socket nuevo invalida el estado cacheado."""
+        monitor, _, check = make_monitor(tmp_path, check_result=False)
+        monitor.is_connected()
+
+        (tmp_path / "sock").touch()
+        monitor._poll_socket()
+        check.return_value = True
+
+        assert monitor.is_connected() is True
+        assert check.call_count == 2
+
+    def test_socket_disappears_marks_disconnected(self, tmp_path):
+        """Test que al desaparecer el socket el estado pasa a desconectado."""
+        (tmp_path / "sock").touch()
+        monitor, _, _ = make_monitor(tmp_path)
+        monitor.is_connected()
+
+        (tmp_path / "sock").unlink()
+        monitor._poll_socket()
+
+        assert monitor._status is False
+
+
+class TestRemoteClientUsesMonitor:
+    """Tests de integración con RemoteTmuxClient."""
+
+    def test_repeated_is_connected_single_spawn(self, mock_path_exists, mock_subprocess_run):
+        """Test que varias consultas seguidas lanzan un solo ssh -O check."""
+        from gnome_tmux.clients import RemoteTmuxClient
+
+        mock_path_exists.return_value = True
+        mock_subprocess_run.return_value = MagicMock(returncode=0)
+        client = RemoteTmuxClient(host="test", user="user")
+
+        for _ in range(5):
+            assert client.is_connected() is True
+        assert mock_subprocess_run.call_count == 1
+
+    def test_ssh_connection_error_invalidates(self, mock_path_exists, mock_subprocess_run):
+        """Test que un exit 255 de ssh fuerza re-verificar la conexión."""
+        from gnome_tmux.clients import RemoteTmuxClient
+
+        mock_path_exists.return_value = True
+        mock_subprocess_run.return_value = MagicMock(returncode=0)
+        client = RemoteTmuxClient(host="test", user="user")
+        client.is_connected()
+
+        mock_subprocess_run.return_value = MagicMock(returncode=255, stdout="", stderr="")
+        client.file_exists("/x")
+
+        assert client.is_connected() is False
@@ -0,0 +1,97 @@
+"""
+test_content_scan.py - Tests para la revisión del contenido de archivos
+
+Autor: Homero Thompson del Lago del Terror
+"""
+
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from gnome_tmux.search import compile_content_pattern, content_scan, scan_file, scan_files
+
+RUN_PY = Path(__file__).parent.parent / "run.py"
+
+
+@pytest.fixture
+def tree(tmp_path):
+    """Archivos de texto, binarios y vacíos."""
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "main.py").write_text("import os\n\nprint('Hello World')\n")
+    (tmp_path / "image.bin").write_bytes(b"\x89PNG\0\0hello")
+    (tmp_path / "empty.txt").write_text("")
+    return tmp_path
+
+
+class TestScanFile:
+    """Tests para scan_file."""
+
+    def test_line_number_and_snippet(self, tree):
+        """Test que se informa la línea y el texto de la coincidencia."""
+        pattern = compile_content_pattern("hello")
+
+        assert scan_file(str(tree / "src" / "main.py"), pattern) == (3, "print('Hello World')")
+
+    def test_binary_skipped(self, tree):
+        """Test que un archivo con NUL al principio no se revisa."""
+        assert scan_file(str(tree / "image.bin"), compile_content_pattern("hello")) is None
+
+    def test_empty_and_unreadable(self, tree):
+        """Test que archivos vacíos o inexistentes no fallan."""
+        pattern = compile_content_pattern("hello")
+
+        assert scan_file(str(tree / "empty.txt"), pattern) is None
+        assert scan_file(str(tree / "missing.txt"), pattern) is None
+
+    def test_query_is_literal(self, tmp_path):
+        """Test que los caracteres de regex se buscan literalmente."""
+        (tmp_path / "a.txt").write_text("a+b\naab\n")
+
+        assert scan_file(str(tmp_path / "a.txt"), compile_content_pattern("a+b")) == (1, "a+b")
+
+    def test_long_line_snippet_around_match(self, tmp_path):
+        """Test que el fragmento de una línea larga incluye la coincidencia."""
+        (tmp_path / "min.js").write_text("x" * 1000 + "needle" + "y" * 1000)
+
+        _, snippet = scan_file(str(tmp_path / "min.js"), compile_content_pattern("needle"))
+
+        assert "needle" in snippet
+        assert len(snippet) == content_scan.SNIPPET_CHARS
+
+    def test_scan_files_batch(self, tree):
+        """Test que un lote retorna solo los archivos que coinciden."""
+        paths = [str(tree / "src" / "main.py"), str(tree / "image.bin"), str(tree / "empty.txt")]
+
+        hits = scan_files(paths, compile_content_pattern("hello"))
+
+        assert [(hit.path, hit.line) for hit in hits] == [(paths[0], 3)]
+
+
+class TestSpawnedWorker:
+    """Tests para los workers del pool de procesos."""
+
+    def test_does_not_import_gi(self):
+        """Test que un worker lanzado con spawn desde run.py no carga GTK."""
+        script = textwrap.dedent(
+            f"""
+            import __main__, multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+
+            # Como si la app se hubiera lanzado con python3 run.py
+            __main__.__file__ = {str(RUN_PY)!r}
+            check = "[m for m in ('gi', 'gnome_tmux.main') if m in __import__('sys').modules]"
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(1, mp_context=context) as pool:
+                print(pool.submit(eval, check).result())
+            """
+        )
+
+        result = subprocess.run(
+            [sys.executable, "-c", script], capture_output=True, text=True, timeout=60
+        )
+
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip() == "[]"
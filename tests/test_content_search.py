@@ -0,0 +1,129 @@
+"""
+test_content_search.py - Tests para la búsqueda por contenido en proceso
+
+Autor: Homero Thompson del Lago del Terror
+"""
+
+# Mock gi antes de importar
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import MagicMock
+
+import pytest
+
+sys.modules["gi"] = MagicMock()
+sys.modules["gi.repository"] = MagicMock()
+
+from gnome_tmux.widgets.file_tree.local import content_search
+from gnome_tmux.widgets.file_tree.local.content_search import iter_content_matches
+from gnome_tmux.widgets.file_tree.search_jobs import CancelToken
+
+
+@pytest.fixture
+def pool():
+    """Pool de threads en lugar del de procesos."""
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        yield executor
+
+
+@pytest.fixture
+def tree(tmp_path):
+    """Árbol con texto, binarios y directorios ocultos."""
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "main.py").write_text("import os\n\nprint('Hello World')\n")
+    (tmp_path / "notes.txt").write_text("hello there\n")
+    (tmp_path / "image.bin").write_bytes(b"\x89PNG\0\0hello")
+    (tmp_path / "empty.txt").write_text("")
+    (tmp_path / ".git").mkdir()
+    (tmp_path / ".git" / "config").write_text("hello\n")
+    return tmp_path
+
+
+def matches(root, query, pool, **kwargs):
+    return {
+        (hit.path, hit.line, hit.preview)
+        for hit in iter_content_matches(root, query, executor=pool, **kwargs)
+    }
+
+
+class TestIterContentMatches:
+    """Tests para iter_content_matches."""
+
+    def test_prunes_hidden_and_binaries(self, tree, pool):
+        """Test que no se revisan ocultos ni binarios."""
+        assert matches(tree, "HELLO", pool) == {
+            (str(tree / "src" / "main.py"), 3, "print('Hello World')"),
+            (str(tree / "notes.txt"), 1, "hello there"),
+        }
+
+    def test_many_batches(self, tmp_path, pool, monkeypatch):
+        """Test que se recorren todos los lotes."""
+        monkeypatch.setattr(content_search, "FILES_PER_TASK", 3)
+        for i in range(20):
+            (tmp_path / f"f{i}.txt").write_text("match\n" if i % 2 else "other\n")
+
+        assert len(matches(tmp_path, "match", pool)) == 10
+
+    def test_cancelled_before_start(self, tree, pool):
+        """Test que una búsqueda cancelada no genera resultados."""
+        token = CancelToken()
+        token.cancel()
+
+        assert matches(tree, "hello", pool, token=token) == set()
+
+    def test_closing_cancels_pending_batches(self, tmp_path, monkeypatch):
+        """Test que cerrar el generador (límite alcanzado) cancela los lotes restantes."""
+        monkeypatch.setattr(content_search, "FILES_PER_TASK", 1)
+        monkeypatch.setattr(content_search, "CONTENT_WORKERS", 1)
+        for i in range(5):
+            (tmp_path / f"f{i}.txt").write_text("match\n")
+        futures = []
+
+        def submit(func, paths, pattern):
+            future = MagicMock()
+            future.done.return_value = False
+            future.result.return_value = func(paths, pattern)
+            futures.append(future)
+            return future
+
+        executor = MagicMock()
+        executor.submit.side_effect = submit
+        hits = iter_content_matches(tmp_path, "match", executor=executor)
+
+        next(hits)
+        hits.close()
+
+        assert not futures[0].cancel.called
+        assert futures[-1].cancel.called
+
+    def test_pool_unavailable_not_scanned_in_thread(self, tree, monkeypatch):
+        """Test que sin pool los lotes no se revisan en el thread de búsqueda."""
+        scan_files = MagicMock()
+        monkeypatch.setattr(content_search, "scan_files", scan_files)
+        executor = MagicMock()
+        executor.submit.side_effect = RuntimeError("cannot schedule new futures")
+
+        assert matches(tree, "hello", executor) == set()
+        scan_files.assert_not_called()
+
+    def test_broken_pool_stops_search(self, tmp_path, monkeypatch):
+        """Test que si el pool se rompe se entregan los lotes previos y se corta."""
+        monkeypatch.setattr(content_search, "FILES_PER_TASK", 1)
+        for i in range(4):
+            (tmp_path / f"f{i}.txt").write_text("match\n")
+        submitted = []
+
+        def submit(func, paths, pattern):
+            future = MagicMock()
+            if submitted:
+                future.result.side_effect = BrokenProcessPool("worker died")
+            else:
+                future.result.return_value = func(paths, pattern)
+            submitted.append(future)
+            return future
+
+        executor = MagicMock()
+        executor.submit.side_effect = submit
+
+        assert len(matches(tmp_path, "match", executor)) == 1
@@ -0,0 +1,354 @@
+"""
+test_control_mode.py - Tests para el cliente tmux en control mode
+
+Autor: Homero Thompson del Lago del Terror
+
+Nota: En lugar de tmux real se usa un script Python que habla el protocolo
+de control mode (%begin/%end/%error), así los tests no dependen de tmux.
+"""
+
+import subprocess
+import sys
+import textwrap
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from gnome_tmux.clients.control_engine import ControlModeEngine, adapt_result
+from gnome_tmux.clients.control_mode import ControlModeClient, quote_argument
+from gnome_tmux.clients.control_notifications import parse_notification
+from gnome_tmux.clients.local import TmuxClient
+
+FAKE_TMUX = textwrap.dedent(
+    """
+    import sys
+
+    args = sys.argv[1:]
+    if "--fail" in args:
+        sys.exit(1)
+
+    n = 0
+
+    def block(lines, ok=True, flags=1):
+        global n
+        n += 1
+        print(f"%begin 1700000000 {n} {flags}")
+        for line in lines:
+            print(line)
+        print(f"%{'end' if ok else 'error'} 1700000000 {n} {flags}", flush=True)
+
+    block([], flags=0)
+    print("%session-changed $3 main", flush=True)
+
+    for line in sys.stdin:
+        line = line.rstrip("\\n")
+        if not line:
+            break
+        if line.startswith("'rename'"):
+            block([])
+            print("%window-renamed @4 my window", flush=True)
+        elif line.startswith("'quit'"):
+            break
+        elif line.startswith("'fail'"):
+            block(["unknown command"], ok=False)
+        elif line.startswith("'tricky'"):
+            block(["%end 1 2 1", "still output"])
+        else:
+            block([line])
+    print("%exit", flush=True)
+    """
+)
+
+
+@pytest.fixture
+def fake_tmux(tmp_path):
+    """Comando base que simula tmux en control mode."""
+    script = tmp_path / "fake_tmux.py"
+    script.write_text(FAKE_TMUX)
+    return [sys.executable, str(script)]
+
+
+class TestQuoteArgument:
+    """Tests para quote_argument."""
+
+    def test_simple_argument(self):
+        """Test argumento simple entre comillas simples."""
+        assert quote_argument("dev") == "'dev'"
+
+    def test_single_quote_escaped(self):
+        """Test comilla simple escapada."""
+        assert quote_argument("it's") == "'it'\\''s'"
+
+    def test_format_not_expanded(self):
+        """Test que formatos y ';' quedan protegidos."""
+        assert quote_argument("#{session_name};x") == "'#{session_name};x'"
+
+    def test_newline_rejected(self):
+        """Test que saltos de línea no se pueden enviar."""
+        with pytest.raises(ValueError):
+            quote_argument("a\nb")
+
+
+class TestParseNotification:
+    """Tests para parse_notification."""
+
+    def test_simple_notification(self):
+        """Test notificación con argumentos simples."""
+        assert parse_notification("%window-add @3") == ("%window-add", ["@3"])
+
+    def test_without_arguments(self):
+        """Test notificación sin argumentos."""
+        assert parse_notification("%sessions-changed") == ("%sessions-changed", [])
+
+    def test_name_with_spaces(self):
+        """Test que el nombre final conserva los espacios."""
+        name, args = parse_notification("%unlinked-window-renamed @1 my  window")
+
+        assert name == "%unlinked-window-renamed"
+        assert args == ["@1", "my  window"]
+
+    def test_session_renamed(self):
+        """Test %session-renamed con id y nombre."""
+        assert parse_notification("%session-renamed $1 dev 2") == (
+            "%session-renamed",
+            ["$1", "dev 2"],
+        )
+
+
+class TestControlModeClient:
+    """Tests para ControlModeClient contra un tmux simulado."""
+
+    def test_start_and_session_id(self, fake_tmux):
+        """Test conexión inicial y sesión adjunta."""
+        client = ControlModeClient(fake_tmux)
+
+        assert client.start() is True
+        assert client.is_alive is True
+        assert client.session_id == "$3"
+        client.close()
+        assert client.is_alive is False
+
+    def test_run_returns_output(self, fake_tmux):
+        """Test que la respuesta del bloque se devuelve como stdout."""
+        client = ControlModeClient(fake_tmux)
+        client.start()
+
+        result = client.run(["list-windows", "-a"])
+
+        assert result is not None
+        assert result.returncode == 0
+        assert result.stdout == "'list-windows' '-a'\n"
+        client.close()
+
+    def test_error_block(self, fake_tmux):
+        """Test que %error se traduce en returncode != 0 con stderr."""
+        client = ControlModeClient(fake_tmux)
+        client.start()
+
+        result = client.run(["fail"])
+
+        assert result is not None
+        assert result.returncode == 1
+        assert "unknown command" in result.stderr
+        client.close()
+
+    def test_guard_lines_in_output(self, fake_tmux):
+        """Test que un '%end' con otro guard es parte del output."""
+        client = ControlModeClient(fake_tmux)
+        client.start()
+
+        result = client.run(["tricky"])
+
+        assert result is not None
+        assert result.stdout == "%end 1 2 1\nstill output\n"
+        client.close()
+
+    def test_pipelined_commands_matched_in_order(self, fake_tmux):
+        """Test que varios comandos concurrentes reciben su propia respuesta."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        client = ControlModeClient(fake_tmux)
+        client.start()
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda i: client.run([f"cmd{i}"]), range(50)))
+
+        assert [r.stdout for r in results] == [f"'cmd{i}'\n" for i in range(50)]
+        client.close()
+
+    def test_run_after_close_returns_none(self, fake_tmux):
+        """Test que sin conexión run retorna None (fallback a subprocess)."""
+        client = ControlModeClient(fake_tmux)
+        client.start()
+        client.close()
+
+        assert client.run(["list-windows"]) is None
+
+    def test_connection_lost_after_send_fails(self, fake_tmux):
+        """Test que un comando ya enviado no retorna None si se corta la conexión."""
+        client = ControlModeClient(fake_tmux)
+        client.start()
+
+        result = client.run(["quit"])
+
+        assert result is not None
+        assert result.returncode != 0
+        client.close()
+
+    def test_start_fails_without_server(self, fake_tmux):
+        """Test que start falla si tmux termina sin conectar."""
+        client = ControlModeClient(fake_tmux + ["--fail"])
+
+        assert client.start() is False
+        assert client.is_alive is False
+
+
+class TestAdaptResult:
+    """Tests para adapt_result."""
+
+    RESULT = subprocess.CompletedProcess(["x"], 0, "out\n", "")
+
+    def test_bytes_without_text(self):
+        """Test que sin text=True la salida es bytes, como subprocess."""
+        result = adapt_result(self.RESULT, {"capture_output": True})
+
+        assert result.stdout == b"out\n"
+
+    def test_text_mode(self):
+        """Test que con text=True la salida es str."""
+        assert adapt_result(self.RESULT, {"capture_output": True, "text": True}).stdout == "out\n"
+
+    def test_not_captured(self):
+        """Test que sin capturar los streams son None."""
+        assert adapt_result(self.RESULT, {}).stdout is None
+
+    def test_check_raises(self):
+        """Test que check=True lanza CalledProcessError si falló."""
+        failed = subprocess.CompletedProcess(["x"], 1, "", "error\n")
+
+        with pytest.raises(subprocess.CalledProcessError):
+            adapt_result(failed, {"check": True})
+
+
+class TestRunTmux:
+    """Tests para TmuxClient._run_tmux con control mode."""
+
+    def make_client(self, control_result):
+        client = TmuxClient()
+        client._control = ControlModeEngine(["tmux"])
+        control_client = MagicMock()
+        control_client.run.return_value = control_result
+        client._control.get_client = lambda: control_client
+        return client
+
+    def test_sent_command_not_repeated(self, monkeypatch):
+        """Test que un comando enviado por control mode no se repite por subprocess."""
+        run = MagicMock()
+        monkeypatch.setattr(subprocess, "run", run)
+        failed = subprocess.CompletedProcess(["kill-session"], 1, "", "connection lost\n")
+        client = self.make_client(failed)
+
+        result = client._run_tmux(["kill-session", "-t", "a"], capture_output=True)
+
+        assert result.returncode == 1
+        run.assert_not_called()
+
+    def test_unsent_command_falls_back(self, monkeypatch):
+        """Test que si el comando no se envió se usa subprocess."""
+        run = MagicMock(return_value=subprocess.CompletedProcess([], 0, b"", b""))
+        monkeypatch.setattr(subprocess, "run", run)
+        client = self.make_client(None)
+
+        client._run_tmux(["has-session"], capture_output=True)
+
+        run.assert_called_once()
+
+
+class TestControlModeEngine:
+    """Tests para ControlModeEngine."""
+
+    def test_reuses_client(self, fake_tmux):
+        """Test que se reutiliza la misma conexión."""
+        engine = ControlModeEngine(fake_tmux)
+
+        client = engine.get_client()
+
+        assert client is not None
+        assert engine.get_client() is client
+        assert engine.session_id == "$3"
+        engine.close()
+
+    def test_backoff_after_failure(self, fake_tmux):
+        """Test que tras un fallo no reintenta hasta el backoff."""
+        engine = ControlModeEngine(fake_tmux + ["--fail"])
+
+        assert engine.get_client() is None
+        engine._tmux_command = fake_tmux
+        assert engine.get_client() is None
+
+        engine.reset_backoff()
+        assert engine.get_client() is not None
+        engine.close()
+
+    def test_connection_state(self, fake_tmux):
+        """Test que is_connected refleja la conexión real, no la existencia del engine."""
+        engine = ControlModeEngine(fake_tmux + ["--fail"])
+        engine.get_client()
+        assert engine.is_connected is False
+
+        engine._tmux_command = fake_tmux
+        engine.reset_backoff()
+        engine.get_client()
+        assert engine.is_connected is True
+
+        engine.close()
+        assert engine.is_connected is False
+
+    def test_notification_handlers(self, fake_tmux):
+        """Test que las notificaciones llegan a los handlers registrados."""
+        received = []
+        renamed = threading.Event()
+
+        def handler(name, args):
+            received.append((name, args))
+            if name == "%window-renamed":
+                renamed.set()
+
+        engine = ControlModeEngine(fake_tmux)
+        engine.add_notification_handler(handler)
+        client = engine.get_client()
+        client.run(["rename"])
+
+        assert renamed.wait(2)
+        assert ("%session-changed", ["$3", "main"]) in received
+        assert ("%window-renamed", ["@4", "my window"]) in received
+        engine.close()
+
+    def test_server_exit_notified(self, fake_tmux):
+        """Test que una desconexión no pedida se notifica como %exit."""
+        exited = threading.Event()
+
+        def handler(name, args):
+            if name == "%exit":
+                exited.set()
+
+        engine = ControlModeEngine(fake_tmux)
+        engine.add_notification_handler(handler)
+        client = engine.get_client()
+        client.run(["quit"], timeout=0.5)
+
+        assert exited.wait(2)
+        assert engine.session_id is None
+        engine.close()
+
+    def test_close_not_notified_as_exit(self, fake_tmux):
+        """Test que cerrar la conexión no genera %exit."""
+        received = []
+        engine = ControlModeEngine(fake_tmux)
+        engine.add_notification_handler(lambda name, args: received.append(name))
+        engine.get_client()
+
+        engine.close()
+
+        assert "%exit" not in received
@@ -0,0 +1,128 @@
+"""
+test_dir_cache.py - Tests para el caché de listados remotos
+
+Autor: Homero Thompson del Lago del Terror
+"""
+
+from unittest.mock import patch
+
+from gnome_tmux.clients.dir_cache import DirectoryCache, normalize_dir
+from gnome_tmux.clients.models import RemoteEntry
+
+
+def entries(*names):
+    return [RemoteEntry(name=name, is_dir=False) for name in names]
+
+
+class TestNormalizeDir:
+    """Tests para normalize_dir."""
+
+    def test_trailing_slash(self):
+        """Test que '/a/b/' y '/a/b' son la misma clave."""
+        assert normalize_dir("/a/b/") == normalize_dir("/a/b") == "/a/b"
+
+    def test_root(self):
+        """Test root."""
+        assert normalize_dir("/") == "/"
+
+
+class TestDirectoryCache:
+    """Tests para DirectoryCache."""
+
+    def test_put_and_get(self):
+        """Test guardar y leer un listado."""
+        cache = DirectoryCache()
+        cache.put("/home/user/", entries("a"))
+
+        assert [e.name for e in cache.get("/home/user")] == ["a"]
+
+    def test_miss(self):
+        """Test path no cacheado."""
+        assert DirectoryCache().get("/nope") is None
+
+    def test_ttl_expired(self):
+        """Test que un listado vencido no se retorna."""
+        cache = DirectoryCache(ttl=5)
+        with patch("gnome_tmux.clients.dir_cache.time.monotonic", return_value=100.0):
+            cache.put("/a", entries("x"))
+        with patch("gnome_tmux.clients.dir_cache.time.monotonic", return_value=106.0):
+            assert cache.get("/a") is None
+        assert len(cache) == 0
+
+    def test_lru_eviction_by_dirs(self):
+        """Test que se descarta el directorio menos usado."""
+        cache = DirectoryCache(max_dirs=2)
+        cache.put("/a", entries("1"))
+        cache.put("/b", entries("2"))
+        cache.get("/a")
+        cache.put("/c", entries("3"))
+
+        assert cache.get("/b") is None
+        assert cache.get("/a") is not None
+        assert cache.get("/c") is not None
+
+    def test_eviction_by_total_entries(self):
+        """Test el límite de memoria por cantidad total de entradas."""
+        cache = DirectoryCache(max_entries=3)
+        cache.put("/a", entries("1", "2"))
+        cache.put("/b", entries("3", "4"))
+
+        assert cache.get("/a") is None
+        assert cache.get("/b") is not None
+
+    def test_oversized_listing_not_cached(self):
+        """Test que un listado mayor al límite no se cachea."""
+        cache = DirectoryCache(max_entries=1)
+        cache.put("/a", entries("1", "2"))
+
+        assert cache.get("/a") is None
+
+    def test_oversized_listing_evicts_previous(self):
+        """Test que un listado demasiado grande descarta el anterior (ya viejo)."""
+        cache = DirectoryCache(max_entries=1)
+        cache.put("/a", entries("1"))
+        cache.put("/a", entries("1", "2"))
+
+        assert cache.get("/a") is None
+        assert len(cache) == 0
+
+    def test_put_after_invalidate_dropped(self):
+        """Test que un listado tomado antes de una invalidación no se guarda."""
+        cache = DirectoryCache()
+        generation = cache.generation
+        cache.invalidate_tree("/a")
+
+        cache.put("/a", entries("old"), generation)
+
+        assert cache.get("/a") is None
+
+    def test_put_with_current_generation(self):
+        """Test que sin invalidaciones intermedias el listado se guarda."""
+        cache = DirectoryCache()
+        cache.put("/b", entries("x"))
+        generation = cache.generation
+
+        cache.put("/a", entries("new"), generation)
+
+        assert cache.get("/a") is not None
+
+    def test_invalidate_tree(self):
+        """Test invalidar un directorio y sus subdirectorios."""
+        cache = DirectoryCache()
+        for path in ("/a", "/a/b", "/a/b/c", "/ab"):
+            cache.put(path, entries("x"))
+
+        cache.invalidate_tree("/a")
+
+        assert cache.get("/a") is None
+        assert cache.get("/a/b/c") is None
+        assert cache.get("/ab") is not None
+
+    def test_invalidate_parent(self):
+        """Test invalidar el directorio que contiene un archivo."""
+        cache = DirectoryCache()
+        cache.put("/a", entries("f.txt"))
+
+        cache.invalidate_parent("/a/f.txt")
+
+        assert cache.get("/a") is None
@@ -10,6 +10,42 @@ mockeando las dependencias de GTK.
 
 import os
 
+# Mock gi antes de importar
+import sys
+from unittest.mock import MagicMock
+
+sys.modules["gi"] = MagicMock()
+sys.modules["gi.repository"] = MagicMock()
+
+from gnome_tmux.widgets.file_tree.local import scanner
+from gnome_tmux.widgets.file_tree.local.listing_cache import (
+    LocalListingCache,
+    directory_identity,
+)
+from gnome_tmux.widgets.file_tree.local.loader import entry_is_dir
+from gnome_tmux.widgets.file_tree.local.scanner import ScanJob
+from gnome_tmux.widgets.file_tree.local.watcher import DirectoryWatcher
+from gnome_tmux.widgets.file_tree.remote.loader import collect_expanded_paths
+from gnome_tmux.widgets.file_tree.remote.tasks import RemoteTask
+
+# Gdk/Gio de los módulos bajo test: otro archivo de tests pudo importarlos
+# antes con su propio mock de gi
+from gnome_tmux.widgets.file_tree.row_events import (
+    Gdk,
+    Gio,
+    RowEventDelegate,
+    build_action_group,
+)
+from gnome_tmux.widgets.file_tree.tree_items import plan_splices
+
+
+def apply_splices(old, new):
+    """Aplica plan_splices a una lista como lo haría Gio.ListStore.splice."""
+    result = list(old)
+    for i1, i2, j1, j2 in plan_splices(old, new):
+        result[i1:i2] = new[j1:j2]
+    return result
+
 
 class TestRemoteCopyPasteLogic:
     """Tests para la lógica de copy/paste remoto."""
@@ -237,6 +273,511 @@ class TestListDirParsing:
         assert name == "my file name.txt"
 
 
+class TestCollectExpandedPaths:
+    """Tests para collect_expanded_paths (listado en bloque del árbol remoto)."""
+
+    def test_root_only(self):
+        """Test sin directorios expandidos solo se lista el root."""
+        assert collect_expanded_paths("/home/user", set()) == ["/home/user"]
+
+    def test_nested_expanded(self):
+        """Test directorios expandidos anidados, padres antes que hijos."""
+        expanded = {"/home/user/a/b", "/home/user/a", "/home/user/c"}
+
+        paths = collect_expanded_paths("/home/user", expanded)
+
+        assert paths == ["/home/user", "/home/user/a", "/home/user/a/b", "/home/user/c"]
+
+    def test_hidden_by_collapsed_parent(self):
+        """Test que un expandido dentro de un padre colapsado no se lista."""
+        expanded = {"/home/user/a/b"}
+
+        assert collect_expanded_paths("/home/user", expanded) == ["/home/user"]
+
+    def test_outside_root_ignored(self):
+        """Test que expandidos fuera del root no se listan."""
+        expanded = {"/etc", "/home/username"}
+
+        assert collect_expanded_paths("/home/user", expanded) == ["/home/user"]
+
+    def test_filesystem_root(self):
+        """Test con root '/'."""
+        assert collect_expanded_paths("/", {"/etc", "/etc/ssh"}) == ["/", "/etc", "/etc/ssh"]
+
+
+def run_scan(path, stream=True):
+    """Ejecuta un ScanJob en el thread actual; retorna (lotes, errores)."""
+    batches, done = [], []
+    drains = []
+    job = ScanJob(str(path), batches.append, done.append, stream=stream, dispatcher=drains.append)
+    job._run()
+    while drains:
+        drain = drains.pop()
+        while drain():
+            pass
+    return batches, done
+
+
+class TestScanJob:
+    """Tests para ScanJob (listado local en background)."""
+
+    def test_dirs_first_sorted_without_hidden(self, tmp_path):
+        """Test orden: directorios primero, por nombre sin mayúsculas; sin ocultos."""
+        (tmp_path / "b.txt").write_text("x")
+        (tmp_path / "A.txt").write_text("x")
+        (tmp_path / "zdir").mkdir()
+        (tmp_path / ".hidden").mkdir()
+        (tmp_path / ".env").write_text("x")
+
+        batches, done = run_scan(tmp_path, stream=False)
+
+        assert [[e.name for e in batch] for batch in batches] == [["zdir", "A.txt", "b.txt"]]
+        assert done == [None]
+
+    def test_symlink_to_dir_is_dir(self, tmp_path):
+        """Test que un symlink a directorio se muestra como directorio (como el remoto)."""
+        (tmp_path / "real").mkdir()
+        (tmp_path / "link").symlink_to(tmp_path / "real")
+        (tmp_path / "a.txt").write_text("x")
+
+        batches, _ = run_scan(tmp_path, stream=False)
+
+        assert [e.name for e in batches[0]] == ["link", "real", "a.txt"]
+
+    def test_entry_is_dir_follows_symlinks(self, tmp_path):
+        """Test el tipo de symlinks a directorios, a archivos y rotos."""
+        (tmp_path / "real").mkdir()
+        (tmp_path / "file.txt").write_text("x")
+        (tmp_path / "dir_link").symlink_to(tmp_path / "real")
+        (tmp_path / "file_link").symlink_to(tmp_path / "file.txt")
+        (tmp_path / "broken").symlink_to(tmp_path / "missing")
+
+        with os.scandir(tmp_path) as entries:
+            types = {entry.name: entry_is_dir(entry) for entry in entries}
+
+        assert types == {
+            "real": True,
+            "file.txt": False,
+            "dir_link": True,
+            "file_link": False,
+            "broken": False,
+        }
+
+    def test_streams_in_bounded_batches(self, tmp_path, monkeypatch):
+        """Test que un directorio grande llega en varios lotes acotados."""
+        monkeypatch.setattr(scanner, "MAX_BATCH_ENTRIES", 10)
+        monkeypatch.setattr(scanner, "BATCH_FLUSH_SECONDS", 60.0)
+        for i in range(35):
+            (tmp_path / f"f{i:02d}").write_text("x")
+
+        batches, done = run_scan(tmp_path)
+
+        assert len(batches) == 4
+        assert all(len(batch) <= 10 for batch in batches)
+        assert sum(len(batch) for batch in batches) == 35
+        assert done == [None]
+
+    def test_drain_respects_iteration_budget(self, tmp_path, monkeypatch):
+        """Test que cada iteración del main loop aplica entradas acotadas."""
+        monkeypatch.setattr(scanner, "MAX_BATCH_ENTRIES", 5)
+        monkeypatch.setattr(scanner, "BATCH_FLUSH_SECONDS", 60.0)
+        monkeypatch.setattr(scanner, "MAX_ENTRIES_PER_ITERATION", 10)
+        for i in range(30):
+            (tmp_path / f"f{i:02d}").write_text("x")
+        batches, drains = [], []
+        job = ScanJob(str(tmp_path), batches.append, dispatcher=drains.append)
+        job._run()
+
+        (drain,) = drains
+        sizes = []
+        while True:
+            before = sum(len(b) for b in batches)
+            more = drain()
+            sizes.append(sum(len(b) for b in batches) - before)
+            if not more:
+                break
+
+        assert max(sizes) <= 10
+        assert sum(sizes) == 30
+
+    def test_empty_directory_refresh_delivers_empty_batch(self, tmp_path):
+        """Test que sin streaming un directorio vacío entrega un lote vacío."""
+        batches, done = run_scan(tmp_path, stream=False)
+
+        assert batches == [[]]
+        assert done == [None]
+
+    def test_missing_directory_reports_error(self, tmp_path):
+        """Test que un directorio inexistente reporta el OSError en on_done."""
+        batches, done = run_scan(tmp_path / "nope")
+
+        assert batches == []
+        assert isinstance(done[0], OSError)
+
+    def test_cancelled_job_delivers_nothing(self, tmp_path):
+        """Test que un listado cancelado no llama a ningún callback."""
+        (tmp_path / "a").write_text("x")
+        batches, done, drains = [], [], []
+        job = ScanJob(str(tmp_path), batches.append, done.append, dispatcher=drains.append)
+
+        job.cancel()
+        job._run()
+
+        assert drains == []
+        assert batches == [] and done == []
+
+
+def age_directory(path):
+    """Lleva el mtime de un directorio al pasado (fuera de la ventana racy)."""
+    os.utime(path, ns=(1_000_000_000, 1_000_000_000))
+
+
+def run_cached_scan(path, cache, stream=True):
+    """Como run_scan pero con caché de listados."""
+    batches, done, drains = [], [], []
+    job = ScanJob(
+        str(path), batches.append, done.append, stream=stream, dispatcher=drains.append, cache=cache
+    )
+    job._run()
+    while drains:
+        drain = drains.pop()
+        while drain():
+            pass
+    return batches, done
+
+
+class TestLocalListingCache:
+    """Tests para LocalListingCache (listados validados por mtime e inode)."""
+
+    def test_hit_with_same_identity(self, tmp_path):
+        """Test que un directorio sin cambios se sirve desde el caché."""
+        age_directory(tmp_path)
+        cache = LocalListingCache()
+        identity = directory_identity(str(tmp_path))
+        cache.put(str(tmp_path), identity, ["a"])
+
+        assert cache.get(str(tmp_path), directory_identity(str(tmp_path))) == ["a"]
+
+    def test_miss_after_directory_changes(self, tmp_path):
+        """Test que crear una entrada invalida el listado cacheado."""
+        age_directory(tmp_path)
+        cache = LocalListingCache()
+        cache.put(str(tmp_path), directory_identity(str(tmp_path)), ["a"])
+
+        (tmp_path / "b").write_text("x")
+
+        assert cache.get(str(tmp_path), directory_identity(str(tmp_path))) is None
+        assert len(cache) == 0
+
+    def test_recently_modified_not_cached(self, tmp_path):
+        """Test que un directorio recién modificado no se cachea."""
+        cache = LocalListingCache()
+        cache.put(str(tmp_path), directory_identity(str(tmp_path)), ["a"])
+
+        assert len(cache) == 0
+
+    def test_lru_bound_by_dirs(self):
+        """Test que se descarta el directorio usado hace más tiempo."""
+        cache = LocalListingCache(max_dirs=2)
+        old = (1, 1, 0)
+        cache.put("/a", old, [])
+        cache.put("/b", old, [])
+        cache.get("/a", old)
+        cache.put("/c", old, [])
+
+        assert cache.get("/b", old) is None
+        assert cache.get("/a", old) == []
+        assert cache.get("/c", old) == []
+
+    def test_bound_by_total_entries(self):
+        """Test que el total de entradas cacheadas queda acotado."""
+        cache = LocalListingCache(max_entries=5)
+        old = (1, 1, 0)
+        cache.put("/a", old, list("abc"))
+        cache.put("/b", old, list("def"))
+        cache.put("/huge", old, list("abcdefgh"))
+
+        assert cache.get("/a", old) is None
+        assert cache.get("/b", old) == list("def")
+        assert cache.get("/huge", old) is None
+
+    def test_scan_job_served_from_cache(self, tmp_path, monkeypatch):
+        """Test que el segundo listado de un directorio no hace scandir."""
+        (tmp_path / "b.txt").write_text("x")
+        (tmp_path / "adir").mkdir()
+        age_directory(tmp_path)
+        cache = LocalListingCache()
+        first, _ = run_cached_scan(tmp_path, cache)
+
+        def fail(_path):
+            raise AssertionError("scandir con caché válido")
+
+        monkeypatch.setattr(scanner.os, "scandir", fail)
+        second, done = run_cached_scan(tmp_path, cache, stream=False)
+
+        assert [e.name for batch in first for e in batch] == ["adir", "b.txt"]
+        assert [[e.name for e in batch] for batch in second] == [["adir", "b.txt"]]
+        assert done == [None]
+
+    def test_scan_job_rescans_changed_directory(self, tmp_path):
+        """Test que un directorio modificado se vuelve a listar."""
+        (tmp_path / "a").write_text("x")
+        age_directory(tmp_path)
+        cache = LocalListingCache()
+        run_cached_scan(tmp_path, cache)
+
+        (tmp_path / "b").write_text("x")
+        batches, _ = run_cached_scan(tmp_path, cache, stream=False)
+
+        assert [e.name for e in batches[0]] == ["a", "b"]
+
+
+def event_file(name):
+    """Gio.File mockeado con el nombre dado."""
+    file = MagicMock()
+    file.get_basename.return_value = name
+    return file
+
+
+class TestDirectoryWatcher:
+    """Tests para DirectoryWatcher (monitores con debounce por directorio)."""
+
+    def make_watcher(self):
+        changed, scheduled = [], []
+        watcher = DirectoryWatcher(
+            changed.append, scheduler=lambda _ms, func: scheduled.append(func)
+        )
+        return watcher, changed, scheduled
+
+    def emit(self, watcher, path, name, event=None, other=None):
+        event = event if event is not None else Gio.FileMonitorEvent.CREATED
+        watcher._on_monitor_changed(None, event_file(name), other, event, path)
+
+    def test_burst_coalesced_per_directory(self):
+        """Test que una ráfaga de eventos produce un refresco por directorio."""
+        watcher, changed, scheduled = self.make_watcher()
+        watcher.watch("/a")
+        watcher.watch("/a/b")
+
+        for i in range(50):
+            self.emit(watcher, "/a", f"f{i}")
+        self.emit(watcher, "/a/b", "x", Gio.FileMonitorEvent.DELETED)
+
+        assert len(scheduled) == 1
+        assert scheduled[0]() is False
+        assert changed == ["/a", "/a/b"]
+
+    def test_new_window_after_flush(self):
+        """Test que los eventos posteriores al flush programan otra ventana."""
+        watcher, changed, scheduled = self.make_watcher()
+        watcher.watch("/a")
+        self.emit(watcher, "/a", "f1")
+        scheduled.pop()()
+        self.emit(watcher, "/a", "f2")
+
+        assert len(scheduled) == 1
+        scheduled.pop()()
+        assert changed == ["/a", "/a"]
+
+    def test_content_changes_ignored(self):
+        """Test que modificar el contenido de un archivo no refresca el listado."""
+        watcher, _, scheduled = self.make_watcher()
+        watcher.watch("/a")
+        self.emit(watcher, "/a", "f", Gio.FileMonitorEvent.CHANGED)
+        self.emit(watcher, "/a", "f", Gio.FileMonitorEvent.CHANGES_DONE_HINT)
+
+        assert scheduled == []
+
+    def test_hidden_entries_ignored(self):
+        """Test que los archivos ocultos no refrescan, salvo al renombrarse a visibles."""
+        watcher, changed, scheduled = self.make_watcher()
+        watcher.watch("/a")
+        self.emit(watcher, "/a", ".swp")
+        assert scheduled == []
+
+        self.emit(watcher, "/a", ".tmp", Gio.FileMonitorEvent.RENAMED, event_file("real"))
+        scheduled.pop()()
+        assert changed == ["/a"]
+
+    def test_retain_cancels_collapsed_directories(self):
+        """Test que retain cancela los monitores y cambios pendientes de lo colapsado."""
+        watcher, changed, scheduled = self.make_watcher()
+        watcher.watch("/a")
+        watcher.watch("/a/b")
+        monitor = watcher._monitors["/a/b"]
+        self.emit(watcher, "/a/b", "f")
+
+        watcher.retain({"/a"})
+        scheduled.pop()()
+
+        monitor.cancel.assert_called_once()
+        assert "/a/b" not in watcher and "/a" in watcher
+        assert changed == []
+
+    def test_watch_is_idempotent(self):
+        """Test que vigilar dos veces no crea otro monitor."""
+        watcher, _, _ = self.make_watcher()
+        watcher.watch("/a")
+        monitor = watcher._monitors["/a"]
+        watcher.watch("/a")
+
+        assert watcher._monitors["/a"] is monitor
+
+
+class FakeWidget:
+    """Widget mínimo con padre (para recorrer la jerarquía)."""
+
+    def __init__(self, parent=None):
+        self._parent = parent
+
+    def get_parent(self):
+        return self._parent
+
+
+class FakeCell(FakeWidget):
+    """Celda de prueba que registra los eventos recibidos."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.clicks = []
+
+    def on_primary_click(self, n_press):
+        self.clicks.append(n_press)
+
+
+class TestRowEventDelegate:
+    """Tests para RowEventDelegate (eventos de filas a nivel del ListView)."""
+
+    def make_delegate(self, picked):
+        list_view = MagicMock()
+        list_view.pick.return_value = picked
+        return RowEventDelegate(list_view, (FakeCell,)), list_view
+
+    def test_cell_found_from_child_widget(self):
+        """Test que un click sobre el label de una celda llega a la celda."""
+        cell = FakeCell()
+        label = FakeWidget(parent=FakeWidget(parent=cell))
+        delegate, _ = self.make_delegate(label)
+
+        assert delegate.cell_at(5, 5) is cell
+
+    def test_no_cell_outside_rows(self):
+        """Test que un click fuera de las filas no encuentra celda."""
+        delegate, list_view = self.make_delegate(None)
+        assert delegate.cell_at(5, 5) is None
+
+        outside = FakeWidget(parent=list_view)
+        list_view.pick.return_value = outside
+        assert delegate.cell_at(5, 5) is None
+
+    def test_primary_release_dispatched(self):
+        """Test que soltar el botón izquierdo llama a la celda con n_press."""
+        cell = FakeCell()
+        delegate, _ = self.make_delegate(cell)
+        gesture = MagicMock()
+        gesture.get_current_button.return_value = Gdk.BUTTON_PRIMARY
+
+        delegate._on_released(gesture, 2, 5, 5)
+
+        assert cell.clicks == [2]
+
+    def test_action_group_captures_path(self):
+        """Test que las acciones emiten el path fijado al abrir el menú."""
+        cell = MagicMock()
+        callbacks = []
+        Gio.SimpleAction.new.return_value.connect.side_effect = lambda _signal, callback: (
+            callbacks.append(callback)
+        )
+        try:
+            build_action_group(
+                cell, "/a/file", (("copy", "copy-requested"), ("rename", "rename-requested"))
+            )
+        finally:
+            Gio.SimpleAction.new.return_value.connect.side_effect = None
+
+        for callback in callbacks:
+            callback(None, None)
+
+        assert [c.args for c in cell.emit.call_args_list] == [
+            ("copy-requested", "/a/file"),
+            ("rename-requested", "/a/file"),
+        ]
+
+
+def run_task(func, cancel_before_delivery=False):
+    """Ejecuta un RemoteTask en el thread actual; retorna los resultados entregados."""
+    results, dispatched = [], []
+    task = RemoteTask(func, results.append, dispatcher=lambda f, *a: dispatched.append((f, a)))
+    task._run()
+    if cancel_before_delivery:
+        task.cancel()
+    for deliver, args in dispatched:
+        assert deliver(*args) is False
+    return results
+
+
+class TestRemoteTask:
+    """Tests para RemoteTask (llamadas SSH fuera del main loop)."""
+
+    def test_result_delivered(self):
+        """Test que el resultado se entrega vía el dispatcher."""
+        assert run_task(lambda: ["a", "b"]) == [["a", "b"]]
+
+    def test_exception_delivers_none(self):
+        """Test que un error en la llamada se entrega como None."""
+
+        def fail():
+            raise OSError("ssh died")
+
+        assert run_task(fail) == [None]
+
+    def test_cancelled_before_delivery(self):
+        """Test que un resultado que llega tras cancel() se descarta."""
+        assert run_task(lambda: "home", cancel_before_delivery=True) == []
+
+    def test_cancelled_before_start_skips_call(self):
+        """Test que una tarea cancelada antes de correr no hace la llamada."""
+        calls = []
+        task = RemoteTask(lambda: calls.append(1), lambda _r: None, dispatcher=MagicMock())
+        task.cancel()
+        task._run()
+
+        assert calls == []
+
+
+class TestPlanSplices:
+    """Tests para plan_splices (actualización incremental de un directorio)."""
+
+    def test_unchanged_directory_no_splices(self):
+        """Test que un directorio sin cambios no toca el store."""
+        keys = ["a", "b", "c"]
+        assert plan_splices(keys, list(keys)) == []
+
+    def test_single_insert(self):
+        """Test que un archivo nuevo es un solo insert en su posición."""
+        old = ["a", "c", "d"]
+        new = ["a", "b", "c", "d"]
+
+        assert plan_splices(old, new) == [(1, 1, 1, 2)]
+        assert apply_splices(old, new) == new
+
+    def test_remove_and_insert(self):
+        """Test renombre: se elimina una entrada y se inserta otra."""
+        old = ["dir", "a.txt", "b.txt", "z.txt"]
+        new = ["dir", "b.txt", "c.txt", "z.txt"]
+
+        assert apply_splices(old, new) == new
+        # La entrada conservada no se reemplaza
+        touched = {i for i1, i2, _, _ in plan_splices(old, new) for i in range(i1, i2)}
+        assert 0 not in touched and 2 not in touched
+
+    def test_splices_in_reverse_order(self):
+        """Test que los cambios vienen de atrás hacia adelante."""
+        splices = plan_splices(["a", "b", "c", "d"], ["x", "b", "c", "y"])
+
+        assert [s[0] for s in splices] == sorted((s[0] for s in splices), reverse=True)
+
+
 class TestRemoteClipboardState:
     """Tests para estado del clipboard remoto."""
 
@@ -0,0 +1,174 @@
+"""
+test_local_search.py - Tests para la búsqueda de archivos locales
+
+Autor: Homero Thompson del Lago del Terror
+"""
+
+# Mock gi antes de importar
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+import pytest
+
+sys.modules["gi"] = MagicMock()
+sys.modules["gi.repository"] = MagicMock()
+
+from gnome_tmux.widgets.file_tree.local import content_search, search
+from gnome_tmux.widgets.file_tree.local.search import (
+    iter_by_content,
+    iter_by_name,
+    search_by_content,
+    search_by_name,
+    search_by_regex,
+)
+from gnome_tmux.widgets.file_tree.search_jobs import CancelToken
+
+
+@pytest.fixture
+def tree(tmp_path):
+    """Árbol de prueba con archivos, directorios y entradas ocultas."""
+    (tmp_path / "notes").mkdir()
+    (tmp_path / "notes" / "todo.txt").write_text("buy milk\n")
+    (tmp_path / "notes_file.md").write_text("nothing\n")
+    (tmp_path / ".git").mkdir()
+    (tmp_path / ".git" / "notes").write_text("milk\n")
+    (tmp_path / "link_to_notes").symlink_to(tmp_path / "notes")
+    return tmp_path
+
+
+@pytest.fixture(autouse=True)
+def thread_pool(monkeypatch):
+    """La búsqueda por contenido usa threads en lugar del pool de procesos."""
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        monkeypatch.setattr(content_search, "_get_pool", lambda: executor)
+        yield
+
+
+def as_set(hits):
+    return {(hit.path, hit.is_dir) for hit in hits}
+
+
+class TestSearchByName:
+    """Tests para search_by_name."""
+
+    def test_hits_carry_type(self, tree):
+        """Test que los resultados traen el tipo resuelto por find."""
+        hits = search_by_name(tree, "notes")
+
+        assert as_set(hits) == {
+            (str(tree / "notes"), True),
+            (str(tree / "notes_file.md"), False),
+            # %Y sigue el symlink, igual que la búsqueda remota
+            (str(tree / "link_to_notes"), True),
+        }
+
+    def test_root_excluded(self, tree):
+        """Test que el directorio raíz no aparece aunque coincida."""
+        assert str(tree) not in {hit.path for hit in search_by_name(tree, "")}
+
+
+class TestSearchByRegex:
+    """Tests para search_by_regex."""
+
+    def test_dirs_and_files_without_hidden(self, tree):
+        """Test que se encuentran archivos y directorios, sin entrar en ocultos."""
+        hits = search_by_regex(tree, "^notes")
+
+        assert as_set(hits) == {
+            (str(tree / "notes"), True),
+            (str(tree / "notes_file.md"), False),
+        }
+
+    def test_ignored_directories_pruned(self, tree):
+        """Test que no se entra en node_modules, pero el directorio sí coincide."""
+        (tree / "node_modules" / "notes_pkg").mkdir(parents=True)
+
+        paths = {hit.path for hit in search_by_regex(tree, "notes|node")}
+
+        assert str(tree / "node_modules") in paths
+        assert str(tree / "node_modules" / "notes_pkg") not in paths
+
+    def test_symlink_cycle(self, tree):
+        """Test que un symlink a un ancestro no repite resultados."""
+        (tree / "notes" / "back").symlink_to(tree)
+
+        paths = [hit.path for hit in search_by_regex(tree, "todo")]
+
+        # Los symlinks a directorios no se recorren: notes se lista una vez
+        assert len(paths) == 1
+
+    def test_symlink_outside_root_not_followed(self, tree, tmp_path_factory):
+        """Test que un symlink a un directorio fuera de root no se recorre."""
+        outside = tmp_path_factory.mktemp("outside")
+        (outside / "secret_todo.txt").write_text("x")
+        (tree / "escape").symlink_to(outside)
+
+        hits = search_by_regex(tree, "escape|secret")
+
+        assert as_set(hits) == {(str(tree / "escape"), True)}
+
+    def test_invalid_regex(self, tree):
+        """Test que una regex inválida no falla."""
+        assert search_by_regex(tree, "(") == []
+
+    def test_results_capped(self, tmp_path):
+        """Test que se retornan como máximo 100 resultados."""
+        for i in range(120):
+            (tmp_path / f"f{i}").write_text("x")
+
+        assert len(search_by_regex(tmp_path, "f")) == 100
+
+
+class TestSearchByContent:
+    """Tests para search_by_content."""
+
+    def test_files_only_without_hidden(self, tree):
+        """Test que solo se listan archivos y no los de directorios ocultos."""
+        hits = search_by_content(tree, "MILK")
+
+        assert as_set(hits) == {(str(tree / "notes" / "todo.txt"), False)}
+
+    def test_query_starting_with_dash(self, tree):
+        """Test que una consulta que empieza con '-' no se toma como opción."""
+        (tree / "flags.txt").write_text("use -v here\n")
+
+        hits = search_by_content(tree, "-v")
+
+        assert [hit.path for hit in hits] == [str(tree / "flags.txt")]
+
+
+class TestStreaming:
+    """Tests para las búsquedas en streaming (iter_*)."""
+
+    def test_closing_stops_find(self, tree, monkeypatch):
+        """Test que cerrar el generador mata el proceso."""
+        procs = []
+        original = search.subprocess.Popen
+
+        def popen(*args, **kwargs):
+            procs.append(original(*args, **kwargs))
+            return procs[-1]
+
+        monkeypatch.setattr(search.subprocess, "Popen", popen)
+        hits = iter_by_name(tree, "notes")
+
+        next(hits)
+        hits.close()
+
+        assert procs[0].returncode is not None
+
+    def test_cancel_stops_content_search(self, tree):
+        """Test que cancelar el token termina la búsqueda en curso."""
+        token = CancelToken()
+        hits = iter_by_content(tree, "milk", token)
+
+        token.cancel()
+
+        assert list(hits) == []
+
+    def test_missing_tool(self, tree, monkeypatch):
+        """Test que sin find/grep no hay resultados ni errores."""
+        monkeypatch.setattr(search.subprocess, "Popen", MagicMock(side_effect=FileNotFoundError))
+
+        assert list(iter_by_name(tree, "notes")) == []
@@ -0,0 +1,118 @@
+"""
+test_local_tmux_client.py - Tests para TmuxClient (local)
+
+Autor: Homero Thompson del Lago del Terror
+"""
+
+import subprocess
+import threading
+from unittest.mock import MagicMock, patch
+
+from gnome_tmux.clients import TmuxClient
+
+
+def _make_client(**kwargs) -> TmuxClient:
+    """Crea un TmuxClient fuera de Flatpak con tmux disponible."""
+    with (
+        patch("gnome_tmux.clients.local.is_flatpak", return_value=False),
+        patch("shutil.which", return_value="/usr/bin/tmux"),
+    ):
+        return TmuxClient(**kwargs)
+
+
+class TestTmuxClientListSessions:
+    """Tests para list_sessions."""
+
+    def test_single_subprocess_for_all_sessions(self, mock_subprocess_run):
+        """Test que todo el árbol se obtiene con un solo proceso."""
+        result = MagicMock(spec=subprocess.CompletedProcess)
+        result.returncode = 0
+        result.stdout = "\n".join(f"${i}:@{i}:1:0:0:1:session{i}:bash" for i in range(80))
+        mock_subprocess_run.return_value = result
+
+        sessions = _make_client().list_sessions()
+
+        assert len(sessions) == 80
+        assert mock_subprocess_run.call_count == 1
+        cmd = mock_subprocess_run.call_args[0][0]
+        assert cmd[:3] == ["tmux", "list-windows", "-a"]
+
+    def test_no_server_returns_empty(self, mock_subprocess_run, failed_ssh_result):
+        """Test sin servidor tmux retorna lista vacía."""
+        mock_subprocess_run.return_value = failed_ssh_result
+
+        assert _make_client().list_sessions() == []
+
+
+class TestTmuxClientCallAsync:
+    """Tests para call_async."""
+
+    def test_runs_off_caller_thread(self):
+        """Test que la operación corre en el worker y entrega el resultado."""
+        client = _make_client()
+        done = threading.Event()
+        received = []
+
+        def work(value):
+            received.append(threading.current_thread() is not threading.main_thread())
+            return value * 2
+
+        def on_done(result):
+            received.append(result)
+            done.set()
+
+        client.call_async(work, 21, callback=on_done)
+
+        assert done.wait(2)
+        assert received == [True, 42]
+        client.close()
+
+    def test_dispatcher_receives_callback(self):
+        """Test que el callback se entrega a través del dispatcher."""
+        dispatched = []
+        done = threading.Event()
+
+        def dispatcher(callback, result):
+            dispatched.append((callback, result))
+            done.set()
+
+        client = _make_client(dispatcher=dispatcher)
+        callback = MagicMock()
+
+        client.call_async(lambda: True, callback=callback)
+
+        assert done.wait(2)
+        assert dispatched == [(callback, True)]
+        callback.assert_not_called()
+        client.close()
+
+    def test_exception_delivers_none(self):
+        """Test que una excepción en el worker entrega None al callback."""
+        client = _make_client()
+        done = threading.Event()
+        received = []
+
+        def fail():
+            raise RuntimeError("boom")
+
+        def on_done(result):
+            received.append(result)
+            done.set()
+
+        client.call_async(fail, callback=on_done)
+
+        assert done.wait(2)
+        assert received == [None]
+        client.close()
+
+    def test_operations_run_in_order(self):
+        """Test que las operaciones se ejecutan en el orden pedido."""
+        client = _make_client()
+        order = []
+
+        futures = [client.call_async(order.append, i) for i in range(20)]
+        for future in futures:
+            future.result(timeout=2)
+
+        assert order == list(range(20))
+        client.close()
@@ -0,0 +1,195 @@
+"""
+test_name_index.py - Tests para el índice de nombres de la búsqueda local
+
+Autor: Homero Thompson del Lago del Terror
+"""
+
+# Mock gi antes de importar
+import os
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+
+sys.modules["gi"] = MagicMock()
+sys.modules["gi.repository"] = MagicMock()
+
+from gnome_tmux.widgets.file_tree.local import name_index
+from gnome_tmux.widgets.file_tree.local.name_index import FilenameIndex
+from gnome_tmux.widgets.file_tree.local.walker import IGNORED_DIRS, walk
+
+
+@pytest.fixture
+def tree(tmp_path):
+    """Árbol de prueba con archivos, directorios y ocultos."""
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "main.py").write_text("x")
+    (tmp_path / "src" / "Makefile").write_text("x")
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs" / "main_guide.md").write_text("x")
+    (tmp_path / ".git").mkdir()
+    (tmp_path / ".git" / "main.py").write_text("x")
+    return tmp_path
+
+
+def build(root, **kwargs):
+    """Construye un índice en el thread actual."""
+    index = FilenameIndex(str(root), **kwargs)
+    index._build()
+    return index
+
+
+def found(index, query):
+    return {(hit.path, hit.is_dir) for hit in index.search(query)}
+
+
+class TestWalk:
+    """Tests para walk (recorrido podado con scandir)."""
+
+    def test_prunes_hidden_directories(self, tree):
+        """Test que no se entra en directorios ocultos."""
+        dirs = [path for path, _, _ in walk(str(tree))]
+
+        assert sorted(dirs) == sorted([str(tree), str(tree / "src"), str(tree / "docs")])
+
+    def test_symlinked_dirs_not_followed(self, tree):
+        """Test que un symlink a directorio no se recorre."""
+        (tree / "loop").symlink_to(tree)
+
+        dirs = [path for path, _, _ in walk(str(tree))]
+
+        assert str(tree / "loop") not in dirs
+
+    def test_ignored_directories_listed_not_descended(self, tree):
+        """Test que un directorio ignorado aparece como entrada pero no se recorre."""
+        (tree / "node_modules" / "pkg").mkdir(parents=True)
+
+        listings = {
+            path: [e.name for e in entries]
+            for path, _, entries in walk(str(tree), ignored=IGNORED_DIRS)
+        }
+
+        assert "node_modules" in listings[str(tree)]
+        assert str(tree / "node_modules") not in listings
+
+    def test_depth_limit(self, tree):
+        """Test que max_depth=1 lista solo las entradas del root."""
+        dirs = [path for path, _, _ in walk(str(tree), max_depth=1)]
+
+        assert dirs == [str(tree)]
+
+    def test_symlink_cycle_followed_once(self, tree):
+        """Test que siguiendo symlinks un ciclo no se recorre dos veces."""
+        (tree / "src" / "up").symlink_to(tree)
+        (tree / "docs_link").symlink_to(tree / "docs")
+
+        dirs = [path for path, _, _ in walk(str(tree), follow_symlinks=True)]
+
+        assert len(dirs) == 3
+        assert str(tree / "src" / "up") not in dirs
+
+
+class TestFilenameIndex:
+    """Tests para FilenameIndex."""
+
+    def test_not_ready_before_build(self, tree):
+        """Test que sin construir el índice se usa find (None)."""
+        assert FilenameIndex(str(tree)).search("main") is None
+
+    def test_substring_query(self, tree):
+        """Test búsqueda por subcadena con tipo, sin ocultos."""
+        index = build(tree)
+
+        assert found(index, "main") == {
+            (str(tree / "src" / "main.py"), False),
+            (str(tree / "docs" / "main_guide.md"), False),
+        }
+        assert found(index, "doc") == {(str(tree / "docs"), True)}
+
+    def test_case_sensitive_like_find(self, tree):
+        """Test que distingue mayúsculas igual que find -name."""
+        index = build(tree)
+
+        assert found(index, "Make") == {(str(tree / "src" / "Makefile"), False)}
+        assert found(index, "make") == set()
+
+    def test_short_query_scans_names(self, tree):
+        """Test que una consulta de menos de 3 caracteres también responde."""
+        index = build(tree)
+
+        assert found(index, "py") == {(str(tree / "src" / "main.py"), False)}
+
+    def test_glob_query_uses_find(self, tree):
+        """Test que las consultas con comodines no van al índice."""
+        index = build(tree)
+
+        assert index.search("*.py") is None
+
+    def test_results_capped(self, tmp_path):
+        """Test que se respeta el máximo de resultados."""
+        for i in range(30):
+            (tmp_path / f"file{i}").write_text("x")
+        index = build(tmp_path)
+
+        assert len(index.search("file", limit=10)) == 10
+
+    def test_too_many_entries_falls_back(self, tree):
+        """Test que un árbol demasiado grande no se indexa."""
+        index = build(tree, max_entries=3)
+
+        assert index.truncated
+        assert index.search("main") is None
+
+    def test_rescan_applies_changes(self, tree):
+        """Test que re-listar un directorio agrega y elimina entradas."""
+        index = build(tree)
+        (tree / "src" / "main.py").unlink()
+        (tree / "src" / "main_new.py").write_text("x")
+        (tree / "src" / "pkg").mkdir()
+        (tree / "src" / "pkg" / "main_pkg.py").write_text("x")
+
+        index._rescan(str(tree / "src"))
+
+        assert found(index, "main") == {
+            (str(tree / "src" / "main_new.py"), False),
+            (str(tree / "src" / "pkg" / "main_pkg.py"), False),
+            (str(tree / "docs" / "main_guide.md"), False),
+        }
+
+    def test_removed_directory_drops_subtree(self, tree):
+        """Test que eliminar un directorio elimina todo su subárbol del índice."""
+        index = build(tree)
+        for child in (tree / "docs").iterdir():
+            child.unlink()
+        (tree / "docs").rmdir()
+
+        index._rescan(str(tree))
+
+        assert found(index, "main") == {(str(tree / "src" / "main.py"), False)}
+        assert str(tree / "docs") not in index._data.dir_ids
+
+    def test_revalidate_rescans_changed_directories(self, tree, monkeypatch):
+        """Test que la revalidación solo re-lista los directorios modificados."""
+        index = build(tree)
+        (tree / "docs" / "main_extra.md").write_text("x")
+        os.utime(tree / "docs", ns=(1, 1))
+        rescanned = []
+        original = index._rescan
+        monkeypatch.setattr(index, "_rescan", lambda path: (rescanned.append(path), original(path)))
+
+        index._revalidate()
+
+        assert rescanned == [str(tree / "docs")]
+        assert (str(tree / "docs" / "main_extra.md"), False) in found(index, "main")
+
+    def test_stale_search_schedules_revalidation(self, tree, monkeypatch):
+        """Test que una búsqueda sobre un índice viejo revalida en background."""
+        index = build(tree)
+        submitted = []
+        monkeypatch.setattr(name_index, "REVALIDATE_SECONDS", -1.0)
+        monkeypatch.setattr(name_index._executor, "submit", lambda f, *a: submitted.append(f))
+
+        index.search("main")
+        index.search("main")
+
+        assert submitted == [index._revalidate]
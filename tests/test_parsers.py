@@ -6,8 +6,14 @@ Autor: Homero Thompson del Lago del Terror
 
 from gnome_tmux.clients.parsers import (
     SESSION_FORMAT,
+    SESSION_WINDOWS_FORMAT,
     WINDOW_FORMAT,
+    parse_find_listing,
+    parse_find_search,
+    parse_find_sections,
+    parse_ls_listing,
     parse_session_line,
+    parse_session_windows_output,
     parse_sessions_output,
     parse_window_line,
     parse_windows_output,
@@ -215,3 +221,156 @@ invalid
 
         assert windows[0].index == 5
         assert isinstance(windows[0].index, int)
+
+
+class TestParseSessionWindowsOutput:
+    """Tests para parse_session_windows_output (list-windows -a)."""
+
+    def test_format_has_window_name_last(self):
+        """Test que window_name va al final (puede contener ':')."""
+        assert SESSION_WINDOWS_FORMAT.endswith("#{session_name}:#{window_name}")
+
+    def test_groups_windows_by_session(self):
+        """Test agrupar ventanas en sus sesiones preservando el orden."""
+        output = """$0:@0:2:1:0:1:dev:bash
+$0:@3:2:1:1:0:dev:vim
+$1:@1:1:0:0:1:logs:tail"""
+
+        sessions = parse_session_windows_output(output)
+
+        assert [s.name for s in sessions] == ["dev", "logs"]
+        assert sessions[0].session_id == "$0"
+        assert sessions[0].attached is True
+        assert sessions[0].window_count == 2
+        assert [w.index for w in sessions[0].windows] == [0, 1]
+        assert sessions[0].windows[1].window_id == "@3"
+        assert sessions[1].attached is False
+        assert sessions[1].windows[0].active is True
+
+    def test_window_name_with_colons(self):
+        """Test nombre de ventana con ':'."""
+        output = "$2:@5:1:0:3:1:srv:ssh host:22"
+
+        sessions = parse_session_windows_output(output)
+
+        assert sessions[0].windows[0].name == "ssh host:22"
+        assert sessions[0].windows[0].index == 3
+
+    def test_multiple_clients_attached(self):
+        """Test session_attached > 1 cuenta como attached."""
+        sessions = parse_session_windows_output("$0:@0:1:2:0:1:dev:bash")
+
+        assert sessions[0].attached is True
+
+    def test_control_client_not_counted(self):
+        """Test que el cliente de control mode propio no cuenta como attached."""
+        output = "$0:@0:1:1:0:1:dev:bash\n$1:@1:1:2:0:1:work:bash"
+
+        sessions = parse_session_windows_output(output, control_session_id="$0")
+
+        assert sessions[0].attached is False
+        assert sessions[1].attached is True
+
+    def test_parse_empty_output(self):
+        """Test output vacío."""
+        assert parse_session_windows_output("") == []
+
+    def test_malformed_lines_skipped(self):
+        """Test líneas malformadas se saltan."""
+        output = """$0:@0:1:0:0:1:dev:bash
+garbage
+$1:@1:x:0:0:1:bad:bash"""
+
+        sessions = parse_session_windows_output(output)
+
+        assert len(sessions) == 1
+        assert sessions[0].name == "dev"
+
+
+class TestParseFindListing:
+    """Tests para parse_find_listing."""
+
+    def test_parse_entries(self):
+        """Test parseo de registros NUL con metadatos."""
+        output = (
+            "f\x00f\x00512\x001700000000.25\x00600\x00\x00.env\x00"
+            "d\x00d\x004096\x001.0\x00755\x00\x00src\x00"
+        )
+
+        entries = parse_find_listing(output)
+
+        assert [e.name for e in entries] == ["src", ".env"]
+        assert entries[1].is_hidden is True
+        assert entries[1].size == 512
+        assert entries[1].mode == 0o600
+
+    def test_broken_symlink_is_file(self):
+        """Test symlink roto (destino N) no es directorio."""
+        entries = parse_find_listing("l\x00N\x005\x001.0\x00777\x00/nope\x00dangling\x00")
+
+        assert entries[0].is_dir is False
+        assert entries[0].is_link is True
+
+    def test_parse_empty(self):
+        """Test output vacío."""
+        assert parse_find_listing("") == []
+
+
+class TestParseFindSections:
+    """Tests para parse_find_sections (varios directorios en un comando)."""
+
+    def test_sections_in_order(self):
+        """Test que cada directorio recibe sus entradas."""
+        output = (
+            "@@0\x00f\x00f\x001\x001.0\x00644\x00\x00a.txt\x00"
+            "@@1\x00@@2\x00d\x00d\x000\x001.0\x00755\x00\x00@@3\x00"
+        )
+
+        sections = parse_find_sections(output, 3)
+
+        assert [e.name for e in sections[0]] == ["a.txt"]
+        assert sections[1] == []
+        # Un nombre que parece marcador no rompe el parseo
+        assert [e.name for e in sections[2]] == ["@@3"]
+
+    def test_failed_directory(self):
+        """Test que un directorio que falló queda en None."""
+        output = "@@0\x00@@ERR\x00@@1\x00"
+
+        assert parse_find_sections(output, 2) == [None, []]
+
+    def test_missing_sections(self):
+        """Test output truncado: secciones faltantes en None."""
+        assert parse_find_sections("", 2) == [None, None]
+
+
+class TestParseFindSearch:
+    """Tests para parse_find_search."""
+
+    def test_parse_hits(self):
+        """Test path y tipo de cada resultado."""
+        hits = parse_find_search("d\x00/srv/a b\x00f\x00/srv/c\x00N\x00/srv/link\x00")
+
+        assert [(h.path, h.is_dir) for h in hits] == [
+            ("/srv/a b", True),
+            ("/srv/c", False),
+            ("/srv/link", False),
+        ]
+
+    def test_parse_empty(self):
+        """Test output vacío."""
+        assert parse_find_search("") == []
+
+
+class TestParseLsListing:
+    """Tests para parse_ls_listing (fallback)."""
+
+    def test_parse_ls(self):
+        """Test parseo de ls -Al con nombre con espacios."""
+        output = (
+            "total 8\ndrwxr-xr-x 2 u u 4096 Jan  1 00:00 a dir\n-rw-r--r-- 1 u u 1 Jan  1 00:00 f"
+        )
+
+        entries = parse_ls_listing(output)
+
+        assert [(e.name, e.is_dir) for e in entries] == [("a dir", True), ("f", False)]
@@ -0,0 +1,170 @@
+"""
+test_prefetch.py - Tests para la precarga de listados remotos
+
+Autor: Homero Thompson del Lago del Terror
+"""
+
+from unittest.mock import MagicMock
+
+from gnome_tmux.clients.dir_cache import DirectoryCache
+from gnome_tmux.clients.models import RemoteEntry
+from gnome_tmux.clients.prefetch import RemotePrefetcher
+
+
+def make_client(entries_per_dir=1, during_listing=None):
+    """Cliente falso: list_dirs llena el caché como el real."""
+    client = MagicMock()
+    client.dir_cache = DirectoryCache()
+
+    def list_dirs(paths):
+        generation = client.dir_cache.generation
+        if during_listing is not None:
+            during_listing()
+        listings = {
+            path: [RemoteEntry(name=f"e{i}", is_dir=False) for i in range(entries_per_dir)]
+            for path in paths
+        }
+        for path, entries in listings.items():
+            client.dir_cache.put(path, entries, generation)
+        return listings
+
+    client.list_dirs.side_effect = list_dirs
+    return client
+
+
+class DeferredSubmit:
+    """Ejecutor manual: guarda los trabajos para correrlos cuando el test quiera."""
+
+    def __init__(self):
+        self.jobs = []
+
+    def __call__(self, func, *args):
+        self.jobs.append((func, args))
+
+    def run_next(self):
+        func, args = self.jobs.pop(0)
+        func(*args)
+
+
+class TestRemotePrefetcher:
+    """Tests para RemotePrefetcher."""
+
+    def test_warms_cache_in_one_batch(self):
+        """Test que varios directorios se piden en un solo comando."""
+        client = make_client()
+        prefetcher = RemotePrefetcher(client, submit=lambda f, *a: f(*a))
+
+        prefetcher.prefetch(["/a", "/b/", "/c"])
+
+        client.list_dirs.assert_called_once()
+        assert sorted(client.list_dirs.call_args.args[0]) == ["/a", "/b", "/c"]
+        assert client.dir_cache.get("/b") is not None
+
+    def test_invalidation_during_batch_not_cached(self):
+        """Test que un lote que corre durante una modificación no deja listados viejos."""
+        client = make_client(during_listing=lambda: client.dir_cache.invalidate_tree("/a"))
+        prefetcher = RemotePrefetcher(client, submit=lambda f, *a: f(*a))
+
+        prefetcher.prefetch(["/a", "/b"])
+
+        assert client.dir_cache.get("/a") is None
+        assert client.dir_cache.get("/b") is None
+
+    def test_cached_and_in_flight_skipped(self):
+        """Test que no se repiten directorios cacheados o en curso."""
+        client = make_client()
+        client.dir_cache.put("/cached", [])
+        submit = DeferredSubmit()
+        prefetcher = RemotePrefetcher(client, submit=submit)
+
+        prefetcher.prefetch(["/cached", "/a"])
+        prefetcher.prefetch(["/a"])
+
+        assert len(submit.jobs) == 1
+        assert submit.jobs[0][1] == (["/a"],)
+
+    def test_concurrency_limit_per_host(self):
+        """Test que no se supera el máximo de comandos simultáneos."""
+        client = make_client()
+        submit = DeferredSubmit()
+        prefetcher = RemotePrefetcher(client, max_in_flight=1, batch_dirs=1, submit=submit)
+
+        prefetcher.prefetch(["/a", "/b", "/c"])
+        assert len(submit.jobs) == 1
+
+        submit.run_next()
+        assert len(submit.jobs) == 1
+
+    def test_most_recent_request_first(self):
+        """Test que el último directorio pedido (hover) se atiende primero."""
+        client = make_client()
+        submit = DeferredSubmit()
+        prefetcher = RemotePrefetcher(client, batch_dirs=1, submit=submit)
+        prefetcher.prefetch(["/first"])
+        prefetcher.prefetch(["/old", "/hovered"])
+
+        submit.run_next()
+
+        assert submit.jobs[0][1] == (["/hovered"],)
+
+    def test_bandwidth_budget_defers_batches(self):
+        """Test que agotado el presupuesto se espera a que se recargue."""
+        now = [0.0]
+        client = make_client(entries_per_dir=100)
+        submit = DeferredSubmit()
+        prefetcher = RemotePrefetcher(
+            client,
+            batch_dirs=1,
+            entries_per_second=10,
+            burst_entries=50,
+            submit=submit,
+            clock=lambda: now[0],
+        )
+        prefetcher.prefetch(["/a", "/b"])
+        submit.run_next()
+        # 100 entradas con 50 de ráfaga: el bucket queda en -50
+        assert submit.jobs == []
+
+        now[0] = 6.0
+        prefetcher.prefetch([])
+
+        assert len(submit.jobs) == 1
+
+    def test_queue_bounded(self):
+        """Test que los pedidos más viejos se descartan al llenarse la cola."""
+        client = make_client()
+        submit = DeferredSubmit()
+        prefetcher = RemotePrefetcher(client, batch_dirs=1, max_queued=2, submit=submit)
+
+        prefetcher.prefetch(["/0", "/1", "/2", "/3"])
+        while submit.jobs:
+            submit.run_next()
+
+        fetched = [c.args[0][0] for c in client.list_dirs.call_args_list]
+        assert fetched == ["/3", "/2"]
+
+    def test_close_drops_pending(self):
+        """Test que close() descarta la cola y rechaza nuevos pedidos."""
+        client = make_client()
+        submit = DeferredSubmit()
+        prefetcher = RemotePrefetcher(client, batch_dirs=1, submit=submit)
+        prefetcher.prefetch(["/a", "/b"])
+
+        prefetcher.close()
+        submit.run_next()
+        prefetcher.prefetch(["/c"])
+
+        assert submit.jobs == []
+        assert client.list_dirs.call_count == 1
+
+    def test_errors_release_slot(self):
+        """Test que un error en list_dirs libera el lugar para el siguiente lote."""
+        client = make_client()
+        client.list_dirs.side_effect = OSError("ssh died")
+        submit = DeferredSubmit()
+        prefetcher = RemotePrefetcher(client, batch_dirs=1, submit=submit)
+        prefetcher.prefetch(["/a", "/b"])
+
+        submit.run_next()
+
+        assert len(submit.jobs) == 1
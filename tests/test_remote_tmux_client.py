@@ -5,9 +5,13 @@ Autor: Homero Thompson del Lago del Terror
 """
 
 import subprocess
+import sys
+import threading
+import time
 from unittest.mock import MagicMock
 
 from gnome_tmux.clients import RemoteTmuxClient
+from gnome_tmux.clients.remote import split_copy_name
 
 
 class TestRemoteTmuxClientInit:
@@ -53,6 +57,50 @@ class TestRemoteTmuxClientConnection:
         assert client.is_connected() is True
 
 
+class TestRemoteTmuxClientListSessions:
+    """Tests para list_sessions."""
+
+    def test_single_ssh_call_for_all_sessions(self, remote_client_connected):
+        """Test que sesiones y ventanas llegan en una sola invocación SSH."""
+        client, mock_run = remote_client_connected
+        result = MagicMock(spec=subprocess.CompletedProcess)
+        result.returncode = 0
+        result.stdout = "\n".join(
+            f"${i}:@{i * 2 + w}:2:0:{w}:{int(w == 0)}:session{i}:win{w}"
+            for i in range(30)
+            for w in range(2)
+        )
+        mock_run.return_value = result
+
+        sessions = client.list_sessions()
+
+        assert len(sessions) == 30
+        assert all(len(s.windows) == 2 for s in sessions)
+        assert mock_run.call_count == 1
+        remote_cmd = mock_run.call_args[0][0][-1]
+        assert remote_cmd.startswith("tmux list-windows -a -F")
+        assert client.tmux_missing is False
+
+    def test_tmux_not_installed(self, remote_client_connected):
+        """Test que exit 127 marca tmux como no instalado."""
+        client, mock_run = remote_client_connected
+        result = MagicMock(spec=subprocess.CompletedProcess)
+        result.returncode = 127
+        result.stdout = ""
+        mock_run.return_value = result
+
+        assert client.list_sessions() == []
+        assert client.tmux_missing is True
+
+    def test_no_server_returns_empty(self, remote_client_connected, failed_ssh_result):
+        """Test sin servidor tmux remoto retorna lista vacía."""
+        client, mock_run = remote_client_connected
+        mock_run.return_value = failed_ssh_result
+
+        assert client.list_sessions() == []
+        assert client.tmux_missing is False
+
+
 class TestRemoteTmuxClientRenameFile:
     """Tests para rename_file."""
 
@@ -173,6 +221,45 @@ class TestRemoteTmuxClientCopyFile:
         assert result is False
 
 
+class TestRemoteTmuxClientPasteFile:
+    """Tests para paste_file (pegado sin colisiones en un solo comando)."""
+
+    def test_paste_file_not_connected(self, remote_client_disconnected):
+        """Test paste_file retorna None si no hay conexión."""
+        assert remote_client_disconnected.paste_file("/src", "/dst") is None
+
+    def test_paste_file_single_command(self, remote_client_connected):
+        """Test que destino, nombre libre y copia van en un solo comando."""
+        client, mock_run = remote_client_connected
+        client.is_connected()  # check de conexión ya cacheado
+        result = MagicMock(spec=subprocess.CompletedProcess)
+        result.returncode = 0
+        result.stdout = "/home/user/docs/notes_21.txt"
+        mock_run.return_value = result
+        mock_run.reset_mock()
+
+        target = client.paste_file("/home/user/notes.txt", "/home/user/docs")
+
+        assert target == "/home/user/docs/notes_21.txt"
+        assert mock_run.call_count == 1
+        cmd = mock_run.call_args[0][0][-1]
+        assert cmd.startswith("sh -c ")
+        assert "cp -r" in cmd
+
+    def test_paste_file_failure(self, remote_client_connected, failed_ssh_result):
+        """Test paste_file fallido retorna None."""
+        client, mock_run = remote_client_connected
+        mock_run.return_value = failed_ssh_result
+
+        assert client.paste_file("/src", "/dst") is None
+
+    def test_split_copy_name(self):
+        """Test separación de base y extensión para nombres de copia."""
+        assert split_copy_name("a.tar.gz") == ("a.tar", ".gz")
+        assert split_copy_name(".env") == (".env", "")
+        assert split_copy_name("Makefile") == ("Makefile", "")
+
+
 class TestRemoteTmuxClientFileExists:
     """Tests para file_exists."""
 
@@ -256,8 +343,49 @@ drwxr-xr-x 2 user user 4096 Jan  1 00:00 subdir
         assert entries is not None
         assert len(entries) == 3
         # Directorios primero
-        assert entries[0]["name"] == "subdir"
-        assert entries[0]["is_dir"] is True
+        assert entries[0].name == "subdir"
+        assert entries[0].is_dir is True
+
+    def test_list_dir_find_format(self, remote_client_connected):
+        """Test list_dir con find -printf: metadatos y nombres con saltos de línea."""
+        client, mock_run = remote_client_connected
+        result = MagicMock(spec=subprocess.CompletedProcess)
+        result.returncode = 0
+        result.stdout = (
+            "f\x00f\x00100\x001700000000.5\x00644\x00\x00line\nbreak.txt\x00"
+            "d\x00d\x004096\x001700000001.0\x00755\x00\x00sub dir\x00"
+            "l\x00d\x009\x001700000002.0\x00777\x00/srv/data\x00data\x00"
+        )
+        mock_run.return_value = result
+
+        entries = client.list_dir("/home/user")
+
+        assert [e.name for e in entries] == ["data", "sub dir", "line\nbreak.txt"]
+        assert entries[0].is_link is True
+        assert entries[0].is_dir is True
+        assert entries[0].link_target == "/srv/data"
+        assert entries[2].size == 100
+        assert entries[2].mtime == 1700000000.5
+        assert entries[2].mode == 0o644
+        remote_cmd = mock_run.call_args[0][0][-1]
+        assert "find /home/user -mindepth 1 -maxdepth 1 -printf" in remote_cmd
+
+    def test_list_dir_empty(self, remote_client_connected, successful_ssh_result):
+        """Test directorio vacío retorna lista vacía."""
+        client, mock_run = remote_client_connected
+        mock_run.return_value = successful_ssh_result
+
+        assert client.list_dir("/empty") == []
+
+    def test_list_dir_quotes_path(self, remote_client_connected, successful_ssh_result):
+        """Test que el path se escapa para el shell remoto."""
+        client, mock_run = remote_client_connected
+        mock_run.return_value = successful_ssh_result
+
+        client.list_dir("/tmp/it's $HOME")
+
+        remote_cmd = mock_run.call_args[0][0][-1]
+        assert "'/tmp/it'\"'\"'s $HOME'" in remote_cmd
 
     def test_list_dir_failure(self, remote_client_connected):
         """Test list_dir retorna None si falla."""
@@ -271,6 +399,159 @@ drwxr-xr-x 2 user user 4096 Jan  1 00:00 subdir
         assert entries is None
 
 
+class TestRemoteTmuxClientListDirs:
+    """Tests para list_dirs (listado en bloque)."""
+
+    def test_single_ssh_call(self, remote_client_connected):
+        """Test que todos los directorios se listan en una sola llamada."""
+        client, mock_run = remote_client_connected
+        check = MagicMock(spec=subprocess.CompletedProcess)
+        check.returncode = 0
+        listing = MagicMock(spec=subprocess.CompletedProcess)
+        listing.returncode = 0
+        listing.stdout = "@@0\x00d\x00d\x000\x001.0\x00755\x00\x00a\x00@@1\x00@@ERR\x00"
+        # is_connected (ssh -O check) y luego el listado
+        mock_run.side_effect = [check, listing]
+
+        result = client.list_dirs(["/home/user", "/home/user/a"])
+
+        assert [e.name for e in result["/home/user"]] == ["a"]
+        assert result["/home/user/a"] is None
+        assert mock_run.call_count == 2
+        remote_cmd = mock_run.call_args[0][0][-1]
+        # Un find por directorio más la sonda de -printf
+        assert remote_cmd.count("find ") == 3
+
+    def test_timeout_fails_whole_batch(self, remote_client_connected):
+        """Test que un timeout no reintenta cada directorio por separado."""
+        client, mock_run = remote_client_connected
+        check = MagicMock(spec=subprocess.CompletedProcess)
+        check.returncode = 0
+        mock_run.side_effect = [check, subprocess.TimeoutExpired("ssh", 5)]
+
+        result = client.list_dirs(["/a", "/b"])
+
+        assert result == {"/a": None, "/b": None}
+        assert mock_run.call_count == 2
+
+    def test_no_printf_falls_back_to_list_dir(self, remote_client_connected):
+        """Test que sin find -printf se lista cada directorio con list_dir."""
+        client, mock_run = remote_client_connected
+        check = MagicMock(spec=subprocess.CompletedProcess)
+        check.returncode = 0
+        probe = MagicMock(spec=subprocess.CompletedProcess)
+        probe.returncode = 0
+        probe.stdout = "@@NOPRINTF\x00@@0\x00@@ERR\x00"
+        ls_output = MagicMock(spec=subprocess.CompletedProcess)
+        ls_output.returncode = 0
+        ls_output.stdout = "total 0\n-rw-r--r-- 1 u u 0 Jan  1 00:00 notes.txt\n"
+        mock_run.side_effect = [check, probe, ls_output]
+
+        result = client.list_dirs(["/a"])
+
+        assert [e.name for e in result["/a"]] == ["notes.txt"]
+
+    def test_not_connected(self, remote_client_disconnected):
+        """Test sin conexión todos los directorios quedan en None."""
+        assert remote_client_disconnected.list_dirs(["/a", "/b"]) == {"/a": None, "/b": None}
+
+    def test_empty_paths(self, remote_client_connected):
+        """Test sin paths no ejecuta nada."""
+        client, mock_run = remote_client_connected
+
+        assert client.list_dirs([]) == {}
+        mock_run.assert_not_called()
+
+
+class TestRemoteTmuxClientDirCache:
+    """Tests para el caché de listados de RemoteTmuxClient."""
+
+    def _listing(self, *names):
+        result = MagicMock(spec=subprocess.CompletedProcess)
+        result.returncode = 0
+        result.stdout = "".join(f"f\x00f\x001\x001.0\x00644\x00\x00{n}\x00" for n in names)
+        return result
+
+    def test_second_list_dir_uses_cache(self, remote_client_connected):
+        """Test que un listado fresco no vuelve a ejecutar SSH."""
+        client, mock_run = remote_client_connected
+        mock_run.return_value = self._listing("a")
+        client.list_dir("/home/user")
+        calls = mock_run.call_count
+
+        entries = client.list_dir("/home/user")
+
+        assert [e.name for e in entries] == ["a"]
+        assert mock_run.call_count == calls
+
+    def test_list_dirs_only_fetches_missing(self, remote_client_connected):
+        """Test que list_dirs solo pide los directorios no cacheados."""
+        client, mock_run = remote_client_connected
+        client.dir_cache.put("/home/user", [])
+        mock_run.return_value = self._listing()
+
+        result = client.list_dirs(["/home/user"])
+
+        assert result == {"/home/user": []}
+        mock_run.assert_not_called()
+
+    def test_listing_raced_by_mutation_not_cached(self, remote_client_connected):
+        """Test que un listado en curso durante una modificación no queda en caché."""
+        client, mock_run = remote_client_connected
+
+        def listing_during_rename(*args, **kwargs):
+            client.dir_cache.invalidate_parent("/home/user/a")
+            return self._listing("a")
+
+        mock_run.side_effect = listing_during_rename
+
+        assert [e.name for e in client.list_dir("/home/user")] == ["a"]
+        assert client.dir_cache.get("/home/user") is None
+
+    def test_mutations_invalidate_parent(self, remote_client_connected, successful_ssh_result):
+        """Test que las modificaciones invalidan los directorios afectados."""
+        client, mock_run = remote_client_connected
+        mock_run.return_value = successful_ssh_result
+        for path in ("/d", "/d/sub", "/e"):
+            client.dir_cache.put(path, [])
+
+        client.rename_file("/d/sub", "/e/sub")
+
+        assert client.dir_cache.get("/d") is None
+        assert client.dir_cache.get("/d/sub") is None
+        assert client.dir_cache.get("/e") is None
+
+    def test_create_directory_invalidates_ancestors(
+        self, remote_client_connected, successful_ssh_result
+    ):
+        """Test que mkdir -p invalida toda la rama."""
+        client, mock_run = remote_client_connected
+        mock_run.return_value = successful_ssh_result
+        client.dir_cache.put("/d", [])
+        client.dir_cache.put("/d/new", [])
+
+        client.create_directory("/d/new/deep")
+
+        assert client.dir_cache.get("/d") is None
+        assert client.dir_cache.get("/d/new") is None
+
+
+class FakeToken:
+    """Token de cancelación mínimo (misma interfaz que CancelToken)."""
+
+    def __init__(self):
+        self.cancelled = False
+        self._callbacks = []
+
+    def on_cancel(self, callback):
+        self._callbacks.append(callback)
+
+    def cancel(self):
+        self.cancelled = True
+        for callback in self._callbacks:
+            callback()
+
+
 class TestRemoteTmuxClientSearchFiles:
     """Tests para search_files."""
 
@@ -284,25 +565,47 @@ class TestRemoteTmuxClientSearchFiles:
         client, mock_run = remote_client_connected
         result = MagicMock(spec=subprocess.CompletedProcess)
         result.returncode = 0
-        result.stdout = "/home/user/test.txt\n/home/user/dir/test2.txt\n"
+        result.stdout = "f\x00/home/user/test.txt\x00d\x00/home/user/test_dir\x00"
         mock_run.return_value = result
 
         files = client.search_files("/home/user", "test", mode="name")
 
-        assert len(files) == 2
-        assert "/home/user/test.txt" in files
+        assert [(f.path, f.is_dir) for f in files] == [
+            ("/home/user/test.txt", False),
+            ("/home/user/test_dir", True),
+        ]
+
+    def test_search_files_single_command(self, remote_client_connected):
+        """Test que el tipo se resuelve en el mismo comando (sin is_dir por resultado)."""
+        client, mock_run = remote_client_connected
+        result = MagicMock(spec=subprocess.CompletedProcess)
+        result.returncode = 0
+        result.stdout = "".join(f"d\x00/r/d{i}\x00" for i in range(100))
+        client.is_connected()  # check de conexión ya cacheado
+        mock_run.return_value = result
+        mock_run.reset_mock()
+
+        files = client.search_files("/r", "d", mode="name")
+
+        assert len(files) == 100
+        assert all(f.is_dir for f in files)
+        assert mock_run.call_count == 1
+        cmd = mock_run.call_args[0][0][-1]
+        assert "-printf" in cmd
+        assert "'*d*'" in cmd
 
     def test_search_files_by_content(self, remote_client_connected):
         """Test search_files por contenido."""
         client, mock_run = remote_client_connected
         result = MagicMock(spec=subprocess.CompletedProcess)
         result.returncode = 0
-        result.stdout = "/home/user/file1.py\n/home/user/file2.py\n"
+        result.stdout = "/home/user/file1.py\x00/home/user/file2.py\x00"
         mock_run.return_value = result
 
         files = client.search_files("/home/user", "import", mode="content")
 
-        assert len(files) == 2
+        assert [f.path for f in files] == ["/home/user/file1.py", "/home/user/file2.py"]
+        assert not any(f.is_dir for f in files)
 
     def test_search_files_no_results(self, remote_client_connected):
         """Test search_files sin resultados."""
@@ -314,3 +617,50 @@ class TestRemoteTmuxClientSearchFiles:
 
         files = client.search_files("/home/user", "nonexistent")
         assert files == []
+
+    def test_search_files_posix_fallback(self, remote_client_connected):
+        """Test la variante POSIX (sin -printf ni head -z): directorios con '/' final."""
+        client, mock_run = remote_client_connected
+        result = MagicMock(spec=subprocess.CompletedProcess)
+        result.returncode = 0
+        result.stdout = "/r/notes.txt\n/r/docs/\n"
+        mock_run.return_value = result
+
+        files = client.search_files("/r", "o", mode="name")
+
+        assert [(f.path, f.is_dir) for f in files] == [("/r/notes.txt", False), ("/r/docs", True)]
+        cmd = mock_run.call_args[0][0][-1]
+        assert "head -z" in cmd
+        assert "else" in cmd and "| head -n" in cmd
+
+    def test_search_files_cancel_mid_flight(self, remote_client_connected, monkeypatch):
+        """Test que cancelar una búsqueda en curso mata el comando y retorna []."""
+        client, _ = remote_client_connected
+        # En lugar de ssh, un proceso que tarda más que el test
+        slow = [sys.executable, "-c", "import time; time.sleep(30)"]
+        monkeypatch.setattr(client, "_get_ssh_base", lambda: slow)
+        token = FakeToken()
+        results = []
+        search = threading.Thread(
+            target=lambda: results.append(client.search_files("/r", "x", token=token))
+        )
+
+        search.start()
+        while not token._callbacks:
+            time.sleep(0.01)
+        token.cancel()
+        search.join(timeout=5)
+
+        assert not search.is_alive()
+        assert results == [[]]
+
+    def test_search_files_cancelled_before_start(self, remote_client_connected, monkeypatch):
+        """Test que una búsqueda ya cancelada no lanza ssh."""
+        client, _ = remote_client_connected
+        popen = MagicMock()
+        monkeypatch.setattr(subprocess, "Popen", popen)
+        token = FakeToken()
+        token.cancel()
+
+        assert client.search_files("/r", "x", token=token) == []
+        popen.assert_not_called()
@@ -0,0 +1,195 @@
+"""
+test_search_jobs.py - Tests para las búsquedas con debounce y streaming
+
+Autor: Homero Thompson del Lago del Terror
+"""
+
+# Mock gi antes de importar
+import sys
+from unittest.mock import MagicMock
+
+sys.modules["gi"] = MagicMock()
+sys.modules["gi.repository"] = MagicMock()
+
+from gnome_tmux.clients import SearchHit
+from gnome_tmux.widgets.file_tree.search_jobs import CancelToken, SearchJobManager
+
+
+class FakeLoop:
+    """Main loop falso: timers e idles se ejecutan cuando el test quiere."""
+
+    def __init__(self):
+        self.timers = {}
+        self.idles = []
+        self.jobs = []
+        self._next_id = 1
+
+    def timeout_add(self, ms, func, *args):
+        timer_id = self._next_id
+        self._next_id += 1
+        self.timers[timer_id] = (func, args)
+        return timer_id
+
+    def source_remove(self, timer_id):
+        del self.timers[timer_id]
+
+    def idle_add(self, func, *args):
+        self.idles.append((func, args))
+
+    def submit(self, func, *args):
+        self.jobs.append((func, args))
+
+    def fire_timers(self):
+        timers, self.timers = self.timers, {}
+        for func, args in timers.values():
+            func(*args)
+
+    def run_jobs(self):
+        jobs, self.jobs = self.jobs, []
+        for func, args in jobs:
+            func(*args)
+
+    def run_idles(self):
+        idles, self.idles = self.idles, []
+        for func, args in idles:
+            func(*args)
+
+
+def make_manager(loop, **kwargs):
+    """Manager con callbacks que registran los eventos."""
+    events = []
+    manager = SearchJobManager(
+        on_start=lambda: events.append("start"),
+        on_hits=lambda hits: events.append([hit.path for hit in hits]),
+        on_done=lambda count: events.append(("done", count)),
+        timeout_add=loop.timeout_add,
+        source_remove=loop.source_remove,
+        dispatcher=loop.idle_add,
+        submit=loop.submit,
+        **kwargs,
+    )
+    return manager, events
+
+
+def hits_source(*paths):
+    return lambda token: [SearchHit(path) for path in paths]
+
+
+class TestCancelToken:
+    """Tests para CancelToken."""
+
+    def test_callbacks_run_once(self):
+        """Test que los callbacks corren una sola vez al cancelar."""
+        token = CancelToken()
+        calls = []
+        token.on_cancel(lambda: calls.append(1))
+
+        token.cancel()
+        token.cancel()
+
+        assert token.cancelled
+        assert calls == [1]
+
+    def test_late_callback_runs_immediately(self):
+        """Test que un callback registrado tras cancelar se ejecuta enseguida."""
+        token = CancelToken()
+        token.cancel()
+        calls = []
+
+        token.on_cancel(lambda: calls.append(1))
+
+        assert calls == [1]
+
+
+class TestSearchJobManager:
+    """Tests para SearchJobManager."""
+
+    def test_debounce_keeps_only_last_query(self):
+        """Test que escribir rápido lanza solo la última búsqueda."""
+        loop = FakeLoop()
+        manager, events = make_manager(loop)
+
+        manager.submit(hits_source("/a"))
+        manager.submit(hits_source("/ab"))
+        manager.submit(hits_source("/abc"))
+        loop.fire_timers()
+        loop.run_jobs()
+        loop.run_idles()
+
+        assert events == ["start", ["/abc"], ("done", 1)]
+
+    def test_immediate_skips_debounce(self):
+        """Test que immediate lanza la búsqueda sin esperar."""
+        loop = FakeLoop()
+        manager, events = make_manager(loop)
+
+        manager.submit(hits_source("/a"), immediate=True)
+
+        assert events == ["start"]
+        assert loop.timers == {}
+
+    def test_new_query_cancels_running_search(self):
+        """Test que una consulta nueva cancela la búsqueda en curso."""
+        loop = FakeLoop()
+        manager, events = make_manager(loop)
+        tokens = []
+
+        def source(token):
+            tokens.append(token)
+            return [SearchHit("/old")]
+
+        manager.submit(source, immediate=True)
+        manager.submit(hits_source("/new"))
+
+        assert tokens == [] and loop.jobs
+        loop.run_jobs()
+        assert tokens[0].cancelled
+        loop.run_idles()
+        assert events == ["start"]
+
+    def test_stale_results_dropped(self):
+        """Test que los lotes de una búsqueda cancelada no llegan a la UI."""
+        loop = FakeLoop()
+        manager, events = make_manager(loop)
+        manager.submit(hits_source("/old"), immediate=True)
+        loop.run_jobs()
+
+        manager.cancel()
+        loop.run_idles()
+
+        assert events == ["start"]
+        assert not manager.active
+
+    def test_limit_closes_source(self):
+        """Test que al llegar al límite se corta el generador."""
+        loop = FakeLoop()
+        manager, events = make_manager(loop, limit=2)
+        closed = []
+
+        def source(token):
+            try:
+                for i in range(10):
+                    yield SearchHit(f"/{i}")
+            finally:
+                closed.append(True)
+
+        manager.submit(source, immediate=True)
+        loop.run_jobs()
+        loop.run_idles()
+
+        assert closed == [True]
+        assert events == ["start", ["/0"], ["/1"], ("done", 2)]
+
+    def test_errors_finish_search(self):
+        """Test que un error en la búsqueda la da por terminada."""
+        loop = FakeLoop()
+        manager, events = make_manager(loop)
+
+        def source(token):
+            raise OSError("boom")
+
+        manager.submit(source, immediate=True)
+        loop.run_jobs()
+        loop.run_idles()
+
+        assert events == ["start", ("done", 0)]
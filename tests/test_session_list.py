@@ -0,0 +1,237 @@
+"""
+test_session_list.py - Tests para la reconciliación de filas de sesiones
+
+Autor: Homero Thompson del Lago del Terror
+"""
+
+# Mock gi antes de importar
+import sys
+from unittest.mock import MagicMock
+
+sys.modules["gi"] = MagicMock()
+sys.modules["gi.repository"] = MagicMock()
+
+from gnome_tmux.clients import Session, Window
+from gnome_tmux.widgets.session_list import (
+    reconcile_session_rows,
+    reconcile_window_rows,
+    session_key,
+    window_key,
+)
+
+
+class FakeListBox:
+    """ListBox mínimo que registra las operaciones."""
+
+    def __init__(self):
+        self.children = []
+        self.operations = []
+
+    def insert(self, row, index):
+        self.children.insert(index, row)
+        row.list_box = self
+        self.operations.append(("insert", row))
+
+    def remove(self, row):
+        self.children.remove(row)
+        self.operations.append(("remove", row))
+
+
+class FakeExpander:
+    """ExpanderRow mínimo (solo agrega al final)."""
+
+    def __init__(self):
+        self.children = []
+        self.operations = []
+
+    def add_row(self, row):
+        self.children.append(row)
+        self.operations.append(("add", row))
+
+    def remove(self, row):
+        self.children.remove(row)
+        self.operations.append(("remove", row))
+
+
+class FakeSessionRow:
+    """Fila de sesión que registra actualizaciones."""
+
+    def __init__(self, session):
+        self.session = session
+        self.updates = 0
+        self.list_box = None
+
+    def update_session(self, session):
+        if session != self.session:
+            self.updates += 1
+        self.session = session
+
+    def get_index(self):
+        return self.list_box.children.index(self)
+
+
+class FakeWindowRow:
+    """Fila de ventana que registra actualizaciones."""
+
+    def __init__(self, window):
+        self.window = window
+        self.updates = 0
+
+    def update_window(self, window):
+        self.updates += 1
+        self.window = window
+
+
+def make_session(session_id, name, windows=None, attached=False):
+    windows = windows or []
+    return Session(name, len(windows), attached, windows, session_id=session_id)
+
+
+def keyed(sessions):
+    return [(session_key(s), s) for s in sessions]
+
+
+def create_session_row(key, session):
+    return FakeSessionRow(session)
+
+
+class TestKeys:
+    """Tests para session_key y window_key."""
+
+    def test_session_key_uses_id(self):
+        """Test que la clave es el session_id, estable ante renombres."""
+        assert session_key(make_session("$1", "a")) == session_key(make_session("$1", "b"))
+
+    def test_session_key_falls_back_to_name(self):
+        """Test clave por nombre si no hay id."""
+        assert session_key(make_session("", "dev")) == "name:dev"
+
+    def test_window_key(self):
+        """Test clave de ventana por id, o índice si no hay id."""
+        assert window_key(Window(0, "a", True, "@4")) == "@4"
+        assert window_key(Window(2, "a", True)) == 2
+
+
+class TestReconcileSessionRows:
+    """Tests para reconcile_session_rows."""
+
+    def test_initial_insert(self):
+        """Test que la primera vez se crean todas las filas en orden."""
+        box, rows = FakeListBox(), {}
+        sessions = [make_session("$0", "a"), make_session("$1", "b")]
+
+        reconcile_session_rows(box, rows, keyed(sessions), 0, create_session_row)
+
+        assert [r.session.name for r in box.children] == ["a", "b"]
+        assert set(rows) == {"$0", "$1"}
+
+    def test_steady_state_no_widget_changes(self):
+        """Test que un refresh sin cambios no toca el ListBox."""
+        box, rows = FakeListBox(), {}
+        sessions = [make_session("$0", "a"), make_session("$1", "b")]
+        reconcile_session_rows(box, rows, keyed(sessions), 0, create_session_row)
+        box.operations.clear()
+
+        same = [make_session("$0", "a"), make_session("$1", "b")]
+        reconcile_session_rows(box, rows, keyed(same), 0, create_session_row)
+
+        assert box.operations == []
+        assert all(r.updates == 0 for r in rows.values())
+
+    def test_rename_patches_existing_row(self):
+        """Test que un renombre actualiza la fila existente."""
+        box, rows = FakeListBox(), {}
+        reconcile_session_rows(box, rows, keyed([make_session("$0", "a")]), 0, create_session_row)
+        row = rows["$0"]
+        box.operations.clear()
+
+        reconcile_session_rows(box, rows, keyed([make_session("$0", "z")]), 0, create_session_row)
+
+        assert rows["$0"] is row
+        assert row.updates == 1
+        assert box.operations == []
+
+    def test_add_and_remove(self):
+        """Test que solo se insertan y eliminan las filas que cambiaron."""
+        box, rows = FakeListBox(), {}
+        initial = [make_session("$0", "a"), make_session("$1", "b")]
+        reconcile_session_rows(box, rows, keyed(initial), 0, create_session_row)
+        kept = rows["$0"]
+        removed = rows["$1"]
+        box.operations.clear()
+
+        new = [make_session("$0", "a"), make_session("$2", "c")]
+        reconcile_session_rows(box, rows, keyed(new), 0, create_session_row)
+
+        assert [r.session.name for r in box.children] == ["a", "c"]
+        assert rows["$0"] is kept
+        assert ("remove", removed) in box.operations
+        assert len(box.operations) == 2
+
+    def test_block_position_offset(self):
+        """Test que el bloque se ubica después de las filas anteriores."""
+        box, rows = FakeListBox(), {}
+        local = FakeSessionRow(make_session("$0", "local"))
+        box.insert(local, 0)
+
+        reconcile_session_rows(
+            box, rows, keyed([make_session("$5", "remote")]), 1, create_session_row
+        )
+
+        assert box.children[0] is local
+        assert box.children[1].session.name == "remote"
+
+
+class TestReconcileWindowRows:
+    """Tests para reconcile_window_rows."""
+
+    def test_unchanged_windows_not_touched(self):
+        """Test que ventanas iguales no se actualizan ni se mueven."""
+        expander = FakeExpander()
+        windows = [Window(0, "a", True, "@0"), Window(1, "b", False, "@1")]
+        rows = reconcile_window_rows(expander, [], windows, FakeWindowRow)
+        expander.operations.clear()
+
+        same = [Window(0, "a", True, "@0"), Window(1, "b", False, "@1")]
+        new_rows = reconcile_window_rows(expander, rows, same, FakeWindowRow)
+
+        assert new_rows == rows
+        assert expander.operations == []
+        assert all(r.updates == 0 for r in rows)
+
+    def test_appended_window(self):
+        """Test que una ventana nueva al final solo se agrega."""
+        expander = FakeExpander()
+        rows = reconcile_window_rows(expander, [], [Window(0, "a", True, "@0")], FakeWindowRow)
+        expander.operations.clear()
+
+        windows = [Window(0, "a", False, "@0"), Window(1, "b", True, "@1")]
+        new_rows = reconcile_window_rows(expander, rows, windows, FakeWindowRow)
+
+        assert new_rows[0] is rows[0]
+        assert rows[0].updates == 1
+        assert expander.operations == [("add", new_rows[1])]
+
+    def test_closed_window_removed(self):
+        """Test que una ventana cerrada se elimina sin tocar el resto."""
+        expander = FakeExpander()
+        windows = [Window(0, "a", True, "@0"), Window(1, "b", False, "@1")]
+        rows = reconcile_window_rows(expander, [], windows, FakeWindowRow)
+        expander.operations.clear()
+
+        new_rows = reconcile_window_rows(expander, rows, [windows[0]], FakeWindowRow)
+
+        assert new_rows == [rows[0]]
+        assert expander.operations == [("remove", rows[1])]
+
+    def test_swap_reorders_same_rows(self):
+        """Test que un swap reordena reutilizando las mismas filas."""
+        expander = FakeExpander()
+        windows = [Window(0, "a", True, "@0"), Window(1, "b", False, "@1")]
+        rows = reconcile_window_rows(expander, [], windows, FakeWindowRow)
+
+        swapped = [Window(0, "b", False, "@1"), Window(1, "a", True, "@0")]
+        new_rows = reconcile_window_rows(expander, rows, swapped, FakeWindowRow)
+
+        assert new_rows == [rows[1], rows[0]]
+        assert expander.children == [rows[1], rows[0]]